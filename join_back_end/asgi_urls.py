@@ -0,0 +1,14 @@
+"""
+URL configuration used when join_back_end is served over ASGI.
+
+Identical to join_back_end.urls except that the kanban API routes its hot
+read endpoints to async views (kanban_app.api.async_urls).
+"""
+from django.urls import include, path
+
+from join_back_end.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('kanban/', include('kanban_app.api.async_urls')),
+    *[pattern for pattern in sync_urlpatterns if str(pattern.pattern) != 'kanban/'],
+]
@@ -0,0 +1,179 @@
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.cache import patch_vary_headers
+
+from join_back_end.lru import LRUCache
+from join_back_end.metrics import timed
+
+DEFAULTS = {
+    'ENABLED': False,
+    'MIN_SIZE': 1024,
+    'LEVEL': 6,
+    'CONTENT_TYPES': ('application/json',),
+    'CACHE_ENTRIES': 32,
+    'CACHE_TIMEOUT': 3600,
+}
+
+# Content-Encoding -> zlib `wbits`: a gzip container, or the zlib stream HTTP calls "deflate".
+WBITS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+_Q_VALUE = re.compile(r'(?:^|;)\s*q\s*=\s*([0-9.]+)')
+
+_compressed_cache = None
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'RESPONSE_COMPRESSION', {})}
+
+
+def get_compressed_cache():
+    """
+    Returns the in-process cache of compressed bodies keyed by (encoding, ETag).
+    """
+    global _compressed_cache
+    if _compressed_cache is None:
+        config = get_config()
+        _compressed_cache = LRUCache(config['CACHE_ENTRIES'], config['CACHE_TIMEOUT'])
+    return _compressed_cache
+
+
+@receiver(setting_changed)
+def reset_compressed_cache(setting, **kwargs):
+    global _compressed_cache
+    if setting == 'RESPONSE_COMPRESSION':
+        _compressed_cache = None
+
+
+def choose_encoding(accept_encoding):
+    """
+    Returns 'gzip', 'deflate' or None for an Accept-Encoding header.
+    The highest q-value wins, gzip on a tie; `q=0` refuses a coding.
+    """
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        match = _Q_VALUE.search(params)
+        try:
+            weights[coding.strip().lower()] = float(match.group(1)) if match else 1.0
+        except ValueError:
+            weights[coding.strip().lower()] = 0.0
+    encoding, best = None, 0.0
+    for coding in WBITS:
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best:
+            encoding, best = coding, weight
+    return encoding
+
+
+def compress(data, encoding, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, level):
+    """
+    Compresses a streamed body, flushing after every chunk so the client
+    receives each piece as soon as it is produced.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+async def acompress_stream(chunks, encoding, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compresses API responses with gzip or deflate, as negotiated with the
+    client's Accept-Encoding.
+
+    - Only `CONTENT_TYPES` are compressed (JSON by default: the HTML of the
+      browsable API carries a CSRF token, which compression could leak).
+    - Bodies shorter than `MIN_SIZE` bytes are sent as they are.
+    - Responses with a strong ETag (the versioned ones, see
+      kanban_app.api.conditional) are compressed once per ETag: polls of an
+      unchanged board or task list reuse the cached bytes.
+    - Streamed responses are compressed chunk by chunk.
+
+    Disabled unless `RESPONSE_COMPRESSION['ENABLED']`.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = get_config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.min_size = config['MIN_SIZE']
+        self.level = config['LEVEL']
+        self.content_types = set(config['CONTENT_TYPES'])
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').partition(';')[0].strip()
+        if content_type not in self.content_types or response.has_header('Content-Encoding'):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            stream = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = stream(response.streaming_content, encoding, self.level)
+            response.headers.pop('Content-Length', None)
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            with timed('compress'):
+                body = self.compressed_body(response, encoding)
+            if len(body) >= len(response.content):
+                return response
+            response.content = body
+            response['Content-Length'] = str(len(body))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # The compressed bytes differ from the identity ones; like Django's GZipMiddleware.
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def compressed_body(self, response, encoding):
+        etag = response.get('ETag')
+        if response.status_code != 200 or not etag or not etag.startswith('"'):
+            return compress(response.content, encoding, self.level)
+        cache = get_compressed_cache()
+        key = (encoding, etag)
+        cached = cache.get(key)
+        # The length guards against a body that changed without a new ETag.
+        if cached is not None and cached[0] == len(response.content):
+            return cached[1]
+        body = compress(response.content, encoding, self.level)
+        cache.set(key, (len(response.content), body))
+        return body
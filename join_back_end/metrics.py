@@ -0,0 +1,287 @@
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+DEFAULTS = {
+    'ENABLED': False,
+    'SERVER_TIMING': True,
+    'BUCKETS': (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+}
+
+# Phases reported in the Server-Timing header, in this order.
+PHASES = ('auth', 'perm', 'db', 'serialize', 'render', 'compress', 'total')
+
+_NOT_TIMED = nullcontext()
+
+# Timings of the request being handled in the current thread / task, if any.
+_current = ContextVar('request_timings', default=None)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'REQUEST_METRICS', {})}
+
+
+class _Phase:
+    """
+    Adds the time spent inside the block to one phase of a request.
+    Nested blocks of the same phase are only counted once.
+    """
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if self.name not in self.timings.active:
+            self.timings.active.add(self.name)
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            self.timings.active.discard(self.name)
+            self.timings.add(self.name, time.perf_counter() - self.start)
+
+
+class RequestTimings:
+    """
+    Per-request accumulator of phase durations (in seconds) and database queries.
+    Phases may overlap: e.g. queries run while serializing a lazy queryset
+    count towards both `db` and `serialize`.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.active = set()
+        self.queries = 0
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def server_timing(self):
+        parts = []
+        for name in PHASES:
+            if name in self.durations:
+                part = f'{name};dur={self.durations[name] * 1000:.2f}'
+                if name == 'db':
+                    part += f';desc="{self.queries} queries"'
+                parts.append(part)
+        return ', '.join(parts)
+
+
+def timed(phase):
+    """
+    Context manager timing a phase of the current request; a no-op outside
+    an instrumented request (or when the metrics are disabled).
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NOT_TIMED
+    return timings.phase(phase)
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.add('db', time.perf_counter() - start)
+
+
+def _install_execute_wrapper(connection, **kwargs):
+    # Connections are per thread; each one gets the wrapper once, when it is opened.
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+class Histogram:
+    """
+    Cumulative Prometheus-style histogram with fixed upper bounds.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """
+    Aggregates request timings per view and renders them in the Prometheus text format.
+    """
+
+    def __init__(self, buckets=DEFAULTS['BUCKETS']):
+        self.buckets = tuple(buckets)
+        self.phases = {}
+        self.queries = {}
+        self.lock = threading.Lock()
+
+    def observe(self, view, method, timings):
+        with self.lock:
+            for phase, seconds in timings.durations.items():
+                key = (view, method, phase)
+                if key not in self.phases:
+                    self.phases[key] = Histogram(self.buckets)
+                self.phases[key].observe(seconds)
+            self.queries[(view, method)] = self.queries.get((view, method), 0) + timings.queries
+
+    def clear(self):
+        with self.lock:
+            self.phases.clear()
+            self.queries.clear()
+
+    def render(self):
+        lines = [
+            '# HELP http_request_phase_seconds Time spent per request phase.',
+            '# TYPE http_request_phase_seconds histogram',
+        ]
+        with self.lock:
+            for (view, method, phase), histogram in sorted(self.phases.items()):
+                labels = f'view="{view}",method="{method}",phase="{phase}"'
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'http_request_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'http_request_phase_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'http_request_phase_seconds_sum{{{labels}}} {histogram.sum}')
+                lines.append(f'http_request_phase_seconds_count{{{labels}}} {histogram.count}')
+            lines += [
+                '# HELP http_request_db_queries_total Database queries run by requests.',
+                '# TYPE http_request_db_queries_total counter',
+            ]
+            for (view, method), count in sorted(self.queries.items()):
+                lines.append(f'http_request_db_queries_total{{view="{view}",method="{method}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class ServerTimingMiddleware:
+    """
+    Measures every request: total time, database queries (count and time),
+    plus the authentication, permission, serialization and rendering phases
+    reported by `PhaseTimingMixin`, `TimedSerializerMixin` and
+    `TimedJSONRenderer`. Adds a `Server-Timing` header and feeds the
+    histograms served by `join_back_end.views.MetricsView`.
+
+    Disabled unless `REQUEST_METRICS['ENABLED']`; Django then drops the
+    middleware and the phase hooks reduce to a context variable lookup.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = get_config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = config['SERVER_TIMING']
+        registry.buckets = tuple(config['BUCKETS'])
+        connection_created.connect(_install_execute_wrapper, dispatch_uid='request-metrics')
+        for connection in connections.all(initialized_only=True):
+            _install_execute_wrapper(connection)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, start)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, start)
+
+    def finish(self, request, response, timings, start):
+        timings.add('total', time.perf_counter() - start)
+        match = request.resolver_match
+        view = (match.view_name or match.route) if match else 'unmatched'
+        registry.observe(view, request.method, timings)
+        if self.server_timing:
+            response['Server-Timing'] = timings.server_timing()
+        return response
+
+
+class PhaseTimingMixin:
+    """
+    APIView mixin reporting the authentication and permission phases.
+    """
+
+    def perform_authentication(self, request):
+        with timed('auth'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with timed('perm'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with timed('perm'):
+            super().check_object_permissions(request, obj)
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin reporting the time spent producing `.data`.
+    """
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    `list_serializer_class` for serializers using `TimedSerializerMixin`.
+    """
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    JSON renderer reporting the rendering phase.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,23 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+
+
+class AsgiUrlconfMiddleware:
+    """
+    Routes requests served over ASGI with `settings.ASGI_URLCONF`
+    (join_back_end.asgi_urls: async read views and the event stream).
+    `ROOT_URLCONF` stays the URLconf of WSGI, `runserver` and `reverse()`.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if isinstance(request, ASGIRequest):
+            request.urlconf = settings.ASGI_URLCONF
+        return self.get_response(request)
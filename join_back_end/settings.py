@@ -45,6 +45,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'join_back_end.routing.AsgiUrlconfMiddleware',
+    'join_back_end.metrics.ServerTimingMiddleware',
+    'join_back_end.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,14 +63,91 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
      'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-    ]
+        'user_auth_app.api.authentication.CachedTokenAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'join_back_end.metrics.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Server-Timing header and Prometheus histograms at /metrics/ (join_back_end.metrics).
+# When disabled the middleware is removed from the stack. Off by default: the
+# header shows every client the time spent per phase; deployments opt in.
+REQUEST_METRICS = {
+    'ENABLED': False,
+    'SERVER_TIMING': True,
+}
+
+# gzip/deflate for JSON responses above MIN_SIZE bytes (join_back_end.compression).
+# Compressed bodies of versioned responses are cached per ETag.
+RESPONSE_COMPRESSION = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,
+    'LEVEL': 6,
+    'CACHE_ENTRIES': 32,
 }
 
+# In-process cache of token -> user lookups used by CachedTokenAuthentication.
+AUTH_TOKEN_CACHE = {
+    'MAX_ENTRIES': 1024,
+    'TIMEOUT': 300,
+}
+
+# Processes hashing passwords during bulk user imports (None: one per CPU).
+AUTH_PROVISIONING_WORKERS = None
+
+# Seconds the Guest login payload is memoized in each process.
+AUTH_GUEST_CACHE_TIMEOUT = 300
+
 CORS_ALLOW_ALL_ORIGINS = True
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Shared between worker processes; select it with KANBAN_RESPONSE_CACHE['ALIAS'].
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache',
+    },
+}
+
+# Cache of serialized kanban list responses, keyed by resource versions.
+# BACKEND 'local' keeps a per-process LRU; 'django' stores entries in CACHES[ALIAS].
+KANBAN_RESPONSE_CACHE = {
+    'BACKEND': 'local',
+    'ALIAS': 'shared',
+    'MAX_ENTRIES': 256,
+    'TIMEOUT': 60,
+}
+
+# Days the delta sync change log keeps its entries; `manage.py prune_changes`
+# deletes older ones and /kanban/changes/ answers 410 for a `since` before them.
+KANBAN_CHANGES_RETENTION_DAYS = 30
+
+# Live change events streamed at /kanban/events/.
+# BACKEND 'memory' delivers events within one process; 'database' polls the
+# shared change log every POLL_INTERVAL seconds so several processes see them.
+KANBAN_EVENTS = {
+    'BACKEND': 'memory',
+    'QUEUE_SIZE': 100,
+    'HEARTBEAT': 15,
+    'POLL_INTERVAL': 1.0,
+}
+
+# Threads available to the sync work left on the async read path.
+KANBAN_ASYNC_SYNC_WORKERS = 4
+
+# Rows read and serialized per piece of a streamed list (`?stream=true`).
+KANBAN_STREAM_CHUNK_SIZE = 500
+
 ROOT_URLCONF = 'join_back_end.urls'
 
+# URLconf of requests served over ASGI (async read views, event stream),
+# selected per request by join_back_end.routing.AsgiUrlconfMiddleware.
+ASGI_URLCONF = 'join_back_end.asgi_urls'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -85,6 +165,7 @@ TEMPLATES = [
 ]
 
 AUTHENTICATION_BACKENDS = [
+    'user_auth_app.backends.EmailBackend',
     'django.contrib.auth.backends.ModelBackend',
 ]
 
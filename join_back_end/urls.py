@@ -16,10 +16,12 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from join_back_end.views import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('kanban/', include('kanban_app.api.urls')),
     path('api/auth/', include('user_auth_app.api.urls')),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
     path('api-auth', include('rest_framework.urls')), # con questa riga url, impostiamo la funzione di log in log out nell'interfaccia api view di drf
 ]
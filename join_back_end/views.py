@@ -0,0 +1,27 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from join_back_end.metrics import registry
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data.encode(self.charset) if isinstance(data, str) else JSONRenderer().render(data)
+
+
+class MetricsView(APIView):
+    """
+    API endpoint exposing the request histograms in the Prometheus text format.
+    Restricted to admin users.
+    """
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,25 @@
+from django.urls import path
+from kanban_app.api import async_views
+from kanban_app.api.urls import urlpatterns as sync_urlpatterns
+
+
+# API URL configuration used under ASGI (see join_back_end/asgi_urls.py).
+# Same routes as kanban_app.api.urls; GET on the hot read endpoints is served
+# by the async views, every other method still reaches the DRF views.
+# The event stream never ends, so it is only routed here: under WSGI it would
+# hold a worker thread per connected client.
+
+ASYNC_VIEWS = {
+    'contact-list': async_views.contact_list,
+    'task-list': async_views.task_list,
+    'task-detail': async_views.task_detail,
+    'board': async_views.board,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS.get(pattern.name, pattern.callback), name=pattern.name)
+    for pattern in sync_urlpatterns
+] + [
+    # Live change events (Server-Sent Events)
+    path('events/', async_views.board_events, name='events'),
+]
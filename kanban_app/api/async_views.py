@@ -0,0 +1,263 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from join_back_end.metrics import TimedJSONRenderer
+from kanban_app.api.caching import cache_key, get_response_cache
+from kanban_app.api.conditional import make_etag
+from kanban_app.api.filters import ContactSearchSerializer, FieldSelectionSerializer, TaskFilterSerializer
+from kanban_app.api.pagination import KanbanCursorPagination
+from kanban_app.api.projections import board_task_projection, contact_projection, task_projection
+from kanban_app.api.streaming import astreaming_response, wants_stream
+from kanban_app.events import event_stream, get_broker, get_config
+from kanban_app.api.views import BoardView, ContactView, TaskDetailView, TaskListView
+from kanban_app.models import Contact, ResourceVersion, Task
+from kanban_app.signals import CONTACT, SUBTASK, TASK
+
+# -------------------------
+# SYNC HELPERS
+# -------------------------
+
+_executor = None
+
+
+def get_executor():
+    """
+    Returns the bounded thread pool used for the sync work left on the async
+    read path (token authentication, cursor pagination), so a burst of
+    requests cannot spawn an unbounded number of threads and connections.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'KANBAN_ASYNC_SYNC_WORKERS', 4),
+            thread_name_prefix='kanban-sync',
+        )
+    return _executor
+
+
+async def run_sync(func, *args):
+    """
+    Runs `func` on the bounded pool and releases its database connection afterwards.
+    """
+    def call():
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+    return await sync_to_async(call, thread_sensitive=False, executor=get_executor())()
+
+
+def authenticate(request):
+    """
+    Runs the configured DRF authenticators; returns an error response when
+    the client sent invalid credentials, None otherwise.
+    """
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        drf_request.user
+    except APIException as exc:
+        return json_response({'detail': exc.detail}, status=exc.status_code)
+    return None
+
+
+def paginate(request, queryset, projection):
+    """
+    Returns the cursor page requested by the client.
+    """
+    paginator = KanbanCursorPagination()
+    page = paginator.paginate_queryset(projection.values(queryset), Request(request))
+    return paginator.get_paginated_response(projection.serialize(page)).data
+
+
+def json_response(data, status=200):
+    return HttpResponse(TimedJSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def not_modified(request, versions):
+    """
+    Returns (ETag, 304 response or None) for the current `versions`.
+    """
+    etag = quote_etag(make_etag(request, versions))
+    # Weak comparison: the compression middleware sends W/"..." for compressed bodies.
+    if_none_match = [tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))]
+    if etag in if_none_match or '*' in if_none_match:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return etag, response
+    return etag, None
+
+
+async def versioned_read(request, resources, build, cache=True):
+    """
+    Async counterpart of `conditional_get` + `cached_get`.
+
+    Reads the resource versions with one async query, answers 304 when the
+    client's ETag is current, then serves the cached data or awaits `build()`.
+    """
+    versions = await ResourceVersion.objects.acurrent(resources)
+    etag, response = not_modified(request, versions)
+    if response is not None:
+        return response
+
+    key = cache_key(request, resources, versions)
+    data = get_response_cache().get(key) if cache else None
+    cache_status = 'HIT'
+    if data is None:
+        data = await build()
+        if cache:
+            get_response_cache().set(key, data)
+        cache_status = 'MISS'
+    response = json_response(data)
+    response['ETag'] = etag
+    if cache:
+        response['X-Cache'] = cache_status
+    return response
+
+
+def async_read_view(async_get, sync_view):
+    """
+    Builds a view whose GET runs on the async path while every other
+    method is handed to the existing DRF view on a worker thread.
+    """
+    sync_view = sync_to_async(sync_view)
+
+    @csrf_exempt
+    async def view(request, *args, **kwargs):
+        if request.method != 'GET':
+            return await sync_view(request, *args, **kwargs)
+        if 'HTTP_AUTHORIZATION' in request.META:
+            error = await run_sync(authenticate, request)
+            if error is not None:
+                return error
+        else:
+            # Like the DRF views, only token authentication counts (and no session is read).
+            request.user = AnonymousUser()
+        return await async_get(request, *args, **kwargs)
+    return view
+
+
+# -------------------------
+# ASYNC READ VIEWS
+# -------------------------
+
+def is_paginated(request):
+    return KanbanCursorPagination.page_size_query_param in request.GET or 'cursor' in request.GET
+
+
+async def list_data(request, queryset, projection):
+    if is_paginated(request):
+        return await run_sync(paginate, request, queryset, projection)
+    return await projection.acall(queryset)
+
+
+async def list_response(request, resources, queryset, projection):
+    """
+    Serves a list endpoint: streamed with `?stream=true` (uncached, but
+    still answering 304 to a current ETag), otherwise through `versioned_read`.
+    """
+    if not wants_stream(request) or is_paginated(request):
+        return await versioned_read(request, resources, lambda: list_data(request, queryset, projection))
+    etag, response = not_modified(request, await ResourceVersion.objects.acurrent(resources))
+    if response is None:
+        response = astreaming_response(projection.values(queryset), projection)
+        response['ETag'] = etag
+    return response
+
+
+def select(request, projection):
+    """
+    Returns (projection limited to `?fields=`/`?expand=`, None) or (None, error response).
+    """
+    selection = FieldSelectionSerializer(data=request.GET.dict(), projection=projection)
+    if not selection.is_valid():
+        return None, json_response({'data': selection.errors, 'ok': False, 'error': 'Invalid field selection'}, status=400)
+    return selection.get_projection(), None
+
+
+async def get_contacts(request):
+    search = ContactSearchSerializer(data=request.GET.dict(), context={'user': request.user})
+    if not search.is_valid():
+        return json_response({'data': search.errors, 'ok': False, 'error': 'Invalid contact search'}, status=400)
+    if search.is_scoped and not request.user.is_authenticated:
+        response = json_response({'detail': 'Log in to list your own contacts.'}, status=401)
+        response['WWW-Authenticate'] = 'Token'
+        return response
+    projection, error = select(request, contact_projection)
+    if error is not None:
+        return error
+    if search.is_search:
+        # The ranked search runs raw SQL, which the async ORM cannot run directly.
+        return await versioned_read(request, (CONTACT,), lambda: run_sync(
+            lambda: projection.in_order(Contact.objects.all(), search.search())))
+    return await list_response(request, (CONTACT,), search.filter_queryset(Contact.objects.all()), projection)
+
+
+async def get_tasks(request):
+    filters = TaskFilterSerializer(data=request.GET.dict())
+    if not filters.is_valid():
+        return json_response({'data': filters.errors, 'ok': False, 'error': 'Invalid task filters'}, status=400)
+    projection, error = select(request, task_projection)
+    if error is not None:
+        return error
+    tasks = filters.filter_queryset(Task.objects.with_contacts())
+    return await list_response(request, (TASK, CONTACT), tasks, projection)
+
+
+async def get_task(request, pk):
+    projection, error = select(request, task_projection)
+    if error is not None:
+        return error
+
+    async def build():
+        try:
+            return await projection.aget(Task.objects.filter(pk=pk))
+        except Task.DoesNotExist:
+            raise Http404
+    return await versioned_read(request, (TASK, CONTACT), build, cache=False)
+
+
+async def get_board(request):
+    projection, error = select(request, board_task_projection)
+    if error is not None:
+        return error
+    return await versioned_read(
+        request, (TASK, CONTACT, SUBTASK), lambda: projection.aboard(Task.objects.order_by('id')))
+
+
+contact_list = async_read_view(get_contacts, ContactView.as_view())
+task_list = async_read_view(get_tasks, TaskListView.as_view())
+task_detail = async_read_view(get_task, TaskDetailView.as_view())
+board = async_read_view(get_board, BoardView.as_view())
+
+
+# -------------------------
+# EVENT VIEWS
+# -------------------------
+
+@require_GET
+async def board_events(request):
+    """
+    Server-Sent Events stream of contact, task and subtask changes.
+    Replaces polling the list endpoints. Only routed under ASGI
+    (kanban_app.api.async_urls), where an idle client holds no thread.
+    """
+    broker = get_broker()
+    subscription = broker.subscribe()
+    response = StreamingHttpResponse(
+        event_stream(broker, subscription, get_config()['HEARTBEAT']),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
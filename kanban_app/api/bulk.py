@@ -0,0 +1,208 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from kanban_app.api.serializers import SubtaskSerializer, TaskSerializer
+from kanban_app.counters import adjust_counters, subtask_deltas
+from kanban_app.models import Contact, Subtask, Task
+from kanban_app.signals import SUBTASK, TASK, notify_changed
+
+MAX_BULK_ITEMS = 500
+
+
+def check_bulk_items(items, require_id=True):
+    """
+    Validates the envelope of a bulk request.
+
+    Returns an error message, or None when `items` is a non-empty list of
+    objects that (if `require_id`) carry unique integer ids.
+    """
+    if not isinstance(items, list) or not items:
+        return 'Expected a non-empty list of items'
+    if len(items) > MAX_BULK_ITEMS:
+        return f'A bulk request accepts at most {MAX_BULK_ITEMS} items'
+    if not all(isinstance(item, dict) for item in items):
+        return 'Every item must be an object'
+    if require_id:
+        ids = [item.get('id') for item in items]
+        if not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            return 'Every item must have an integer id'
+        if len(set(ids)) != len(ids):
+            return 'Every id may appear only once'
+    return None
+
+
+def collect_ids(items, field):
+    """
+    Returns the integer values of `field` (a pk or a list of pks) across all items.
+    """
+    ids = set()
+    for item in items:
+        values = item.get(field)
+        for value in values if isinstance(values, list) else [values]:
+            try:
+                ids.add(int(value))
+            except (TypeError, ValueError):
+                pass
+    return ids
+
+
+def bulk_update_tasks(items):
+    """
+    Validates and applies partial updates to many tasks at once.
+
+    - Tasks and referenced contacts are loaded with one `in_bulk` query each.
+    - Every item is validated before anything is written; a single invalid
+      item rejects the whole batch.
+    - Scalar fields are written with one `bulk_update`, contact assignments
+      with one delete and one insert on the through table (plus one
+      `contacts_count` update per distinct count), all in one transaction.
+
+    Returns a `(ok, results)` tuple where `results` holds one entry per item
+    in request order.
+    """
+    ids = [item['id'] for item in items]
+    tasks = Task.objects.in_bulk(ids)
+    contact_ids = collect_ids(items, 'contacts_ids')
+    contacts = Contact.objects.in_bulk(contact_ids) if contact_ids else {}
+    context = {'prefetched': {Contact: contacts}}
+
+    serializers, results, ok = [], [], True
+    for item in items:
+        task = tasks.get(item['id'])
+        if task is None:
+            results.append({'id': item['id'], 'ok': False, 'errors': {'id': 'Task not found'}})
+            ok = False
+            continue
+        fields = {key: value for key, value in item.items() if key != 'id'}
+        serializer = TaskSerializer(task, data=fields, partial=True, context=context)
+        if serializer.is_valid():
+            serializers.append(serializer)
+            results.append({'id': task.pk, 'ok': True})
+        else:
+            results.append({'id': task.pk, 'ok': False, 'errors': serializer.errors})
+            ok = False
+    if not ok:
+        return False, results
+
+    apply_task_updates(serializers)
+    updated = Task.objects.with_contacts().in_bulk(ids)
+    for result in results:
+        result['data'] = TaskSerializer(updated[result['id']]).data
+    return True, results
+
+
+def apply_task_updates(serializers):
+    """
+    Writes the validated data of `serializers` with set-based queries.
+    """
+    instances, fields, assignments = [], {'updated_at'}, {}
+    now = timezone.now()
+    for serializer in serializers:
+        task = serializer.instance
+        task.updated_at = now
+        for field, value in serializer.validated_data.items():
+            if field == 'contacts':
+                assignments[task.pk] = value
+            else:
+                setattr(task, field, value)
+                fields.add(field)
+        instances.append(task)
+
+    through = Task.contacts.through
+    with transaction.atomic():
+        Task.objects.bulk_update(instances, sorted(fields))
+        if assignments:
+            assigned = {task_id: {contact.pk for contact in task_contacts}
+                        for task_id, task_contacts in assignments.items()}
+            through.objects.filter(task_id__in=assignments).delete()
+            through.objects.bulk_create(
+                through(task_id=task_id, contact_id=contact_id)
+                for task_id, contact_ids in assigned.items()
+                for contact_id in contact_ids
+            )
+            # The assignments were replaced as a whole, so the new counts are exact.
+            by_count = defaultdict(list)
+            for task_id, contact_ids in assigned.items():
+                by_count[len(contact_ids)].append(task_id)
+            for count, task_ids in by_count.items():
+                Task.objects.filter(pk__in=task_ids).update(contacts_count=count)
+        # bulk_update and through-table writes bypass the model signals.
+        notify_changed(TASK, [task.pk for task in instances])
+
+
+def bulk_create_subtasks(items):
+    """
+    Validates and creates many subtasks at once.
+
+    Parent tasks are resolved with a single `in_bulk` query and the rows are
+    inserted with one `bulk_create`. Nothing is written when an item is invalid.
+
+    Returns a `(ok, results)` tuple with one entry per item in request order.
+    """
+    tasks = Task.objects.in_bulk(collect_ids(items, 'task_id'))
+    serializer = SubtaskSerializer(data=items, many=True, context={'prefetched': {Task: tasks}})
+    if not serializer.is_valid():
+        return False, [
+            {'ok': False, 'errors': errors} if errors else {'ok': True}
+            for errors in serializer.errors
+        ]
+    with transaction.atomic():
+        subtasks = Subtask.objects.bulk_create(Subtask(**attrs) for attrs in serializer.validated_data)
+        # bulk_create bypasses the model signals.
+        adjust_counters(subtask_deltas([], [(subtask.task_id, subtask.is_completed) for subtask in subtasks]))
+        notify_changed(SUBTASK, [subtask.pk for subtask in subtasks])
+    return True, [{'id': subtask.pk, 'ok': True, 'data': SubtaskSerializer(subtask).data} for subtask in subtasks]
+
+
+def bulk_update_subtasks(items):
+    """
+    Validates and applies partial updates (e.g. toggling `is_completed`)
+    to many subtasks at once with one `bulk_update`.
+
+    Returns a `(ok, results)` tuple with one entry per item in request order.
+    """
+    subtasks = Subtask.objects.in_bulk([item['id'] for item in items])
+    tasks = Task.objects.in_bulk(collect_ids(items, 'task_id'))
+    context = {'prefetched': {Task: tasks}}
+
+    serializers, results, ok = [], [], True
+    for item in items:
+        subtask = subtasks.get(item['id'])
+        if subtask is None:
+            results.append({'id': item['id'], 'ok': False, 'errors': {'id': 'Subtask not found'}})
+            ok = False
+            continue
+        fields = {key: value for key, value in item.items() if key != 'id'}
+        serializer = SubtaskSerializer(subtask, data=fields, partial=True, context=context)
+        if serializer.is_valid():
+            serializers.append(serializer)
+            results.append({'id': subtask.pk, 'ok': True})
+        else:
+            results.append({'id': subtask.pk, 'ok': False, 'errors': serializer.errors})
+            ok = False
+    if not ok:
+        return False, results
+
+    fields = {'updated_at'}
+    now = timezone.now()
+    instances = [serializer.instance for serializer in serializers]
+    for serializer in serializers:
+        serializer.instance.updated_at = now
+        for field, value in serializer.validated_data.items():
+            setattr(serializer.instance, field, value)
+            fields.add(field)
+    with transaction.atomic():
+        # Move the counters from the stored states, locked until the update
+        # commits: concurrent writes may have changed them since `in_bulk`.
+        before = {pk: (task_id, is_completed) for pk, task_id, is_completed in Subtask.objects.select_for_update()
+                  .filter(pk__in=[subtask.pk for subtask in instances]).values_list('pk', 'task_id', 'is_completed')}
+        Subtask.objects.bulk_update(instances, sorted(fields))
+        # bulk_update bypasses the model signals.
+        after = [(subtask.task_id, subtask.is_completed) for subtask in instances if subtask.pk in before]
+        adjust_counters(subtask_deltas(before.values(), after))
+        notify_changed(SUBTASK, [subtask.pk for subtask in instances])
+    for result, subtask in zip(results, instances):
+        result['data'] = SubtaskSerializer(subtask).data
+    return True, results
@@ -0,0 +1,149 @@
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.response import Response
+
+from join_back_end.lru import LRUCache
+from kanban_app.api.conditional import resource_versions, scoped_user
+from kanban_app.signals import resources_changed
+
+DEFAULTS = {
+    'BACKEND': 'local',
+    'ALIAS': 'default',
+    'MAX_ENTRIES': 256,
+    'TIMEOUT': 60,
+}
+
+
+class LocalResponseCache:
+    """
+    Per-process LRU cache of serialized responses.
+    Entries are dropped as soon as one of their resources changes.
+    """
+
+    def __init__(self, max_entries, timeout):
+        self.lru = LRUCache(max_entries=max_entries, ttl=timeout)
+
+    def get(self, key):
+        return self.lru.get(key)
+
+    def set(self, key, data):
+        self.lru.set(key, data)
+
+    def invalidate(self, resource):
+        self.lru.delete_where(lambda key: resource in key[0])
+
+    def clear(self):
+        self.lru.clear()
+
+    def stats(self):
+        return {'backend': 'local', 'hits': self.lru.hits, 'misses': self.lru.misses, 'entries': len(self.lru)}
+
+
+class DjangoResponseCache:
+    """
+    Response cache stored in one of the Django `CACHES` (e.g. file-based),
+    so several worker processes share the entries.
+
+    Keys embed the resource versions, so a write makes older entries
+    unreachable and they simply expire; no explicit invalidation is needed.
+    """
+
+    def __init__(self, alias, timeout):
+        self.cache = caches[alias]
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        data = self.cache.get(self.make_key(key))
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def set(self, key, data):
+        self.cache.set(self.make_key(key), data, self.timeout)
+
+    def invalidate(self, resource):
+        pass
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'backend': 'django', 'hits': self.hits, 'misses': self.misses}
+
+    def make_key(self, key):
+        digest = hashlib.md5(repr(key).encode(), usedforsecurity=False).hexdigest()
+        return f'kanban:response:{digest}'
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """
+    Returns the response cache configured by `KANBAN_RESPONSE_CACHE`.
+    """
+    global _response_cache
+    if _response_cache is None:
+        config = {**DEFAULTS, **getattr(settings, 'KANBAN_RESPONSE_CACHE', {})}
+        if config['BACKEND'] == 'django':
+            _response_cache = DjangoResponseCache(config['ALIAS'], config['TIMEOUT'])
+        else:
+            _response_cache = LocalResponseCache(config['MAX_ENTRIES'], config['TIMEOUT'])
+    return _response_cache
+
+
+@receiver(setting_changed)
+def reset_response_cache(setting, **kwargs):
+    global _response_cache
+    if setting == 'KANBAN_RESPONSE_CACHE':
+        _response_cache = None
+
+
+@receiver(resources_changed)
+def invalidate_response_cache(sender, resource, **kwargs):
+    if _response_cache is not None:
+        _response_cache.invalidate(resource)
+
+
+def cache_key(request, resources, versions):
+    """
+    Identifies a cached response by its resources, their versions, the request
+    path and, for scoped requests, the user.
+    """
+    return (resources, tuple(versions.values()), request.get_full_path(), scoped_user(request))
+
+
+def cached_get(*resources):
+    """
+    Decorates an APIView `get` method so that its successful response data
+    is cached under the request path and the current versions of `resources`.
+
+    Responses carry an `X-Cache: HIT` or `X-Cache: MISS` header.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = cache_key(request, resources, resource_versions(request, resources))
+            cache = get_response_cache()
+            data = cache.get(key)
+            if data is not None:
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200 and isinstance(response, Response):
+                cache.set(key, response.data)
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
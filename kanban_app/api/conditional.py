@@ -0,0 +1,64 @@
+import hashlib
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from kanban_app.models import ResourceVersion
+
+
+def resource_versions(request, resources):
+    """
+    Returns the current versions of `resources`, read once per request and
+    shared between the ETag check and the response cache.
+    """
+    cached = getattr(request, '_resource_versions', None)
+    if cached is None or cached[0] != resources:
+        cached = (resources, ResourceVersion.objects.current(resources))
+        request._resource_versions = cached
+    return cached[1]
+
+
+def scoped_user(request):
+    """
+    Returns the id of the user a `?scope=mine` response is limited to, or
+    None when the response is the same for every client. ETags and cached
+    responses of scoped requests are kept apart per user.
+    """
+    if request.GET.get('scope') == 'mine':
+        return request.user.pk
+    return None
+
+
+def versioned_etag(*resources):
+    """
+    Builds an ETag function for Django's `condition` decorator.
+
+    The tag combines the request path, query string and Accept header with
+    the current version of every resource the response depends on, so it is
+    computed with one small query instead of running the view.
+    """
+    def etag_func(request, *args, **kwargs):
+        return make_etag(request, resource_versions(request, resources))
+    return etag_func
+
+
+def make_etag(request, versions):
+    """
+    Hashes the request path, query string and Accept header with `versions`
+    (and the user for scoped requests).
+    """
+    parts = [request.get_full_path(), request.META.get('HTTP_ACCEPT', '')]
+    parts += [f'{name}:{version}' for name, version in versions.items()]
+    user = scoped_user(request)
+    if user is not None:
+        parts.append(f'user:{user}')
+    return hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_get(*resources):
+    """
+    Decorates an APIView `get` method so that it answers 304 Not Modified
+    when the client's If-None-Match matches the current resource versions.
+    Authentication and permissions still run before the check.
+    """
+    return method_decorator(condition(etag_func=versioned_etag(*resources)))
@@ -0,0 +1,167 @@
+from rest_framework import serializers
+
+from kanban_app.search import search_contacts, search_tasks, task_search_terms
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """
+    Validates the query parameters accepted by the task list endpoint.
+
+    - `state`, `category` and `priority` match exactly.
+    - `due_date_from` / `due_date_to` bound the due date (both inclusive).
+    """
+    state = serializers.CharField(required=False)
+    category = serializers.CharField(required=False)
+    priority = serializers.CharField(required=False)
+    due_date_from = serializers.DateField(required=False)
+    due_date_to = serializers.DateField(required=False)
+
+    def validate(self, data):
+        due_date_from = data.get('due_date_from')
+        due_date_to = data.get('due_date_to')
+        if due_date_from and due_date_to and due_date_from > due_date_to:
+            raise serializers.ValidationError(
+                {'due_date_to': 'The end of the due date range must not be before its start'})
+        return data
+
+    def filter_queryset(self, queryset):
+        """
+        Applies the validated filters to a Task queryset.
+        The (state, due_date) index covers the most common combination.
+        """
+        lookups = {
+            'state': 'state',
+            'category': 'category',
+            'priority': 'priority',
+            'due_date_from': 'due_date__gte',
+            'due_date_to': 'due_date__lte',
+        }
+        filters = {lookups[name]: value for name, value in self.validated_data.items()}
+        return queryset.filter(**filters)
+
+
+class SubtaskFilterSerializer(serializers.Serializer):
+    """
+    Validates the query parameters accepted by the subtask list endpoint.
+    """
+    task_id = serializers.IntegerField(required=False, min_value=1)
+    is_completed = serializers.BooleanField(required=False)
+
+    def filter_queryset(self, queryset):
+        """
+        Applies the validated filters to a Subtask queryset.
+        The (task, is_completed) index covers both filters.
+        """
+        return queryset.filter(**self.validated_data)
+
+
+class ContactSearchSerializer(serializers.Serializer):
+    """
+    Validates the search and scope parameters of the contact list endpoint.
+
+    - `q` holds the search terms; a contact must match all of them.
+    - `limit` caps the number of ranked results (default 20, max 100).
+    - `scope=mine` limits the list or search to the contacts of the
+      requesting user (`context['user']`), the list sorted by name.
+    """
+    q = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100, default=20)
+    scope = serializers.ChoiceField(choices=['all', 'mine'], required=False, default='all')
+
+    @property
+    def is_search(self):
+        return bool(self.validated_data.get('q'))
+
+    @property
+    def is_scoped(self):
+        return self.validated_data['scope'] == 'mine'
+
+    def filter_queryset(self, queryset):
+        """
+        Returns the user's contacts ordered by (last name, first name, id),
+        which `contact_user_name_idx` serves without a sort, or `queryset` unchanged.
+        """
+        if not self.is_scoped:
+            return queryset
+        return queryset.filter(user=self.context['user']).order_by('last_name', 'first_name', 'id')
+
+    def search(self):
+        """
+        Returns the ids of the matching contacts, best match first.
+        """
+        user = self.context['user'].pk if self.is_scoped else None
+        return search_contacts(self.validated_data['q'], self.validated_data['limit'], user=user)
+
+
+class TaskSearchSerializer(serializers.Serializer):
+    """
+    Validates the parameters of the task search endpoint.
+
+    - `q` holds the search words; a task must contain all of them in its
+      title or description, the last one may be the start of a word.
+    - `page` / `page_size` select one page of the ranked results
+      (default 20 per page, max 100).
+    """
+    q = serializers.CharField(max_length=200)
+    page = serializers.IntegerField(required=False, min_value=1, max_value=1000, default=1)
+    page_size = serializers.IntegerField(required=False, min_value=1, max_value=100, default=20)
+
+    def validate_q(self, value):
+        if not task_search_terms(value):
+            raise serializers.ValidationError('Enter at least one word to search for.')
+        return value
+
+    def search(self):
+        """
+        Returns the hits of the requested page plus one, which tells whether a next page exists.
+        """
+        page_size = self.validated_data['page_size']
+        offset = (self.validated_data['page'] - 1) * page_size
+        return search_tasks(self.validated_data['q'], offset=offset, limit=page_size + 1)
+
+
+class FieldSelectionSerializer(serializers.Serializer):
+    """
+    Validates the sparse fieldset parameters of the read endpoints.
+
+    - `fields` lists the output keys to return, e.g. `id,title,state`;
+      `contacts.first_name` also nests the contacts, limited to that key.
+    - `expand` lists the relations to nest as objects, e.g. `contacts`;
+      relations that are not expanded are returned as primary keys.
+
+    Without either parameter the projection keeps its full default output.
+    """
+    fields = serializers.CharField(required=False)
+    expand = serializers.CharField(required=False, allow_blank=True)
+
+    def __init__(self, *args, projection, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.projection = projection
+
+    @staticmethod
+    def split(value):
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def validate_fields(self, value):
+        names = self.split(value)
+        if not names:
+            raise serializers.ValidationError('Please select at least one field')
+        unknown = self.projection.unknown_fields(names)
+        if unknown:
+            raise serializers.ValidationError(f'Unknown field(s): {", ".join(unknown)}')
+        return names
+
+    def validate_expand(self, value):
+        names = self.split(value)
+        unknown = self.projection.unknown_relations(names)
+        if unknown:
+            raise serializers.ValidationError(f'Cannot expand: {", ".join(unknown)}')
+        return names
+
+    def get_projection(self):
+        """
+        Returns the projection limited to the validated selection.
+        """
+        if not self.validated_data:
+            return self.projection
+        return self.projection.select(self.validated_data.get('fields'), self.validated_data.get('expand'))
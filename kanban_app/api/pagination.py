@@ -0,0 +1,75 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .streaming import streaming_response, wants_stream
+
+
+class KanbanCursorPagination(CursorPagination):
+    """
+    Opt-in keyset pagination for the kanban list endpoints.
+
+    - Requests without `page_size` or `cursor` are not paginated, so existing
+      clients keep receiving the plain list.
+    - Pages are ordered by the primary key and selected with `id > position`,
+      which costs the same at any depth and never runs a COUNT(*). A
+      queryset ordered otherwise (e.g. contacts by name) keeps its order.
+    """
+    ordering = 'id'
+    page_size = None
+    default_page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_page_size(self, request):
+        """
+        Returns the requested page size, falling back to the default one
+        when the client follows a cursor without repeating `page_size`.
+        """
+        page_size = super().get_page_size(request)
+        if page_size is None and self.cursor_query_param in request.query_params:
+            return self.default_page_size
+        return page_size
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(queryset.query.order_by) or super().get_ordering(request, queryset, view)
+
+
+def paginated_response(view, request, queryset, serializer_class, projection=None):
+    """
+    Serializes `queryset` for a list endpoint.
+
+    Returns a `{next, previous, results}` page when the client asked for
+    pagination, otherwise the full list as before. With a `projection`
+    (see kanban_app/api/projections.py) the rows are read with `values()`
+    and turned into the serializer's output shape without model instances;
+    `?stream=true` then streams the full list (see streaming.py).
+    """
+    paginator = KanbanCursorPagination()
+    if projection is not None:
+        queryset = projection.values(queryset)
+        serialize = projection.serialize
+    else:
+        serialize = lambda rows: serializer_class(rows, many=True).data
+    page = paginator.paginate_queryset(queryset, request, view=view)
+    if page is None:
+        if projection is not None and wants_stream(request):
+            return streaming_response(queryset, projection)
+        return Response(serialize(list(queryset)))
+    return paginator.get_paginated_response(serialize(page))
+
+
+def page_links(request, page, has_next):
+    """
+    Returns the (next, previous) URLs of a numbered page, e.g. ranked search
+    results, which cannot be paginated with a cursor over the primary key.
+    """
+    url = request.build_absolute_uri()
+    next_url = replace_query_param(url, 'page', page + 1) if has_next else None
+    if page <= 1:
+        previous_url = None
+    elif page == 2:
+        previous_url = remove_query_param(url, 'page')
+    else:
+        previous_url = replace_query_param(url, 'page', page - 1)
+    return next_url, previous_url
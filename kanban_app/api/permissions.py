@@ -12,7 +12,6 @@ class IsStaffOrReadOnly(BasePermission):
     """
 
     def has_permission(self, request, view):
-        print(request.user)
         if request.method in SAFE_METHODS:
             return True
         if bool(request.user and request.user.is_staff):
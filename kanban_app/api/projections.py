@@ -0,0 +1,321 @@
+import operator
+
+from join_back_end.metrics import timed
+from kanban_app.models import Subtask, Task
+
+# Read-only fast path for list responses.
+#
+# A projection produces exactly the JSON of the matching serializer with
+# `many=True`, but builds plain dicts from `values()` rows instead of model
+# instances and DRF field objects. Writes keep using the serializers;
+# kanban_app/tests.py checks that both outputs stay identical.
+#
+# Clients may ask for less with `?fields=` and `?expand=` (see
+# `FieldSelectionSerializer`); `select()` then returns a projection that
+# reads only the columns and relations the requested keys need.
+
+
+def iso_date(value):
+    return value.isoformat() if value else None
+
+
+def unique(items):
+    return list(dict.fromkeys(items))
+
+
+class Projection:
+    """
+    Base class: `fields` are the output keys in serializer order. Keys in
+    `columns` are copied from one `values()` column (through `converters`
+    when needed), the others are computed by `accessors(related)` from the
+    nested data named by `related(rows)`, one query per relation.
+
+    `expandable` maps the relations a client may nest to the projection of
+    the nested objects; `default_expand` are nested when the client does
+    not say. A relation that is not expanded is rendered as primary keys.
+
+    Call the projection with a queryset (or await `acall` on the async
+    path), or use `values()` and `serialize()` separately to paginate the
+    rows in between.
+    """
+    fields = ()
+    columns = {}
+    converters = {}
+    expandable = {}
+    default_expand = ()
+
+    def __init__(self, fields=None, expand=None, nested=None):
+        nested = nested or {}
+        self.selected = self.fields if fields is None else tuple(key for key in self.fields if key in fields)
+        expand = self.default_expand if expand is None else expand
+        # Nested objects only carry their plain columns, so expansion stops at one level.
+        self.nested = {
+            name: projection_class(
+                fields=nested.get(name) or [key for key in projection_class.fields if key in projection_class.columns],
+                expand=())
+            for name, projection_class in self.expandable.items()
+            if name in expand and name in self.selected
+        }
+
+    def select(self, fields=None, expand=None):
+        """
+        Returns a projection limited to `fields` with the relations in
+        `expand` nested; None keeps the defaults. A `relation.key` field
+        expands the relation and limits the nested objects to that key.
+        """
+        nested = {}
+        if fields is not None:
+            expand = set(self.default_expand if expand is None else expand)
+            for name in fields:
+                relation, _, key = name.partition('.')
+                if key:
+                    nested.setdefault(relation, []).append(key)
+                    expand.add(relation)
+            fields = {name.partition('.')[0] for name in fields}
+        return type(self)(fields, expand, nested)
+
+    @classmethod
+    def unknown_fields(cls, names):
+        def known(name):
+            relation, _, key = name.partition('.')
+            if not key:
+                return name in cls.fields
+            return relation in cls.expandable and key in cls.expandable[relation].columns
+        return [name for name in names if not known(name)]
+
+    @classmethod
+    def unknown_relations(cls, names):
+        return [name for name in names if name not in cls.expandable]
+
+    def value_columns(self):
+        """
+        The `id` (needed by the paginator and the relations) plus the columns of the selected keys.
+        """
+        return unique(['id'] + [self.columns[key] for key in self.selected if key in self.columns])
+
+    def values(self, queryset):
+        """
+        Returns `queryset` as a `values()` queryset with the projected columns
+        and the columns it is ordered by. Dict rows work with the cursor
+        paginator like model instances.
+        """
+        ordering = [name.lstrip('-') for name in queryset.query.order_by if isinstance(name, str)]
+        return queryset.prefetch_related(None).values(*unique(self.value_columns() + ordering))
+
+    def related(self, rows):
+        """
+        Returns {name: values() queryset} of the nested data `build` needs; one query each.
+        """
+        return {}
+
+    def accessors(self, related):
+        """
+        Returns {key: callable(row)} for the keys computed from `related`.
+        """
+        return {}
+
+    def row_builder(self, related, prefix=''):
+        """
+        Returns a callable turning one row into an output dict. `prefix` reads
+        the columns of a joined row, e.g. 'contact__' for `contact__first_name`.
+        """
+        accessors = self.accessors(related)
+        getters = []
+        for key in self.selected:
+            if key in accessors:
+                getters.append((key, accessors[key]))
+                continue
+            column = prefix + self.columns[key]
+            convert = self.converters.get(key)
+            if convert is None:
+                getters.append((key, operator.itemgetter(column)))
+            else:
+                getters.append((key, lambda row, column=column, convert=convert: convert(row[column])))
+        return lambda row: {key: get(row) for key, get in getters}
+
+    def build(self, rows, related):
+        build_row = self.row_builder(related)
+        return [build_row(row) for row in rows]
+
+    def serialize(self, rows):
+        related = {name: list(queryset) for name, queryset in self.related(rows).items()}
+        with timed('serialize'):
+            return self.build(rows, related)
+
+    async def aserialize(self, rows):
+        related = {name: [row async for row in queryset] for name, queryset in self.related(rows).items()}
+        with timed('serialize'):
+            return self.build(rows, related)
+
+    def __call__(self, queryset):
+        return self.serialize(list(self.values(queryset)))
+
+    async def acall(self, queryset):
+        return await self.aserialize([row async for row in self.values(queryset)])
+
+    def by_id(self, queryset, ids):
+        """
+        Returns {pk: serialized object} for the objects of `queryset` with the given primary keys.
+        """
+        rows = list(self.values(queryset.filter(pk__in=ids)))
+        return {row['id']: data for row, data in zip(rows, self.serialize(rows))}
+
+    def in_order(self, queryset, ids):
+        """
+        Serializes the objects of `queryset` with the given primary keys in
+        the order of `ids`, e.g. ranked search results.
+        """
+        objects = self.by_id(queryset, ids)
+        return [objects[pk] for pk in ids if pk in objects]
+
+    def get(self, queryset):
+        """
+        Like `queryset.get()` for a queryset filtered down to one object.
+        """
+        data = self(queryset)
+        if not data:
+            raise queryset.model.DoesNotExist(f'{queryset.model.__name__} matching query does not exist.')
+        return data[0]
+
+    async def aget(self, queryset):
+        data = await self.acall(queryset)
+        if not data:
+            raise queryset.model.DoesNotExist(f'{queryset.model.__name__} matching query does not exist.')
+        return data[0]
+
+
+def group_by(rows, key, convert):
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row[key], []).append(convert(row))
+    return grouped
+
+
+class ContactProjection(Projection):
+    """
+    Same output as `ContactSerializer(many=True).data`.
+    """
+    fields = ('user', 'id', 'first_name', 'last_name', 'phone', 'email', 'badge_color')
+    columns = {
+        'user': 'user_id', 'id': 'id', 'first_name': 'first_name', 'last_name': 'last_name',
+        'phone': 'phone', 'email': 'email', 'badge_color': 'badge_color',
+    }
+
+
+class TaskProjection(Projection):
+    """
+    Same output as `TaskSerializer(many=True).data`.
+    The assigned contacts of all rows are read with one extra query,
+    ordered by contact id like `TaskQuerySet.with_contacts`.
+    """
+    fields = ('id', 'title', 'description', 'category', 'due_date', 'priority', 'contacts', 'contacts_count', 'state')
+    columns = {
+        'id': 'id', 'title': 'title', 'description': 'description', 'category': 'category',
+        'due_date': 'due_date', 'priority': 'priority', 'contacts_count': 'contacts_count', 'state': 'state',
+    }
+    converters = {'due_date': iso_date}
+    expandable = {'contacts': ContactProjection}
+    default_expand = ('contacts',)
+
+    def related(self, rows):
+        if not rows or 'contacts' not in self.selected:
+            return {}
+        assigned = (Task.contacts.through.objects.filter(task_id__in=[row['id'] for row in rows])
+                    .order_by('contact_id'))
+        if 'contacts' in self.nested:
+            columns = ['contact__' + column for column in self.nested['contacts'].value_columns()]
+            return {'contacts': assigned.values('task_id', *columns)}
+        return {'contacts': assigned.values('task_id', 'contact_id')}
+
+    def accessors(self, related):
+        if 'contacts' in self.nested:
+            convert = self.nested['contacts'].row_builder({}, prefix='contact__')
+        else:
+            convert = operator.itemgetter('contact_id')
+        contacts = group_by(related.get('contacts', ()), 'task_id', convert)
+        return {'contacts': lambda row: contacts.get(row['id'], [])}
+
+
+class SubtaskProjection(Projection):
+    """
+    Same output as `SubtaskSerializer(many=True).data`.
+    """
+    fields = ('id', 'task', 'title', 'is_completed')
+    columns = {'id': 'id', 'task': 'task_id', 'title': 'title', 'is_completed': 'is_completed'}
+    expandable = {'task': TaskProjection}
+
+    def related(self, rows):
+        if 'task' not in self.nested or not rows:
+            return {}
+        return {
+            'task': Task.objects.filter(id__in={row['task_id'] for row in rows})
+                    .values(*self.nested['task'].value_columns()),
+        }
+
+    def accessors(self, related):
+        if 'task' not in self.nested:
+            return {}
+        build_task = self.nested['task'].row_builder({})
+        tasks = {row['id']: build_task(row) for row in related.get('task', ())}
+        return {'task': lambda row: tasks.get(row['task_id'])}
+
+
+class BoardTaskProjection(TaskProjection):
+    """
+    Same output as `BoardTaskSerializer(many=True).data`, with one query
+    for the tasks, one for their contacts and one for their subtasks.
+    `progress` comes from the task counters and needs no subtask query.
+    """
+    fields = TaskProjection.fields + ('subtasks', 'progress')
+    expandable = {**TaskProjection.expandable, 'subtasks': SubtaskProjection}
+    default_expand = ('contacts', 'subtasks')
+
+    def value_columns(self):
+        # The board groups the tasks by state, even when `state` is not an output key.
+        columns = super().value_columns() + ['state']
+        if 'progress' in self.selected:
+            columns += ['subtasks_done', 'subtasks_total']
+        return unique(columns)
+
+    def related(self, rows):
+        related = super().related(rows)
+        if rows and 'subtasks' in self.selected:
+            columns = self.nested['subtasks'].value_columns() if 'subtasks' in self.nested else ['id']
+            related['subtasks'] = (Subtask.objects.filter(task_id__in=[row['id'] for row in rows])
+                                   .order_by('id').values(*unique(columns + ['task_id'])))
+        return related
+
+    def accessors(self, related):
+        accessors = super().accessors(related)
+        if 'subtasks' in self.nested:
+            convert = self.nested['subtasks'].row_builder({})
+        else:
+            convert = operator.itemgetter('id')
+        subtasks = group_by(related.get('subtasks', ()), 'task_id', lambda row: row)
+        accessors['subtasks'] = lambda row: [convert(subtask) for subtask in subtasks.get(row['id'], ())]
+        accessors['progress'] = lambda row: {'done': row['subtasks_done'], 'total': row['subtasks_total']}
+        return accessors
+
+    def board(self, queryset):
+        """
+        Returns the tasks of `queryset` grouped by state.
+        """
+        rows = list(self.values(queryset))
+        return self.group(rows, self.serialize(rows))
+
+    async def aboard(self, queryset):
+        rows = [row async for row in self.values(queryset)]
+        return self.group(rows, await self.aserialize(rows))
+
+    @staticmethod
+    def group(rows, tasks):
+        board = {}
+        for row, task in zip(rows, tasks):
+            board.setdefault(row['state'], []).append(task)
+        return board
+
+
+contact_projection = ContactProjection()
+task_projection = TaskProjection()
+subtask_projection = SubtaskProjection()
+board_task_projection = BoardTaskProjection()
@@ -1,9 +1,33 @@
 from rest_framework import serializers
+from join_back_end.metrics import TimedListSerializer, TimedSerializerMixin
 from kanban_app.models import Subtask, Contact, Task
 from user_auth_app.models import UserProfile
 
 
-class ContactSerializer(serializers.ModelSerializer):
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves values from objects loaded in bulk.
+
+    Bulk endpoints pass `context={'prefetched': {Model: {pk: obj}}}` so that
+    validating many items does not look up every related object separately.
+    Without prefetched objects it behaves like `PrimaryKeyRelatedField`.
+    """
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get('prefetched', {}).get(self.queryset.model)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return prefetched[int(data)]
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+class ContactSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Contact model.
 
@@ -12,6 +36,7 @@ class ContactSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Contact
+        list_serializer_class = TimedListSerializer
         fields = [
             'user', 'id', 'first_name', 'last_name',
             'phone', 'email', 'badge_color'
@@ -47,26 +72,26 @@ class ContactSerializer(serializers.ModelSerializer):
         return errors
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Task model.
 
     Includes:
     - Nested read-only contact data.
     - Write-only field for assigning contacts via primary keys.
-    - Computed field for counting associated contacts.
+    - The stored number of associated contacts (see kanban_app/counters.py).
     """
     contacts = ContactSerializer(many=True, read_only=True)
-    contacts_ids = serializers.PrimaryKeyRelatedField(
+    contacts_ids = PrefetchedPrimaryKeyRelatedField(
         queryset=Contact.objects.all(),
         many=True,
         write_only=True,
         source='contacts'
     )
-    contacts_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'title', 'description', 'category',
                   'due_date', 'priority', 'contacts', 'contacts_count', 'contacts_ids', 'state']
         extra_kwargs = {
@@ -78,15 +103,24 @@ class TaskSerializer(serializers.ModelSerializer):
         }
 
     def validate(self, data):
-        title = data.get('title')
-        category = data.get('category')
-        date = data.get('due_date')
+        title = self.get_value_or_current(data, 'title')
+        category = self.get_value_or_current(data, 'category')
+        date = self.get_value_or_current(data, 'due_date')
 
         errors = self.check_task_data(title, category, date)
         if errors:
             raise serializers.ValidationError(errors)
         return data
 
+    def get_value_or_current(self, data, field):
+        """
+        Returns the submitted value of `field`, or the stored one for partial
+        updates that leave the field unchanged.
+        """
+        if self.partial and self.instance is not None and field not in data:
+            return getattr(self.instance, field)
+        return data.get(field)
+
     def check_task_data(self, title, category, date):
         errors = {}
         if not title or len(title) < 4:
@@ -100,14 +134,8 @@ class TaskSerializer(serializers.ModelSerializer):
 
         return errors
 
-    def get_contacts_count(self, obj):
-        """
-        Returns the number of contacts related to the task.
-        """
-        return obj.contacts.count()
-
 
-class SubtaskSerializer(serializers.ModelSerializer):
+class SubtaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Subtask model.
 
@@ -115,7 +143,7 @@ class SubtaskSerializer(serializers.ModelSerializer):
     - `task_id` is write-only and used for assigning a subtask to a task.
     """
     task = serializers.PrimaryKeyRelatedField(read_only=True)
-    task_id = serializers.PrimaryKeyRelatedField(
+    task_id = PrefetchedPrimaryKeyRelatedField(
         queryset=Task.objects.all(),
         write_only=True,
         source='task'
@@ -123,6 +151,7 @@ class SubtaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Subtask
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'task', 'task_id', 'title', 'is_completed']
         extra_kwargs = {
             'title': {'required': False, 'allow_null': True, 'allow_blank': True}
@@ -133,3 +162,24 @@ class SubtaskSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 'Please insert a subtask title with at least 3 characters')
         return title
+
+
+class BoardTaskSerializer(TaskSerializer):
+    """
+    Read-only task representation used by the board snapshot.
+
+    Extends the task fields with the nested subtasks and a `progress`
+    summary read from the stored subtask counters. Expects contacts and
+    subtasks to be prefetched (see `TaskQuerySet.for_board`).
+    """
+    subtasks = SubtaskSerializer(many=True, read_only=True)
+    progress = serializers.SerializerMethodField()
+
+    class Meta(TaskSerializer.Meta):
+        fields = TaskSerializer.Meta.fields + ['subtasks', 'progress']
+
+    def get_progress(self, obj):
+        """
+        Returns the number of completed subtasks and the total number of subtasks.
+        """
+        return {'done': obj.subtasks_done, 'total': obj.subtasks_total}
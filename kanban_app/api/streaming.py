@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from join_back_end.metrics import TimedJSONRenderer
+
+# Streamed list responses.
+#
+# `?stream=true` on an unpaginated list endpoint sends the JSON array in
+# pieces while the rows are read with `iterator(chunk_size=...)`: only one
+# chunk of rows and dicts is held in memory at a time, and the first bytes
+# leave before the last rows are read. The body is byte-identical to the
+# buffered response, but it is neither cached nor counted in the render phase.
+
+
+def wants_stream(request):
+    return request.GET.get('stream', '').lower() in ('1', 'true')
+
+
+def get_chunk_size():
+    return getattr(settings, 'KANBAN_STREAM_CHUNK_SIZE', 500)
+
+
+def encode_chunks(chunks):
+    """
+    Yields a JSON array in pieces, one per list of items in `chunks`.
+    """
+    renderer = TimedJSONRenderer()
+    separator = b''
+    yield b'['
+    for items in chunks:
+        if items:
+            # Rendering the chunk as a list keeps the renderer's settings; drop its brackets.
+            yield separator + renderer.render(items)[1:-1]
+            separator = b','
+    yield b']'
+
+
+async def aencode_chunks(chunks):
+    renderer = TimedJSONRenderer()
+    separator = b''
+    yield b'['
+    async for items in chunks:
+        if items:
+            yield separator + renderer.render(items)[1:-1]
+            separator = b','
+    yield b']'
+
+
+def serialized_chunks(rows, projection, chunk_size):
+    """
+    Serializes a `values()` queryset of `projection` chunk by chunk; each
+    chunk runs the projection's related queries once.
+    """
+    chunk = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield projection.serialize(chunk)
+            chunk = []
+    if chunk:
+        yield projection.serialize(chunk)
+
+
+async def aserialized_chunks(rows, projection, chunk_size):
+    chunk = []
+    async for row in rows.aiterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield await projection.aserialize(chunk)
+            chunk = []
+    if chunk:
+        yield await projection.aserialize(chunk)
+
+
+def streaming_response(rows, projection):
+    """
+    Returns a `StreamingHttpResponse` with the JSON list of `rows`, a `values()` queryset of `projection`.
+    """
+    chunks = serialized_chunks(rows, projection, get_chunk_size())
+    return StreamingHttpResponse(encode_chunks(chunks), content_type='application/json')
+
+
+def astreaming_response(rows, projection):
+    """
+    Same as `streaming_response` for ASGI, where the rows are read with the async ORM.
+    """
+    chunks = aserialized_chunks(rows, projection, get_chunk_size())
+    return StreamingHttpResponse(aencode_chunks(chunks), content_type='application/json')
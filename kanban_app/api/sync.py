@@ -0,0 +1,86 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from kanban_app.api.projections import contact_projection, subtask_projection, task_projection
+from kanban_app.models import Change, Contact, Subtask, Task
+from kanban_app.signals import CONTACT, SUBTASK, TASK
+
+# Days a change log entry is kept (KANBAN_CHANGES_RETENTION_DAYS).
+DEFAULT_RETENTION_DAYS = 30
+
+# Resource name -> (response key, queryset, projection)
+SYNC_RESOURCES = {
+    TASK: ('tasks', Task.objects.all(), task_projection),
+    SUBTASK: ('subtasks', Subtask.objects.all(), subtask_projection),
+    CONTACT: ('contacts', Contact.objects.all(), contact_projection),
+}
+
+
+class ChangesQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the delta sync endpoint.
+    """
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=5000, default=1000)
+
+
+def collect_changes(since, limit):
+    """
+    Returns everything that changed after sequence number `since`.
+
+    At most `limit` log entries are read per call. Several changes of one
+    object collapse into its latest state: current rows for created or
+    updated objects, ids for deleted ones. Pass the returned `seq` back as
+    `since` to continue; `has_more` tells whether entries are left.
+
+    The cost depends on the number of changes, not on the board size: one
+    query on the log plus one per resource type that changed.
+    """
+    entries = list(Change.objects.filter(seq__gt=since).order_by('seq')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for entry in entries:
+        latest[(entry.resource, entry.object_id)] = entry.deleted
+
+    data = {'seq': entries[-1].seq if entries else since, 'has_more': has_more}
+    deleted = {}
+    for resource, (key, queryset, projection) in SYNC_RESOURCES.items():
+        changed_ids = [pk for (name, pk), gone in latest.items() if name == resource and not gone]
+        data[key] = projection(queryset.filter(pk__in=changed_ids).order_by('pk')) if changed_ids else []
+        deleted[key] = sorted(pk for (name, pk), gone in latest.items() if name == resource and gone)
+    data['deleted'] = deleted
+    return data
+
+
+def is_pruned(since):
+    """
+    Tells whether log entries after `since` were pruned, so the changes
+    since then can no longer be listed and the client must reload.
+    """
+    oldest = Change.objects.order_by('seq').values_list('seq', flat=True).first()
+    return oldest is not None and since < oldest - 1
+
+
+def latest_seq():
+    return Change.objects.order_by('-seq').values_list('seq', flat=True).first() or 0
+
+
+def prune_changes(days=None):
+    """
+    Deletes the log entries older than `days` (default:
+    `KANBAN_CHANGES_RETENTION_DAYS`) and returns how many were deleted.
+
+    The newest entry is always kept: its sequence number marks how far the
+    log reaches, and on SQLite it keeps deleted sequence numbers from being
+    handed out again.
+    """
+    if days is None:
+        days = getattr(settings, 'KANBAN_CHANGES_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    deleted, _ = Change.objects.filter(changed_at__lt=cutoff, seq__lt=latest_seq()).delete()
+    return deleted
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.urls import include, path
-from kanban_app.api.views import ContactView, ContactSingleView, TaskListView, TaskDetailView, SubatasksListView, SubtaskSingleView
+from kanban_app.api.views import ContactView, ContactSingleView, TaskListView, TaskDetailView, TaskBulkView, TaskSearchView, SubatasksListView, SubtaskSingleView, BoardView, ChangesView, CacheStatsView
 
 
 # API URL configuration for the Kanban app.
@@ -16,8 +16,21 @@ urlpatterns = [
     path('tasks/', TaskListView.as_view(), name='task-list'),  # List and create tasks
     # Retrieve, update, delete a single task
     path('tasks/<int:pk>/', TaskDetailView.as_view(), name='task-detail'),
+    # Partially update many tasks at once
+    path('tasks/bulk/', TaskBulkView.as_view(), name='task-bulk'),
+    # Ranked full-text search over task titles and descriptions
+    path('tasks/search/', TaskSearchView.as_view(), name='task-search'),
 
     # Subtask endpoints
     path('subtasks/', SubatasksListView.as_view(), name='subtask-list'),  # List and create subtasks
     path('subtasks/<int:pk>/', SubtaskSingleView.as_view(), name='subtask-detail'),  # Retrieve, update, delete a subtask
+
+    # Board snapshot: tasks grouped by state with subtasks and contacts
+    path('board/', BoardView.as_view(), name='board'),
+
+    # Delta sync: rows changed or deleted since a sequence number
+    path('changes/', ChangesView.as_view(), name='changes'),
+
+    # Response cache hit/miss counters (admin only)
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
 ]
@@ -6,25 +6,48 @@ from kanban_app.models import Contact, Subtask, Task
 from kanban_app.api.serializers import ContactSerializer, TaskSerializer, SubtaskSerializer
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied
 from .permissions import IsAdminForDeleteOrPatchOrReadOnly, IsOwner, IsStaffOrReadOnly
+from .pagination import page_links, paginated_response
+from .projections import board_task_projection, contact_projection, subtask_projection, task_projection
+from .filters import ContactSearchSerializer, FieldSelectionSerializer, TaskFilterSerializer, TaskSearchSerializer, SubtaskFilterSerializer
+from .conditional import conditional_get
+from .caching import cached_get, get_response_cache
+from rest_framework.permissions import IsAdminUser
+from kanban_app.signals import CONTACT, TASK, SUBTASK
+from .sync import ChangesQuerySerializer, collect_changes, is_pruned, latest_seq
+from join_back_end.metrics import PhaseTimingMixin
+from .bulk import bulk_create_subtasks, bulk_update_subtasks, bulk_update_tasks, check_bulk_items
 
 # -------------------------
 # CONTACT VIEWS
 # -------------------------
 
 
-class ContactView(APIView):
+class ContactView(PhaseTimingMixin, APIView):
     """
     API endpoint to list all contacts or create a new contact.
+    `?q=` returns the best matches by name, email or phone instead (see kanban_app/search.py).
+    `?scope=mine` limits both to the requesting user's contacts.
     Accessible only to staff and superusers for write operations.
     """
     permission_classes = [IsStaffOrReadOnly]
 
+    @conditional_get(CONTACT)
+    @cached_get(CONTACT)
     def get(self, request):
-        contacts = Contact.objects.all()
-        serializer = ContactSerializer(contacts, many=True)
-        return Response(serializer.data)
+        search = ContactSearchSerializer(data=request.query_params.dict(), context={'user': request.user})
+        if not search.is_valid():
+            return Response({'data': search.errors, 'ok': False, 'error': 'Invalid contact search'}, status=status.HTTP_400_BAD_REQUEST)
+        if search.is_scoped and not request.user.is_authenticated:
+            raise NotAuthenticated('Log in to list your own contacts.')
+        selection = FieldSelectionSerializer(data=request.query_params.dict(), projection=contact_projection)
+        if not selection.is_valid():
+            return Response({'data': selection.errors, 'ok': False, 'error': 'Invalid field selection'}, status=status.HTTP_400_BAD_REQUEST)
+        contacts = search.filter_queryset(Contact.objects.all())
+        if search.is_search:
+            return Response(selection.get_projection().in_order(contacts, search.search()))
+        return paginated_response(self, request, contacts, ContactSerializer, selection.get_projection())
 
     def post(self, request):
         serializer = ContactSerializer(data=request.data)
@@ -35,17 +58,20 @@ class ContactView(APIView):
             return Response({'data': serializer.errors, 'ok': False, 'error': 'Contact not created, an error occurred'})
 
 
-class ContactSingleView(APIView):
+class ContactSingleView(PhaseTimingMixin, APIView):
     """
     API endpoint to retrieve, update or delete a specific contact.
     Only the owner, superuser, or 'Guest' can perform non-safe operations.
     """
     permission_classes = [IsOwner]
 
+    @conditional_get(CONTACT)
     def get(self, request, pk):
-        contact = Contact.objects.get(pk=pk)
-        serializer = ContactSerializer(contact)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        selection = FieldSelectionSerializer(data=request.query_params.dict(), projection=contact_projection)
+        if not selection.is_valid():
+            return Response({'data': selection.errors, 'ok': False, 'error': 'Invalid field selection'}, status=status.HTTP_400_BAD_REQUEST)
+        contact = selection.get_projection().get(Contact.objects.filter(pk=pk))
+        return Response(contact, status=status.HTTP_200_OK)
 
     def put(self, request, pk):
         contact = Contact.objects.get(pk=pk)
@@ -75,17 +101,24 @@ class ContactSingleView(APIView):
 # -------------------------
 
 
-class TaskListView(APIView):
+class TaskListView(PhaseTimingMixin, APIView):
     """
     API endpoint to list or create tasks.
     Write operations are restricted to staff users.
     """
     permission_classes = [IsStaffOrReadOnly]
 
+    @conditional_get(TASK, CONTACT)
+    @cached_get(TASK, CONTACT)
     def get(self, request):
-        tasks = Task.objects.all()
-        serializer = TaskSerializer(tasks, many=True)
-        return Response(serializer.data)
+        filters = TaskFilterSerializer(data=request.query_params.dict())
+        if not filters.is_valid():
+            return Response({'data': filters.errors, 'ok': False, 'error': 'Invalid task filters'}, status=status.HTTP_400_BAD_REQUEST)
+        selection = FieldSelectionSerializer(data=request.query_params.dict(), projection=task_projection)
+        if not selection.is_valid():
+            return Response({'data': selection.errors, 'ok': False, 'error': 'Invalid field selection'}, status=status.HTTP_400_BAD_REQUEST)
+        tasks = filters.filter_queryset(Task.objects.with_contacts())
+        return paginated_response(self, request, tasks, TaskSerializer, selection.get_projection())
 
     def post(self, request):
         serializer = TaskSerializer(data=request.data)
@@ -96,17 +129,20 @@ class TaskListView(APIView):
             return Response({'data': serializer.errors, 'ok': False, 'error': 'Task not created, an error occurred'})
 
 
-class TaskDetailView(APIView):
+class TaskDetailView(PhaseTimingMixin, APIView):
     """
     API endpoint to retrieve, update or delete a single task.
     Write and delete operations require staff permissions.
     """
     permission_classes = [IsAdminForDeleteOrPatchOrReadOnly]
 
+    @conditional_get(TASK, CONTACT)
     def get(self, request, pk):
-        task = Task.objects.get(pk=pk)
-        serializer = TaskSerializer(task)
-        return Response(serializer.data)
+        selection = FieldSelectionSerializer(data=request.query_params.dict(), projection=task_projection)
+        if not selection.is_valid():
+            return Response({'data': selection.errors, 'ok': False, 'error': 'Invalid field selection'}, status=status.HTTP_400_BAD_REQUEST)
+        task = selection.get_projection().get(Task.objects.filter(pk=pk))
+        return Response(task)
 
     def put(self, request, pk):
         task = Task.objects.get(pk=pk)
@@ -132,23 +168,80 @@ class TaskDetailView(APIView):
         return Response({'ok': True, 'message': 'Task successfully deleted'})
 
 
+class TaskSearchView(PhaseTimingMixin, APIView):
+    """
+    API endpoint for full-text task search: `?q=` finds the tasks containing
+    every word in their title or description, best match first, one page
+    (`page`, `page_size`) at a time. Each task carries a `highlight` with
+    its title and a description snippet, matches wrapped in <mark> tags.
+    Honors `?fields=` / `?expand=` like the task list.
+    """
+    permission_classes = [IsStaffOrReadOnly]
+
+    @conditional_get(TASK, CONTACT)
+    @cached_get(TASK, CONTACT)
+    def get(self, request):
+        search = TaskSearchSerializer(data=request.query_params.dict())
+        if not search.is_valid():
+            return Response({'data': search.errors, 'ok': False, 'error': 'Invalid task search'}, status=status.HTTP_400_BAD_REQUEST)
+        selection = FieldSelectionSerializer(data=request.query_params.dict(), projection=task_projection)
+        if not selection.is_valid():
+            return Response({'data': selection.errors, 'ok': False, 'error': 'Invalid field selection'}, status=status.HTTP_400_BAD_REQUEST)
+        page_size = search.validated_data['page_size']
+        hits = search.search()
+        tasks = selection.get_projection().by_id(Task.objects.all(), [hit['id'] for hit in hits[:page_size]])
+        results = [
+            {**tasks[hit['id']], 'highlight': {'title': hit['title'], 'description': hit['description']}}
+            for hit in hits[:page_size] if hit['id'] in tasks
+        ]
+        next_url, previous_url = page_links(request, search.validated_data['page'], len(hits) > page_size)
+        return Response({'next': next_url, 'previous': previous_url, 'results': results})
+
+
+class TaskBulkView(PhaseTimingMixin, APIView):
+    """
+    API endpoint to partially update many tasks in one request,
+    e.g. after dragging several cards or a multi-select edit.
+    Expects a list of {id, <changed fields>}; requires staff permissions.
+    """
+    permission_classes = [IsStaffOrReadOnly]
+
+    def patch(self, request):
+        error = check_bulk_items(request.data)
+        if error:
+            return Response({'ok': False, 'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        ok, results = bulk_update_tasks(request.data)
+        if ok:
+            return Response({'data': results, 'ok': True, 'message': 'Tasks successfully updated'})
+        return Response({'data': results, 'ok': False, 'error': 'No task updated, some items are invalid'}, status=status.HTTP_400_BAD_REQUEST)
+
+
 # -------------------------
 # SUBTASK VIEWS
 # -------------------------
 
-class SubatasksListView(APIView):
+class SubatasksListView(PhaseTimingMixin, APIView):
     """
     API endpoint to list all subtasks or create a new subtask.
     Write access is limited to staff users.
     """
     permission_classes = [IsStaffOrReadOnly]
 
+    @conditional_get(SUBTASK)
+    @cached_get(SUBTASK)
     def get(self, request):
-        subtasks = Subtask.objects.all()
-        serializer = SubtaskSerializer(subtasks, many=True)
-        return Response(serializer.data)
+        filters = SubtaskFilterSerializer(data=request.query_params.dict())
+        if not filters.is_valid():
+            return Response({'data': filters.errors, 'ok': False, 'error': 'Invalid subtask filters'}, status=status.HTTP_400_BAD_REQUEST)
+        selection = FieldSelectionSerializer(data=request.query_params.dict(), projection=subtask_projection)
+        if not selection.is_valid():
+            return Response({'data': selection.errors, 'ok': False, 'error': 'Invalid field selection'}, status=status.HTTP_400_BAD_REQUEST)
+        subtasks = filters.filter_queryset(Subtask.objects.all())
+        return paginated_response(self, request, subtasks, SubtaskSerializer, selection.get_projection())
 
     def post(self, request):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
         serializer = SubtaskSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
@@ -156,18 +249,46 @@ class SubatasksListView(APIView):
         else:
             return Response({'data': serializer.errors, 'ok': False, 'error': 'An error occurred during the subtask creation'}, status=status.HTTP_400_BAD_REQUEST)
 
+    def bulk_create(self, request):
+        """
+        Creates every subtask of a list in one insert.
+        """
+        error = check_bulk_items(request.data, require_id=False)
+        if error:
+            return Response({'ok': False, 'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        ok, results = bulk_create_subtasks(request.data)
+        if ok:
+            return Response({'data': results, 'ok': True, 'message': 'Subtasks successfully created'}, status=status.HTTP_201_CREATED)
+        return Response({'data': results, 'ok': False, 'error': 'No subtask created, some items are invalid'}, status=status.HTTP_400_BAD_REQUEST)
+
+    def patch(self, request):
+        """
+        Partially updates many subtasks, e.g. toggling `is_completed`.
+        Expects a list of {id, <changed fields>}.
+        """
+        error = check_bulk_items(request.data)
+        if error:
+            return Response({'ok': False, 'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        ok, results = bulk_update_subtasks(request.data)
+        if ok:
+            return Response({'data': results, 'ok': True, 'message': 'Subtasks successfully updated'})
+        return Response({'data': results, 'ok': False, 'error': 'No subtask updated, some items are invalid'}, status=status.HTTP_400_BAD_REQUEST)
 
-class SubtaskSingleView(APIView):
+
+class SubtaskSingleView(PhaseTimingMixin, APIView):
     """
     API endpoint to retrieve, update, or delete a single subtask.
     Only staff users have write/delete access.
     """
     permission_classes = [IsAdminForDeleteOrPatchOrReadOnly]
 
+    @conditional_get(SUBTASK)
     def get(self, request, pk):
-        subtask = Subtask.objects.get(pk=pk)
-        serializer = SubtaskSerializer(subtask)
-        return Response(serializer.data)
+        selection = FieldSelectionSerializer(data=request.query_params.dict(), projection=subtask_projection)
+        if not selection.is_valid():
+            return Response({'data': selection.errors, 'ok': False, 'error': 'Invalid field selection'}, status=status.HTTP_400_BAD_REQUEST)
+        subtask = selection.get_projection().get(Subtask.objects.filter(pk=pk))
+        return Response(subtask)
 
     def put(self, request, pk):
         subtask = Subtask.objects.get(pk=pk)
@@ -191,3 +312,56 @@ class SubtaskSingleView(APIView):
         serializer = SubtaskSerializer(subtask)
         subtask.delete()
         return Response({'data': serializer.data, 'ok': True, 'message': 'Subtask successfully deleted'})
+
+
+# -------------------------
+# BOARD VIEWS
+# -------------------------
+
+class BoardView(PhaseTimingMixin, APIView):
+    """
+    API endpoint returning the whole board in a single response.
+    Tasks are grouped by state and include their subtasks, progress and contacts.
+    Runs three queries (tasks, contacts, subtasks) regardless of the board size and
+    builds the `BoardTaskSerializer` output from plain rows (see projections.py).
+    """
+    permission_classes = [IsStaffOrReadOnly]
+
+    @conditional_get(TASK, CONTACT, SUBTASK)
+    @cached_get(TASK, CONTACT, SUBTASK)
+    def get(self, request):
+        selection = FieldSelectionSerializer(data=request.query_params.dict(), projection=board_task_projection)
+        if not selection.is_valid():
+            return Response({'data': selection.errors, 'ok': False, 'error': 'Invalid field selection'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(selection.get_projection().board(Task.objects.order_by('id')))
+
+
+class ChangesView(PhaseTimingMixin, APIView):
+    """
+    API endpoint for delta sync.
+    Returns the contacts, tasks and subtasks changed after `?since=<seq>`
+    together with the ids of deleted ones, so clients only download what changed.
+    Answers 410 Gone when the log entries after `since` were pruned.
+    """
+    permission_classes = [IsStaffOrReadOnly]
+
+    def get(self, request):
+        query = ChangesQuerySerializer(data=request.query_params.dict())
+        if not query.is_valid():
+            return Response({'data': query.errors, 'ok': False, 'error': 'Invalid sync parameters'}, status=status.HTTP_400_BAD_REQUEST)
+        if is_pruned(query.validated_data['since']):
+            return Response({'seq': latest_seq(), 'ok': False,
+                             'error': 'Changes since this sequence number were pruned; reload and sync from seq'},
+                            status=status.HTTP_410_GONE)
+        return Response(collect_changes(**query.validated_data))
+
+
+class CacheStatsView(PhaseTimingMixin, APIView):
+    """
+    API endpoint exposing the response cache hit/miss counters.
+    Restricted to admin users.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_response_cache().stats())
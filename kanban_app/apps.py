@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class KanbanAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kanban_app'
+
+    def ready(self):
+        # Connect the model signals that keep versions and caches up to date.
+        from kanban_app import signals  # noqa: F401
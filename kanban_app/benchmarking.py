@@ -0,0 +1,154 @@
+import datetime
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test.utils import (setup_databases, setup_test_environment, teardown_databases,
+                               teardown_test_environment)
+from rest_framework.authtoken.models import Token
+
+from kanban_app.counters import rebuild_counters
+from kanban_app.models import Contact, Subtask, Task
+from kanban_app.signals import CONTACT, SUBTASK, TASK, notify_changed
+
+STATES = ['todo', 'in-progress', 'await-feedback', 'done']
+CATEGORIES = ['Technical Task', 'User Story']
+PRIORITIES = ['urgent', 'medium', 'low']
+
+
+class _Rollback(Exception):
+    """
+    Raised internally to discard the data created by a benchmark.
+    """
+
+
+@contextmanager
+def throwaway_data():
+    """
+    Runs the block inside a transaction that is always rolled back,
+    so benchmarks can seed large datasets without touching the real data.
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+@contextmanager
+def test_database():
+    """
+    Runs the block against a freshly created test database that is dropped
+    afterwards. Unlike `throwaway_data`, writes are committed, so concurrent
+    threads (e.g. a simulated threaded server) see the seeded rows.
+    """
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def seed_board(tasks=1000, contacts=200, contacts_per_task=2, subtasks_per_task=3, users=1, seed=42,
+               password='password123', batch_size=1000):
+    """
+    Inserts a realistic board with `bulk_create`: `users` staff users with
+    API tokens (the first one is `bench-owner`), contacts spread across
+    them, tasks with assigned contacts and subtasks. Existing users of the
+    same names are reused. Returns the owner.
+
+    Model signals do not fire for bulk inserts; the task counters are
+    recounted at the end and the created rows are announced with
+    `notify_changed`, which bumps the resource versions, logs them for the
+    delta sync endpoint and publishes them as live events.
+    """
+    rng = random.Random(seed)
+    usernames = ['bench-owner'] + [f'bench-user-{i}' for i in range(1, users)]
+    password = make_password(password)
+    User.objects.bulk_create(
+        (User(username=name, email=f'{name}@example.com', first_name=name.title(), last_name='Bench',
+              password=password, is_staff=True, is_superuser=True)
+         for name in usernames),
+        batch_size=batch_size, ignore_conflicts=True,
+    )
+    owners = list(User.objects.filter(username__in=usernames).order_by('id'))
+    Token.objects.bulk_create(
+        (Token(key=Token.generate_key(), user=user) for user in owners),
+        batch_size=batch_size, ignore_conflicts=True,
+    )
+    new_contacts = Contact.objects.bulk_create(
+        [Contact(user=owners[i % len(owners)], first_name=f'First{i}', last_name=f'Last{i}',
+                 email=f'contact{i}@example.com', phone=f'+49 {rng.randrange(10**9):09d}',
+                 badge_color=rng.choice(['red', 'blue', 'green']))
+         for i in range(contacts)],
+        batch_size=batch_size,
+    )
+    start = datetime.date(2025, 1, 1)
+    new_tasks = Task.objects.bulk_create(
+        [Task(title=f'Task {i}', description=f'Description of task {i}', category=rng.choice(CATEGORIES),
+              priority=rng.choice(PRIORITIES), state=rng.choice(STATES),
+              due_date=start + datetime.timedelta(days=rng.randrange(1000)))
+         for i in range(tasks)],
+        batch_size=batch_size,
+    )
+    contact_ids = [contact.pk for contact in new_contacts]
+    task_ids = [task.pk for task in new_tasks]
+    through = Task.contacts.through
+    through.objects.bulk_create(
+        (through(task_id=task_id, contact_id=contact_id)
+         for task_id in task_ids
+         for contact_id in rng.sample(contact_ids, min(contacts_per_task, len(contact_ids)))),
+        batch_size=batch_size,
+    )
+    new_subtasks = Subtask.objects.bulk_create(
+        [Subtask(task_id=task_id, title=f'Subtask {i} of {task_id}', is_completed=rng.random() < 0.5)
+         for task_id in task_ids for i in range(subtasks_per_task)],
+        batch_size=batch_size,
+    )
+    if task_ids:
+        rebuild_counters(Task.objects.filter(pk__range=(task_ids[0], task_ids[-1])))
+    notify_changed(CONTACT, contact_ids)
+    notify_changed(TASK, task_ids)
+    notify_changed(SUBTASK, [subtask.pk for subtask in new_subtasks])
+    return owners[0]
+
+
+def measure(func, repeat=50, warmup=3):
+    """
+    Calls `func` repeatedly and returns latency statistics in milliseconds.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'mean': statistics.fmean(samples),
+        'p50': percentile(samples, 50),
+        'p95': percentile(samples, 95),
+        'p99': percentile(samples, 99),
+    }
+
+
+def percentile(sorted_samples, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_samples:
+        return 0.0
+    index = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def format_stats(stats):
+    return '  '.join(f'{name}={value:.3f}ms' for name, value in stats.items())
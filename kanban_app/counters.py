@@ -0,0 +1,89 @@
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from kanban_app.models import Subtask, Task
+
+# Denormalized task counters.
+#
+# `Task.subtasks_total`, `subtasks_done` and `contacts_count` are what the
+# board cards show. Writes change them with F() expressions in the same
+# transaction as the rows they count: the model signals (kanban_app/signals.py)
+# for single saves and deletes, the bulk endpoints (kanban_app/api/bulk.py)
+# for set-based writes. `QuerySet.update()` on subtasks and raw SQL bypass
+# both; `manage.py check_task_counters` finds the drift and
+# `manage.py rebuild_task_counters` recounts.
+
+
+def adjust_counters(deltas):
+    """
+    Applies {task_id: {counter: delta}} with one UPDATE per distinct change.
+    F() expressions let concurrent writers add up instead of overwriting each other.
+    """
+    groups = defaultdict(list)
+    for task_id, changes in deltas.items():
+        changes = tuple(sorted((name, delta) for name, delta in changes.items() if delta))
+        if changes:
+            groups[changes].append(task_id)
+    for changes, task_ids in groups.items():
+        Task.objects.filter(pk__in=task_ids).update(**{name: F(name) + delta for name, delta in changes})
+
+
+def subtask_deltas(before, after):
+    """
+    Returns the counter deltas of subtasks going from the `before` to the
+    `after` (task_id, is_completed) states; a created subtask has no
+    `before` state, a deleted one no `after` state.
+    """
+    deltas = defaultdict(Counter)
+    for task_id, is_completed in before:
+        deltas[task_id]['subtasks_total'] -= 1
+        deltas[task_id]['subtasks_done'] -= int(is_completed)
+    for task_id, is_completed in after:
+        deltas[task_id]['subtasks_total'] += 1
+        deltas[task_id]['subtasks_done'] += int(is_completed)
+    return deltas
+
+
+def contact_deltas(task_ids, delta):
+    return {task_id: {'contacts_count': delta} for task_id in task_ids}
+
+
+def actual_counts():
+    """
+    Returns {counter: expression} counting the rows of each task, for `annotate()` or `update()`.
+    """
+    def count(queryset):
+        rows = queryset.filter(task=OuterRef('pk')).order_by().values('task').annotate(n=Count('pk')).values('n')
+        return Coalesce(Subquery(rows), Value(0))
+
+    return {
+        'subtasks_total': count(Subtask.objects.all()),
+        'subtasks_done': count(Subtask.objects.filter(is_completed=True)),
+        'contacts_count': count(Task.contacts.through.objects.all()),
+    }
+
+
+def counter_mismatches(tasks=None):
+    """
+    Returns the tasks of `tasks` (default: all) whose stored counters differ
+    from the real counts, as dicts of the stored and `actual_` values.
+    """
+    tasks = Task.objects.all() if tasks is None else tasks
+    actual = {f'actual_{name}': expression for name, expression in actual_counts().items()}
+    return list(
+        tasks.annotate(**actual)
+        .exclude(**{name: F(f'actual_{name}') for name in Task.COUNTERS})
+        .order_by('pk')
+        .values('pk', *Task.COUNTERS, *actual)
+    )
+
+
+def rebuild_counters(tasks=None):
+    """
+    Recounts the counters of `tasks` (default: all) with one UPDATE.
+    Returns the number of tasks updated.
+    """
+    tasks = Task.objects.all() if tasks is None else tasks
+    return tasks.update(**actual_counts())
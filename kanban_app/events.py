@@ -0,0 +1,211 @@
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+from kanban_app.models import Change
+from kanban_app.signals import resources_changed
+
+DEFAULTS = {
+    'BACKEND': 'memory',
+    'QUEUE_SIZE': 100,
+    'HEARTBEAT': 15,
+    'POLL_INTERVAL': 1.0,
+}
+
+
+class Subscription:
+    """
+    The event queue of one connected client.
+
+    The queue is bounded: when a slow client lets it fill up, further events
+    are dropped and `overflowed` is set, telling the stream to ask the client
+    for a full resync instead of buffering without limit.
+    """
+
+    def __init__(self, queue_size):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def offer(self, event):
+        """
+        Enqueues `event`; must run on the subscription's event loop.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """
+        Waits up to `timeout` seconds for the next event; returns None on timeout.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self):
+        """
+        Drops queued events and clears the overflow flag after a resync.
+        """
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.overflowed = False
+
+
+class MemoryBroker:
+    """
+    In-process pub/sub: events published by this process are delivered to
+    the clients connected to this process.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self.subscriptions = set()
+        self.lock = threading.Lock()
+
+    def subscribe(self):
+        subscription = Subscription(self.queue_size)
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def publish(self, event):
+        """
+        Delivers `event` to every subscriber; safe to call from any thread.
+        """
+        self.deliver(event)
+
+    def deliver(self, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's event loop is closed.
+                self.unsubscribe(subscription)
+
+
+class DatabaseBroker(MemoryBroker):
+    """
+    Cross-process pub/sub backed by the `Change` log in the database.
+
+    Every process writes its changes to the shared log anyway; a single
+    poller task per process reads new entries every `poll_interval` seconds
+    while at least one client is connected and fans them out locally.
+    """
+
+    def __init__(self, queue_size=100, poll_interval=1.0):
+        super().__init__(queue_size)
+        self.poll_interval = poll_interval
+        self.poller = None
+        self.last_seq = None
+
+    def subscribe(self):
+        subscription = super().subscribe()
+        if self.poller is None or self.poller.done():
+            self.poller = asyncio.get_running_loop().create_task(self.poll())
+        return subscription
+
+    def publish(self, event):
+        # Other processes see the change through the log; nothing to send.
+        pass
+
+    async def poll(self):
+        if self.last_seq is None:
+            last = await Change.objects.order_by('-seq').afirst()
+            self.last_seq = last.seq if last else 0
+        while self.subscriptions:
+            entries = [entry async for entry in Change.objects.filter(seq__gt=self.last_seq).order_by('seq')[:1000]]
+            for entry in entries:
+                self.deliver({
+                    'seq': entry.seq,
+                    'resource': entry.resource,
+                    'ids': [entry.object_id],
+                    'deleted': entry.deleted,
+                })
+                self.last_seq = entry.seq
+            await asyncio.sleep(self.poll_interval)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'KANBAN_EVENTS', {})}
+
+
+_broker = None
+
+
+def get_broker():
+    """
+    Returns the event broker configured by `KANBAN_EVENTS`.
+    """
+    global _broker
+    if _broker is None:
+        config = get_config()
+        if config['BACKEND'] == 'database':
+            _broker = DatabaseBroker(config['QUEUE_SIZE'], config['POLL_INTERVAL'])
+        else:
+            _broker = MemoryBroker(config['QUEUE_SIZE'])
+    return _broker
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    global _broker
+    if setting == 'KANBAN_EVENTS':
+        _broker = None
+
+
+@receiver(resources_changed)
+def publish_change(sender, resource, pks, deleted, **kwargs):
+    """
+    Publishes the change once the surrounding transaction has committed.
+    """
+    if _broker is None or not pks:
+        return
+    event = {'resource': resource, 'ids': pks, 'deleted': deleted}
+    broker = _broker
+    transaction.on_commit(lambda: broker.publish(event))
+
+
+def format_event(event):
+    """
+    Formats an event as a Server-Sent Events message.
+    """
+    message = f"event: change\ndata: {json.dumps(event)}\n\n"
+    if 'seq' in event:
+        message = f"id: {event['seq']}\n" + message
+    return message
+
+
+async def event_stream(broker, subscription, heartbeat):
+    """
+    Yields the SSE messages of one client until it disconnects.
+
+    An idle client costs one pending queue read; a comment line is sent
+    every `heartbeat` seconds to keep proxies from closing the connection.
+    """
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            event = await subscription.get(heartbeat)
+            if subscription.overflowed:
+                subscription.drain()
+                yield 'event: resync\ndata: {}\n\n'
+            elif event is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from kanban_app.benchmarking import percentile, seed_board, test_database
+
+
+class Command(BaseCommand):
+    """
+    Compares the WSGI deployment (sync DRF views on a thread pool) with the
+    ASGI deployment (async read views on one event loop) of join_back_end.
+
+    Both run in-process through Django's test clients against a seeded test
+    database, so the numbers compare the request handling paths rather than
+    a particular web server.
+    """
+    help = 'Benchmark requests/second and tail latency of the WSGI and ASGI read paths.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=500, help='Tasks to seed (default: 500).')
+        parser.add_argument('--requests', type=int, default=400, help='Requests per deployment (default: 400).')
+        parser.add_argument('--concurrency', type=int, default=16,
+                            help='Concurrent requests / server threads (default: 16).')
+        parser.add_argument('--cache', action='store_true',
+                            help='Keep the response cache enabled (disabled by default to measure the read path).')
+
+    def handle(self, *args, **options):
+        cache = {} if options['cache'] else {'MAX_ENTRIES': 0}
+        with test_database(), override_settings(KANBAN_RESPONSE_CACHE={'BACKEND': 'local', **cache}):
+            seed_board(tasks=options['tasks'], contacts=max(10, options['tasks'] // 5))
+            task_id = self.first_task_id()
+            urls = [reverse('task-list'), reverse('task-detail', args=[task_id]),
+                    reverse('contact-list'), reverse('board'), reverse('task-list') + '?page_size=50']
+            urls = [urls[i % len(urls)] for i in range(options['requests'])]
+            self.stdout.write(f'{len(urls)} requests, concurrency {options["concurrency"]}, {options["tasks"]} tasks')
+            self.stdout.write(f'{"deployment":<12}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"errors":>8}')
+            self.report('WSGI', *self.run_wsgi(urls, options['concurrency']))
+            self.report('ASGI', *self.run_asgi(urls, options['concurrency']))
+
+    def first_task_id(self):
+        from kanban_app.models import Task
+        return Task.objects.values_list('id', flat=True).first()
+
+    def run_wsgi(self, urls, concurrency):
+        local = threading.local()
+
+        def request(url):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            start = time.perf_counter()
+            status = local.client.get(url).status_code
+            return (time.perf_counter() - start) * 1000, status
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(request, urls))
+        return results, time.perf_counter() - start
+
+    def run_asgi(self, urls, concurrency):
+        async def main():
+            client = AsyncClient()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def request(url):
+                async with semaphore:
+                    start = time.perf_counter()
+                    status = (await client.get(url)).status_code
+                    return (time.perf_counter() - start) * 1000, status
+
+            start = time.perf_counter()
+            results = await asyncio.gather(*(request(url) for url in urls))
+            return results, time.perf_counter() - start
+        return asyncio.run(main())
+
+    def report(self, label, results, elapsed):
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, status in results if status != 200)
+        self.stdout.write(
+            f'{label:<12}{len(results) / elapsed:>10.1f}{percentile(latencies, 50):>10.2f}'
+            f'{percentile(latencies, 95):>10.2f}{percentile(latencies, 99):>10.2f}{errors:>8}')
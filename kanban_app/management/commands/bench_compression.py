@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from join_back_end.compression import WBITS, compress, get_config
+from kanban_app.benchmarking import measure, seed_board, test_database
+
+
+class Command(BaseCommand):
+    """
+    Weighs CPU time against bytes saved: compresses the board, task and
+    contact lists of a seeded test database with every encoding and a few
+    levels, then times polling the board uncompressed, compressed on every
+    request and served from the compressed-body cache.
+    """
+    help = 'Benchmark response compression: CPU time versus bytes on the wire.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=2000, help='Tasks to seed (default: 2000).')
+        parser.add_argument('--levels', type=int, nargs='+', default=[1, 6, 9],
+                            help='zlib levels to compare (default: 1 6 9).')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per variant (default: 20).')
+
+    def handle(self, *args, **options):
+        with test_database():
+            seed_board(tasks=options['tasks'], contacts=max(10, options['tasks'] // 10))
+            client = Client(HTTP_ACCEPT='application/json')
+            payloads = {name: client.get(reverse(name)).content for name in ('board', 'task-list', 'contact-list')}
+            self.compare_levels(payloads, options)
+            self.compare_polling(options)
+
+    def compare_levels(self, payloads, options):
+        self.stdout.write(f'{"payload":<14}{"encoding":<10}{"level":>6}{"bytes":>12}{"ratio":>8}{"p50 ms":>10}')
+        for name, body in payloads.items():
+            self.stdout.write(f'{name:<14}{"identity":<10}{"":>6}{len(body):>12}{1:>8.1f}{0:>10.2f}')
+            for encoding in WBITS:
+                for level in options['levels']:
+                    size = len(compress(body, encoding, level))
+                    stats = measure(lambda: compress(body, encoding, level), repeat=options['repeat'], warmup=1)
+                    self.stdout.write(f'{name:<14}{encoding:<10}{level:>6}{size:>12}'
+                                      f'{len(body) / size:>8.1f}{stats["p50"]:>10.2f}')
+
+    def compare_polling(self, options):
+        """
+        Repeated polls of an unchanged board through the whole middleware stack.
+        """
+        enabled = {**get_config(), 'ENABLED': True}
+        variants = [
+            ('identity', {}, enabled),
+            ('gzip, no cache', {'HTTP_ACCEPT_ENCODING': 'gzip'}, {**enabled, 'CACHE_ENTRIES': 0}),
+            ('gzip, cached', {'HTTP_ACCEPT_ENCODING': 'gzip'}, enabled),
+        ]
+        self.stdout.write(f'\n{"board poll":<18}{"bytes":>12}{"p50 ms":>10}{"p95 ms":>10}')
+        for label, headers, config in variants:
+            with override_settings(RESPONSE_COMPRESSION=config):
+                client = Client(HTTP_ACCEPT='application/json', **headers)
+                size = len(client.get(reverse('board')).content)
+                stats = measure(lambda: client.get(reverse('board')), repeat=options['repeat'], warmup=2)
+            self.stdout.write(f'{label:<18}{size:>12}{stats["p50"]:>10.2f}{stats["p95"]:>10.2f}')
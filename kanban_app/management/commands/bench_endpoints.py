@@ -0,0 +1,230 @@
+import itertools
+import json
+from collections import namedtuple
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from kanban_app.api.urls import urlpatterns as kanban_urlpatterns
+from kanban_app.benchmarking import measure, seed_board, test_database
+from kanban_app.models import Contact, Subtask, Task
+from user_auth_app.api.urls import urlpatterns as auth_urlpatterns
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'endpoints.json'
+
+# Named routes that are not benchmarked, with the reason.
+SKIPPED = {}
+
+# name: label in the report and baseline; path: callable(ctx) -> URL;
+# body: callable(ctx, n) -> JSON body for the n-th call, or None.
+Scenario = namedtuple('Scenario', 'name url_name method path body')
+
+
+def scenarios():
+    """
+    One or more requests per named route of the kanban and auth APIs.
+    Write scenarios only create or modify rows, so they can be repeated.
+    """
+    def url(name, **params):
+        return lambda ctx: reverse(name) + ('?' + '&'.join(f'{k}={v}' for k, v in params.items()) if params else '')
+
+    def detail(name, key):
+        return lambda ctx: reverse(name, args=[ctx[key]])
+
+    def contact(ctx, n):
+        return {'first_name': f'Bench{n}', 'last_name': 'Contact', 'email': f'bench{n}@example.com',
+                'phone': '+49 123456', 'user': ctx['owner_id']}
+
+    def task(ctx, n):
+        return {'title': f'Bench task {n}', 'description': 'Created by bench_endpoints', 'category': 'User Story',
+                'priority': 'medium', 'state': 'todo', 'due_date': '2025-06-01',
+                'contacts_ids': ctx['contact_ids'][:2]}
+
+    def user(ctx, n):
+        return {'username': f'bench-new-{n}', 'first_name': 'Bench', 'last_name': 'User',
+                'email': f'bench-new-{n}@example.com', 'password': 'password123'}
+
+    return [
+        Scenario('GET contacts', 'contact-list', 'get', url('contact-list'), None),
+        Scenario('GET contacts page', 'contact-list', 'get', url('contact-list', page_size=50), None),
+        Scenario('GET contacts search', 'contact-list', 'get', url('contact-list', q='last1'), None),
+        Scenario('GET contacts mine', 'contact-list', 'get', url('contact-list', scope='mine'), None),
+        Scenario('POST contacts', 'contact-list', 'post', url('contact-list'), contact),
+        Scenario('GET contact', 'contact-detail', 'get', detail('contact-detail', 'contact_id'), None),
+        Scenario('PUT contact', 'contact-detail', 'put', detail('contact-detail', 'contact_id'), contact),
+        Scenario('GET tasks', 'task-list', 'get', url('task-list'), None),
+        Scenario('GET tasks page', 'task-list', 'get', url('task-list', page_size=50), None),
+        Scenario('GET tasks filtered', 'task-list', 'get', url('task-list', state='todo', priority='urgent'), None),
+        Scenario('GET tasks streamed', 'task-list', 'get', url('task-list', stream='true'), None),
+        Scenario('GET tasks sparse', 'task-list', 'get', url('task-list', fields='id,title,state', expand=''), None),
+        Scenario('GET tasks search', 'task-search', 'get', url('task-search', q='task 12'), None),
+        Scenario('POST tasks', 'task-list', 'post', url('task-list'), task),
+        Scenario('GET task', 'task-detail', 'get', detail('task-detail', 'task_id'), None),
+        Scenario('PUT task', 'task-detail', 'put', detail('task-detail', 'task_id'),
+                 lambda ctx, n: dict(task(ctx, n), title=f'Renamed {n}')),
+        Scenario('PATCH tasks bulk', 'task-bulk', 'patch', url('task-bulk'),
+                 lambda ctx, n: [{'id': pk, 'state': ['todo', 'done'][n % 2]} for pk in ctx['task_ids'][:50]]),
+        Scenario('GET subtasks', 'subtask-list', 'get', url('subtask-list'), None),
+        Scenario('GET subtasks of task', 'subtask-list', 'get',
+                 lambda ctx: reverse('subtask-list') + f"?task_id={ctx['task_id']}", None),
+        Scenario('POST subtasks', 'subtask-list', 'post', url('subtask-list'),
+                 lambda ctx, n: {'title': f'Bench subtask {n}', 'task_id': ctx['task_id']}),
+        Scenario('POST subtasks bulk', 'subtask-list', 'post', url('subtask-list'),
+                 lambda ctx, n: [{'title': f'Bench subtask {n}.{i}', 'task_id': ctx['task_id']} for i in range(20)]),
+        Scenario('PATCH subtasks bulk', 'subtask-list', 'patch', url('subtask-list'),
+                 lambda ctx, n: [{'id': pk, 'is_completed': bool(n % 2)} for pk in ctx['subtask_ids'][:50]]),
+        Scenario('GET subtask', 'subtask-detail', 'get', detail('subtask-detail', 'subtask_id'), None),
+        Scenario('PUT subtask', 'subtask-detail', 'put', detail('subtask-detail', 'subtask_id'),
+                 lambda ctx, n: {'title': f'Renamed subtask {n}', 'task_id': ctx['task_id'],
+                                 'is_completed': bool(n % 2)}),
+        Scenario('GET board', 'board', 'get', url('board'), None),
+        Scenario('GET board cards', 'board', 'get',
+                 url('board', fields='id,title,priority,contacts.first_name,contacts.last_name,progress'), None),
+        Scenario('GET changes', 'changes', 'get', url('changes', since=0, limit=500), None),
+        Scenario('GET cache stats', 'cache-stats', 'get', url('cache-stats'), None),
+        Scenario('POST registration', 'registration', 'post', url('registration'),
+                 lambda ctx, n: dict(user(ctx, n), repeated_password='password123')),
+        Scenario('POST guest login', 'registration', 'post', url('registration'),
+                 lambda ctx, n: {'username': 'Guest'}),
+        Scenario('POST login', 'login', 'post', url('login'),
+                 lambda ctx, n: {'email': ctx['owner_email'], 'password': 'password123'}),
+        Scenario('POST users bulk', 'user-bulk', 'post', url('user-bulk'),
+                 lambda ctx, n: [user(ctx, f'{n}-{i}') for i in range(20)]),
+    ]
+
+
+def missing_scenarios():
+    """
+    Returns the named API routes that neither have a scenario nor are skipped,
+    so new endpoints cannot silently escape the benchmark.
+    """
+    covered = {scenario.url_name for scenario in scenarios()} | set(SKIPPED)
+    return sorted(pattern.name for pattern in [*kanban_urlpatterns, *auth_urlpatterns]
+                  if pattern.name and pattern.name not in covered)
+
+
+class Command(BaseCommand):
+    """
+    Runs every kanban and auth API endpoint through the test client against
+    a seeded test database, reports p50/p95/p99 latency and query counts,
+    and compares them with a stored JSON baseline.
+
+    A scenario regresses when it runs more queries than in the baseline or
+    when its median latency grows beyond the tolerance. The response cache is disabled
+    and passwords use a fast hasher, so the numbers reflect the request path.
+    """
+    help = 'Benchmark every API endpoint and compare with a JSON baseline.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5, help='Users to seed (default: 5).')
+        parser.add_argument('--contacts', type=int, default=100, help='Contacts to seed (default: 100).')
+        parser.add_argument('--tasks', type=int, default=500, help='Tasks to seed (default: 500).')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed requests per scenario (default: 20).')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE),
+                            help='Baseline JSON file (default: benchmarks/endpoints.json).')
+        parser.add_argument('--update-baseline', action='store_true',
+                            help='Write the results to the baseline file instead of comparing.')
+        parser.add_argument('--tolerance', type=float, default=0.5,
+                            help='Allowed relative p50 growth over the baseline (default: 0.5 = +50%%).')
+        parser.add_argument('--only', help='Run only scenarios whose name contains this text.')
+
+    def handle(self, *args, **options):
+        missing = missing_scenarios()
+        if missing:
+            raise CommandError(f'Routes without a benchmark scenario: {", ".join(missing)}')
+        with test_database(), override_settings(
+                KANBAN_RESPONSE_CACHE={'BACKEND': 'local', 'MAX_ENTRIES': 0},
+                PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+            ctx = self.seed(options)
+            results = self.run(ctx, options)
+        self.print_results(results)
+
+        baseline_path = Path(options['baseline'])
+        if options['update_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(f'Baseline written to {baseline_path}')
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f'No baseline at {baseline_path}; run with --update-baseline to create one.')
+            return
+        regressions = self.compare(results, json.loads(baseline_path.read_text()), options['tolerance'])
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n  ' + '\n  '.join(regressions))
+        self.stdout.write('No regressions against the baseline.')
+
+    def seed(self, options):
+        owner = seed_board(users=options['users'], contacts=options['contacts'], tasks=options['tasks'])
+        User.objects.create_user(username='Guest', email='guest@example.com', password='password123',
+                                 first_name='Guest', last_name='User')
+        task_ids = list(Task.objects.order_by('id').values_list('id', flat=True)[:100])
+        return {
+            'owner_id': owner.pk,
+            'owner_email': owner.email,
+            'token': owner.auth_token.key,
+            'contact_ids': list(Contact.objects.filter(user=owner).order_by('id').values_list('id', flat=True)[:10]),
+            'contact_id': Contact.objects.filter(user=owner).order_by('id').values_list('id', flat=True).first(),
+            'task_ids': task_ids,
+            'task_id': task_ids[0],
+            'subtask_ids': list(Subtask.objects.order_by('id').values_list('id', flat=True)[:100]),
+            'subtask_id': Subtask.objects.order_by('id').values_list('id', flat=True).first(),
+        }
+
+    def run(self, ctx, options):
+        client = Client(HTTP_AUTHORIZATION=f"Token {ctx['token']}")
+        counter = itertools.count()
+        results = {}
+        for scenario in scenarios():
+            if options['only'] and options['only'] not in scenario.name:
+                continue
+            path = scenario.path(ctx)
+            queries = []
+
+            def call():
+                body = scenario.body(ctx, next(counter)) if scenario.body else None
+                kwargs = {'data': json.dumps(body), 'content_type': 'application/json'} if body is not None else {}
+                with CaptureQueriesContext(connection) as captured:
+                    response = getattr(client, scenario.method)(path, **kwargs)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                # Some write views report errors with HTTP 200 and `ok: false`.
+                payload = response.json() if scenario.method != 'get' else None
+                if response.status_code >= 400 or (isinstance(payload, dict) and payload.get('ok') is False):
+                    raise CommandError(f'{scenario.name}: HTTP {response.status_code} {response.content[:300]!r}')
+                queries.append(len(captured.captured_queries))
+
+            stats = measure(call, repeat=options['repeat'], warmup=2)
+            results[scenario.name] = {
+                'p50': round(stats['p50'], 3),
+                'p95': round(stats['p95'], 3),
+                'p99': round(stats['p99'], 3),
+                'queries': max(queries[2:]),
+            }
+        return results
+
+    def print_results(self, results):
+        self.stdout.write(f'{"scenario":<24}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"queries":>9}')
+        for name, result in results.items():
+            self.stdout.write(f'{name:<24}{result["p50"]:>10.2f}{result["p95"]:>10.2f}'
+                              f'{result["p99"]:>10.2f}{result["queries"]:>9}')
+
+    def compare(self, results, baseline, tolerance):
+        regressions = []
+        for name, result in results.items():
+            base = baseline.get(name)
+            if base is None:
+                continue
+            if result['queries'] > base['queries']:
+                regressions.append(f'{name}: {result["queries"]} queries (baseline {base["queries"]})')
+            # The median is compared: tail latencies of a few runs are too noisy to gate on,
+            # and differences of a couple of milliseconds are noise as well.
+            limit = max(base['p50'] * (1 + tolerance), base['p50'] + 2.0)
+            if result['p50'] > limit:
+                regressions.append(f'{name}: p50 {result["p50"]:.2f}ms (baseline {base["p50"]:.2f}ms)')
+        return regressions
@@ -0,0 +1,74 @@
+import asyncio
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from kanban_app.benchmarking import percentile
+from kanban_app.events import MemoryBroker, event_stream
+
+
+class Command(BaseCommand):
+    """
+    Opens many idle event streams on one event loop and reports what they
+    cost: memory per connection, CPU while idle and the fan-out latency of
+    an event published to all of them.
+    """
+    help = 'Benchmark the cost of idle Server-Sent Events connections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=1000,
+                            help='Number of simulated clients (default: 1000).')
+        parser.add_argument('--idle', type=float, default=5.0,
+                            help='Seconds to stay idle while measuring CPU (default: 5).')
+        parser.add_argument('--heartbeat', type=float, default=15.0,
+                            help='Heartbeat interval of the streams in seconds (default: 15).')
+        parser.add_argument('--events', type=int, default=20,
+                            help='Events published to measure fan-out latency (default: 20).')
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(**options))
+
+    async def run(self, connections, idle, heartbeat, events, **options):
+        broker = MemoryBroker()
+        received = {}
+
+        async def consume(stream):
+            async for message in stream:
+                if 'event: change' in message:
+                    seq = int(message.split('\n', 1)[0].removeprefix('id: '))
+                    received.setdefault(seq, []).append(time.perf_counter())
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        consumers = [
+            asyncio.create_task(consume(event_stream(broker, broker.subscribe(), heartbeat)))
+            for _ in range(connections)
+        ]
+        await asyncio.sleep(0.1)
+        memory = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        await asyncio.sleep(idle)
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+
+        latencies = []
+        for seq in range(events):
+            published = time.perf_counter()
+            broker.publish({'resource': 'task', 'ids': [seq], 'deleted': False, 'seq': seq})
+            while len(received.get(seq, ())) < connections:
+                await asyncio.sleep(0.001)
+            latencies.append((max(received[seq]) - published) * 1000)
+        latencies.sort()
+
+        for consumer in consumers:
+            consumer.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+
+        self.stdout.write(f'connections:             {connections}')
+        self.stdout.write(f'memory per connection:   {memory / connections / 1024:.2f} KiB')
+        self.stdout.write(f'idle CPU:                {cpu / wall * 100:.2f}% of one core over {wall:.1f}s')
+        self.stdout.write(
+            f'fan-out to all clients:  p50={percentile(latencies, 50):.2f}ms  p99={percentile(latencies, 99):.2f}ms')
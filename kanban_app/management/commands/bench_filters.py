@@ -0,0 +1,97 @@
+import datetime
+import random
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from kanban_app.api.filters import ContactSearchSerializer, SubtaskFilterSerializer, TaskFilterSerializer
+from kanban_app.benchmarking import CATEGORIES, PRIORITIES, STATES, format_stats, measure, throwaway_data
+from kanban_app.models import Contact, Subtask, Task
+
+# Contacts per seeded user; the scoped contact list must not grow with the user count.
+CONTACTS_PER_USER = 100
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the task, subtask and scoped contact list filters on a large
+    throwaway dataset and checks that the database answers them through the
+    composite indexes.
+    """
+    help = 'Benchmark the task/subtask/contact list filters and show their query plans.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000,
+                            help='Number of tasks, subtasks and contacts to seed (default: 100000).')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Timed runs per query (default: 50).')
+
+    def handle(self, *args, **options):
+        with throwaway_data():
+            self.seed(options['rows'])
+            missing = self.run_scenarios(options['repeat'])
+        if missing:
+            raise CommandError(f'Queries not using their index: {", ".join(missing)}')
+
+    def seed(self, rows):
+        self.stdout.write(f'Seeding {rows} tasks, {rows} subtasks and {rows} contacts...')
+        rng = random.Random(42)
+        start = datetime.date(2025, 1, 1)
+        Task.objects.bulk_create(
+            (Task(title=f'Task {i}', category=rng.choice(CATEGORIES), priority=rng.choice(PRIORITIES),
+                  state=rng.choice(STATES), due_date=start + datetime.timedelta(days=rng.randrange(1000)))
+             for i in range(rows)),
+            batch_size=2000,
+        )
+        task_ids = list(Task.objects.values_list('id', flat=True)[:max(1, rows // 4)])
+        Subtask.objects.bulk_create(
+            (Subtask(task_id=rng.choice(task_ids), title=f'Subtask {i}', is_completed=rng.random() < 0.5)
+             for i in range(rows)),
+            batch_size=2000,
+        )
+        User.objects.bulk_create(
+            (User(username=f'bench-filter-{i}') for i in range(max(1, rows // CONTACTS_PER_USER))),
+            batch_size=2000,
+        )
+        user_ids = list(User.objects.filter(username__startswith='bench-filter-').values_list('id', flat=True))
+        Contact.objects.bulk_create(
+            (Contact(user_id=user_ids[i % len(user_ids)], first_name=f'First{i}', last_name=f'Last{rng.randrange(rows)}')
+             for i in range(rows)),
+            batch_size=2000,
+        )
+        self.user = User.objects.get(pk=user_ids[len(user_ids) // 2])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def scenarios(self):
+        task_id = Subtask.objects.values_list('task_id', flat=True).first()
+        return [
+            ('tasks?state', Task, TaskFilterSerializer, {'state': 'todo'},
+             'task_state_due_date_idx'),
+            ('tasks?state&due_date range', Task, TaskFilterSerializer,
+             {'state': 'in-progress', 'due_date_from': '2025-03-01', 'due_date_to': '2025-03-31'},
+             'task_state_due_date_idx'),
+            ('subtasks?task_id', Subtask, SubtaskFilterSerializer, {'task_id': task_id},
+             'subtask_task_completed_idx'),
+            ('subtasks?task_id&is_completed', Subtask, SubtaskFilterSerializer,
+             {'task_id': task_id, 'is_completed': 'false'}, 'subtask_task_completed_idx'),
+            ('contacts?scope=mine', Contact, ContactSearchSerializer, {'scope': 'mine'},
+             'contact_user_name_idx'),
+        ]
+
+    def run_scenarios(self, repeat):
+        missing = []
+        for label, model, filter_class, params, index in self.scenarios():
+            filters = filter_class(data=params, context={'user': self.user})
+            filters.is_valid(raise_exception=True)
+            queryset = filters.filter_queryset(model.objects.all())
+            plan = queryset.explain()
+            stats = measure(lambda: list(queryset.all()), repeat=repeat)
+            uses_index = index in plan
+            if not uses_index:
+                missing.append(label)
+            self.stdout.write(f'\n{label}  rows={queryset.count()}  index={"yes" if uses_index else "NO"}')
+            self.stdout.write(f'  plan: {plan}')
+            self.stdout.write(f'  {format_stats(stats)}')
+        return missing
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from kanban_app.benchmarking import format_stats, measure, seed_board, test_database
+from kanban_app.search import CONTACT_INDEX, TASK_INDEX, search_contacts, search_tables, search_tasks
+
+CONTACT_QUERIES = ['first4242', 'last99', 'contact123@', 'example.com', '+49 12', 'fi la']
+TASK_QUERIES = ['task 99999', 'task', 'of ta', 'descr']
+
+
+class Command(BaseCommand):
+    """
+    Seeds a test database with many contacts and tasks and times the contact
+    and task search through the full-text indexes and through the LIKE
+    fallback, checking that both find as many results.
+    """
+    help = 'Benchmark the indexed contact and task search against the LIKE fallback.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contacts', type=int, default=100000, help='Contacts to seed (default: 100000).')
+        parser.add_argument('--tasks', type=int, default=100000, help='Tasks to seed (default: 100000).')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query (default: 20).')
+        parser.add_argument('--limit', type=int, default=20, help='Results per search (default: 20).')
+
+    def handle(self, *args, **options):
+        with test_database():
+            for index in (CONTACT_INDEX, TASK_INDEX):
+                if index not in search_tables():
+                    raise CommandError(f'{connection.vendor} has no {index} table; only the fallback is available.')
+            seed_board(tasks=options['tasks'], contacts=options['contacts'], contacts_per_task=0,
+                       subtasks_per_task=0, batch_size=5000)
+            limit = options['limit']
+            self.stdout.write('Contacts')
+            for query in CONTACT_QUERIES:
+                self.compare(query, lambda indexed: search_contacts(query, limit, indexed=indexed), options)
+            self.stdout.write('\nTasks')
+            for query in TASK_QUERIES:
+                self.compare(query, lambda indexed: search_tasks(query, limit=limit, indexed=indexed), options)
+
+    def compare(self, query, search, options):
+        indexed = search(True)
+        fallback = search(False)
+        if len(indexed) != len(fallback):
+            raise CommandError(f'{query!r}: {len(indexed)} indexed results, {len(fallback)} with the fallback')
+        index_stats = measure(lambda: search(True), repeat=options['repeat'])
+        fallback_stats = measure(lambda: search(False), repeat=options['repeat'])
+        self.stdout.write(f'\n{query!r}  results={len(indexed)}  '
+                          f'speedup={fallback_stats["p50"] / index_stats["p50"]:.1f}x')
+        self.stdout.write(f'  index:     {format_stats(index_stats)}')
+        self.stdout.write(f'  fallback:  {format_stats(fallback_stats)}')
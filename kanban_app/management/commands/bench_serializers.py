@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kanban_app.api.projections import board_task_projection, contact_projection, subtask_projection, task_projection
+from kanban_app.api.serializers import BoardTaskSerializer, ContactSerializer, SubtaskSerializer, TaskSerializer
+from kanban_app.benchmarking import format_stats, measure, seed_board, throwaway_data
+from kanban_app.models import Contact, Subtask, Task
+
+
+class Command(BaseCommand):
+    """
+    Compares the serializer and the values()-based projection of every list
+    response on a large throwaway dataset, checking that both render the
+    same data before timing them.
+    """
+    help = 'Benchmark ModelSerializer list output against the values() projections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=5000, help='Tasks to seed (default: 5000).')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per variant (default: 10).')
+
+    def handle(self, *args, **options):
+        with throwaway_data():
+            seed_board(tasks=options['tasks'], contacts=max(10, options['tasks'] // 10))
+            for label, serialize, project in self.scenarios():
+                expected, actual = serialize(), project()
+                if list(map(dict, expected)) != actual:
+                    raise CommandError(f'{label}: projection output differs from the serializer')
+                serializer_stats = measure(serialize, repeat=options['repeat'], warmup=1)
+                projection_stats = measure(project, repeat=options['repeat'], warmup=1)
+                self.stdout.write(f'\n{label}  rows={len(actual)}  '
+                                  f'speedup={serializer_stats["p50"] / projection_stats["p50"]:.1f}x')
+                self.stdout.write(f'  serializer:  {format_stats(serializer_stats)}')
+                self.stdout.write(f'  projection:  {format_stats(projection_stats)}')
+
+    def scenarios(self):
+        tasks = Task.objects.order_by('id')
+        return [
+            ('contacts', lambda: ContactSerializer(Contact.objects.all(), many=True).data,
+             lambda: contact_projection(Contact.objects.all())),
+            ('tasks', lambda: TaskSerializer(tasks.with_contacts(), many=True).data,
+             lambda: task_projection(tasks)),
+            ('subtasks', lambda: SubtaskSerializer(Subtask.objects.all(), many=True).data,
+             lambda: subtask_projection(Subtask.objects.all())),
+            ('board', lambda: BoardTaskSerializer(tasks.for_board(), many=True).data,
+             lambda: board_task_projection(tasks)),
+        ]
@@ -0,0 +1,69 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from kanban_app.api.streaming import get_chunk_size
+from kanban_app.benchmarking import seed_board, test_database
+from kanban_app.models import Task
+
+
+class Command(BaseCommand):
+    """
+    Requests the task list buffered and with `?stream=true` at growing
+    sizes of a seeded test database and reports time to first byte, total
+    time and the peak Python memory of each request. The streamed peak
+    should stay flat while the buffered one grows with the number of rows.
+    """
+    help = 'Benchmark buffered against streamed list responses.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000],
+                            help='Task counts to measure, in increasing order (default: 1000 5000 20000).')
+        parser.add_argument('--url-name', default='task-list', help='List route to request (default: task-list).')
+        parser.add_argument('--chunk-size', type=int, help='Override KANBAN_STREAM_CHUNK_SIZE.')
+
+    def handle(self, *args, **options):
+        client = Client()
+        url = reverse(options['url_name'])
+        chunk_size = options['chunk_size'] or get_chunk_size()
+        with test_database(), override_settings(KANBAN_RESPONSE_CACHE={'BACKEND': 'local', 'MAX_ENTRIES': 0},
+                                                KANBAN_STREAM_CHUNK_SIZE=chunk_size):
+            self.stdout.write(f'Chunk size: {chunk_size}')
+            self.stdout.write(f'{"rows":>7}  {"mode":<9}{"ttfb ms":>10}{"total ms":>10}{"peak MiB":>10}{"bytes":>12}')
+            for size in sorted(options['sizes']):
+                missing = size - Task.objects.count()
+                if missing > 0:
+                    seed_board(tasks=missing, contacts=200)
+                buffered = self.request(client, url)
+                streamed = self.request(client, url + '?stream=true')
+                if buffered['body'] != streamed['body']:
+                    raise CommandError(f'{size} rows: streamed body differs from the buffered one')
+                for mode, result in (('buffered', buffered), ('streamed', streamed)):
+                    self.stdout.write(f'{size:>7}  {mode:<9}{result["ttfb"]:>10.1f}{result["total"]:>10.1f}'
+                                      f'{result["peak"] / 2**20:>10.1f}{len(result["body"]):>12}')
+
+    def request(self, client, url):
+        """
+        Times one request (the body is consumed chunk by chunk, like a socket
+        would), then repeats it under tracemalloc for the memory peak.
+        """
+        start = time.perf_counter()
+        response = client.get(url, HTTP_ACCEPT='application/json')
+        chunks = iter(response.streaming_content) if response.streaming else iter([response.content])
+        body = [next(chunks)]
+        ttfb = time.perf_counter() - start
+        body.extend(chunks)
+        total = time.perf_counter() - start
+
+        tracemalloc.start()
+        try:
+            response = client.get(url, HTTP_ACCEPT='application/json')
+            for _ in (response.streaming_content if response.streaming else [response.content]):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {'ttfb': ttfb * 1000, 'total': total * 1000, 'peak': peak, 'body': b''.join(body)}
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kanban_app.counters import counter_mismatches
+from kanban_app.models import Task
+
+
+class Command(BaseCommand):
+    """
+    Compares the stored task counters with the real subtask and contact
+    counts and lists the tasks that drifted, e.g. after raw SQL or
+    `QuerySet.update()` calls that bypass the signals.
+    """
+    help = 'Check the denormalized task counters against the real counts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Mismatching tasks to list (default: 20).')
+
+    def handle(self, *args, **options):
+        mismatches = counter_mismatches()
+        for row in mismatches[:options['limit']]:
+            changes = ', '.join(f'{name} {row[name]} != {row[f"actual_{name}"]}'
+                                for name in Task.COUNTERS if row[name] != row[f'actual_{name}'])
+            self.stdout.write(f'Task {row["pk"]}: {changes}')
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} tasks have wrong counters; run rebuild_task_counters.')
+        self.stdout.write('All task counters match.')
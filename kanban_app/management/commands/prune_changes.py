@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from kanban_app.api.sync import prune_changes
+
+
+class Command(BaseCommand):
+    """
+    Deletes the delta sync log entries older than the retention window, so
+    the log and the `?since=` scans stay bounded. Meant to run periodically
+    (e.g. daily from cron). Clients whose `since` predates the kept entries
+    get 410 Gone from /kanban/changes/ and reload.
+    """
+    help = 'Delete change log entries older than KANBAN_CHANGES_RETENTION_DAYS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            help='Keep this many days instead of KANBAN_CHANGES_RETENTION_DAYS.')
+
+    def handle(self, *args, **options):
+        deleted = prune_changes(options['days'])
+        self.stdout.write(f'Deleted {deleted} change log entries.')
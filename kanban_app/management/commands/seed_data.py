@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from kanban_app.benchmarking import seed_board
+
+
+class Command(BaseCommand):
+    """
+    Seeds a synthetic dataset for local load testing: staff users with API
+    tokens, their contacts, tasks with assigned contacts and subtasks.
+    Everything is inserted with `bulk_create` and announced as changes (delta
+    sync, live events, ETags); re-running appends more data.
+    """
+    help = 'Seed a realistic synthetic dataset with bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Users to create (default: 10).')
+        parser.add_argument('--contacts', type=int, default=500, help='Contacts to create (default: 500).')
+        parser.add_argument('--tasks', type=int, default=5000, help='Tasks to create (default: 5000).')
+        parser.add_argument('--contacts-per-task', type=int, default=2,
+                            help='Contacts assigned to each task (default: 2).')
+        parser.add_argument('--subtasks-per-task', type=int, default=3,
+                            help='Subtasks per task (default: 3).')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42).')
+        parser.add_argument('--password', default='password123',
+                            help='Password of the seeded users (default: password123).')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        with transaction.atomic():
+            owner = seed_board(
+                users=options['users'], contacts=options['contacts'], tasks=options['tasks'],
+                contacts_per_task=options['contacts_per_task'], subtasks_per_task=options['subtasks_per_task'],
+                seed=options['seed'], password=options['password'],
+            )
+        self.stdout.write(
+            f"Seeded {options['users']} users, {options['contacts']} contacts, {options['tasks']} tasks "
+            f"and {options['tasks'] * options['subtasks_per_task']} subtasks in {time.perf_counter() - start:.1f}s. "
+            f"Log in as {owner.email} / {options['password']}.")
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0007_alter_contact_user'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='subtask',
+            name='task',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to='kanban_app.task'),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['task', 'is_completed'], name='subtask_task_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['state', 'due_date'], name='task_state_due_date_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:27
+
+from django.db import migrations, models
+
+
+def log_existing_rows(apps, schema_editor):
+    """
+    Records every existing row so that a sync from `since=0` returns the full board.
+    """
+    Change = apps.get_model('kanban_app', 'Change')
+    for resource in ('contact', 'task', 'subtask'):
+        model = apps.get_model('kanban_app', resource)
+        Change.objects.bulk_create(
+            (Change(resource=resource, object_id=pk) for pk in model.objects.values_list('pk', flat=True).iterator()),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0009_resourceversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('resource', models.CharField(max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='subtask',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(log_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Trigram full-text index over the searchable contact columns (kanban_app.search).
+# It is an FTS5 external-content table: the text stays in kanban_app_contact and
+# the triggers keep the index in step with every insert, update and delete,
+# including bulk writes that bypass model signals. Only SQLite builds with FTS5
+# and the trigram tokenizer (3.34+) get it; elsewhere search falls back to LIKE.
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE kanban_app_contact_fts USING fts5(
+        first_name, last_name, email, phone,
+        content='kanban_app_contact', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER kanban_app_contact_fts_insert AFTER INSERT ON kanban_app_contact BEGIN
+        INSERT INTO kanban_app_contact_fts (rowid, first_name, last_name, email, phone)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.phone);
+    END
+    """,
+    """
+    CREATE TRIGGER kanban_app_contact_fts_delete AFTER DELETE ON kanban_app_contact BEGIN
+        INSERT INTO kanban_app_contact_fts (kanban_app_contact_fts, rowid, first_name, last_name, email, phone)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone);
+    END
+    """,
+    """
+    CREATE TRIGGER kanban_app_contact_fts_update
+    AFTER UPDATE OF first_name, last_name, email, phone ON kanban_app_contact BEGIN
+        INSERT INTO kanban_app_contact_fts (kanban_app_contact_fts, rowid, first_name, last_name, email, phone)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone);
+        INSERT INTO kanban_app_contact_fts (rowid, first_name, last_name, email, phone)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.phone);
+    END
+    """,
+    "INSERT INTO kanban_app_contact_fts (kanban_app_contact_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS kanban_app_contact_fts_insert',
+    'DROP TRIGGER IF EXISTS kanban_app_contact_fts_delete',
+    'DROP TRIGGER IF EXISTS kanban_app_contact_fts_update',
+    'DROP TABLE IF EXISTS kanban_app_contact_fts',
+]
+
+
+def create_contact_search(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(text, tokenize='trigram')")
+            cursor.execute('DROP TABLE temp.trigram_probe')
+    except OperationalError:
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_contact_search(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0010_change_log_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_contact_search, drop_contact_search),
+    ]
@@ -0,0 +1,74 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Full-text index over task titles and descriptions (kanban_app.search).
+# Like the contact index it is an FTS5 external-content table maintained by
+# triggers, so every save, delete and bulk write updates it incrementally.
+# Words are folded to lower case without diacritics; prefix indexes of two
+# and three characters serve the search-as-you-type prefix of the last word.
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE kanban_app_task_fts USING fts5(
+        title, description,
+        content='kanban_app_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER kanban_app_task_fts_insert AFTER INSERT ON kanban_app_task BEGIN
+        INSERT INTO kanban_app_task_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER kanban_app_task_fts_delete AFTER DELETE ON kanban_app_task BEGIN
+        INSERT INTO kanban_app_task_fts (kanban_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER kanban_app_task_fts_update AFTER UPDATE OF title, description ON kanban_app_task BEGIN
+        INSERT INTO kanban_app_task_fts (kanban_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO kanban_app_task_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO kanban_app_task_fts (kanban_app_task_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS kanban_app_task_fts_insert',
+    'DROP TRIGGER IF EXISTS kanban_app_task_fts_delete',
+    'DROP TRIGGER IF EXISTS kanban_app_task_fts_update',
+    'DROP TABLE IF EXISTS kanban_app_task_fts',
+]
+
+
+def create_task_search(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(text)')
+            cursor.execute('DROP TABLE temp.fts5_probe')
+    except OperationalError:
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_task_search(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0011_contact_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_task_search, drop_task_search),
+    ]
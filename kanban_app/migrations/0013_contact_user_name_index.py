@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0012_task_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['user', 'last_name', 'first_name'], name='contact_user_name_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:45
+
+import importlib
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# On SQLite, adding the counter columns (and, depending on the version,
+# removing them) rebuilds kanban_app_task, which drops the triggers that
+# maintain the task search index (0012). The index itself keeps the same
+# rowids and text, so re-creating the triggers suffices.
+task_search = importlib.import_module('kanban_app.migrations.0012_task_search')
+TRIGGER_SQL = (
+    [sql for sql in task_search.DROP_SQL if 'DROP TRIGGER' in sql]
+    + [sql for sql in task_search.CREATE_SQL if 'CREATE TRIGGER' in sql]
+)
+
+
+def restore_task_search_triggers(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite' and 'kanban_app_task_fts' in connection.introspection.table_names():
+        for sql in TRIGGER_SQL:
+            schema_editor.execute(sql)
+
+
+def count_existing_rows(apps, schema_editor):
+    """
+    Initializes the counters of the existing tasks.
+    """
+    Task = apps.get_model('kanban_app', 'Task')
+    Subtask = apps.get_model('kanban_app', 'Subtask')
+
+    def count(queryset):
+        rows = queryset.filter(task=OuterRef('pk')).order_by().values('task').annotate(n=Count('pk')).values('n')
+        return Coalesce(Subquery(rows), Value(0))
+
+    Task.objects.update(
+        subtasks_total=count(Subtask.objects.all()),
+        subtasks_done=count(Subtask.objects.filter(is_completed=True)),
+        contacts_count=count(Task.contacts.through.objects.all()),
+    )
+    restore_task_search_triggers(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0013_contact_user_name_index'),
+    ]
+
+    operations = [
+        # Runs last when migrating backwards, after the columns are removed.
+        migrations.RunPython(migrations.RunPython.noop, restore_task_search_triggers),
+        migrations.AddField(
+            model_name='task',
+            name='contacts_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='subtasks_done',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='subtasks_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_rows, migrations.RunPython.noop),
+    ]
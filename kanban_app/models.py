@@ -1,9 +1,33 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
 from user_auth_app.models import UserProfile
 from django.contrib.auth.models import User
 
 # Create your models here.
 
+
+class TaskQuerySet(models.QuerySet):
+    """
+    Custom queryset for tasks.
+    Bundles the related data the task serializers need so that listing
+    tasks runs a fixed number of queries regardless of the row count.
+    """
+
+    def with_contacts(self):
+        """
+        Prefetch the assigned contacts, ordered by id, in a single extra query.
+        """
+        return self.prefetch_related(models.Prefetch('contacts', queryset=Contact.objects.order_by('id')))
+
+    def for_board(self):
+        """
+        Prefetch contacts and subtasks, one extra query each, for the board snapshot.
+        """
+        return self.with_contacts().prefetch_related(
+            models.Prefetch('subtasks', queryset=Subtask.objects.order_by('id')))
+
+
 class Contact(models.Model):
     """
     Represents a contact person linked to a user account.
@@ -15,6 +39,16 @@ class Contact(models.Model):
     email = models.TextField(max_length=100, blank=True)
     phone = models.CharField(max_length=200, blank=True)
     badge_color = models.CharField(max_length=100, default='red')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Serves `?scope=mine` on the contact list: one user's contacts, sorted by name.
+            models.Index(fields=['user', 'last_name', 'first_name'], name='contact_user_name_idx'),
+            # Serve the name prefix matches ranked first by contact search (kanban_app/search.py).
+            models.Index(Lower('last_name'), Lower('first_name'), name='contact_lower_name_idx'),
+            models.Index(Lower('first_name'), name='contact_lower_first_name_idx'),
+        ]
 
     def __str__(self):
         """
@@ -35,6 +69,21 @@ class Task(models.Model):
     priority = models.CharField(max_length=100)
     contacts = models.ManyToManyField(Contact, related_name='tasks')  # Assigned contacts
     state = models.CharField(max_length=255, default='todo')  # e.g., todo, in-progress, done
+    updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized counters kept up to date by kanban_app.counters.
+    subtasks_total = models.IntegerField(default=0, editable=False)
+    subtasks_done = models.IntegerField(default=0, editable=False)
+    contacts_count = models.IntegerField(default=0, editable=False)
+
+    COUNTERS = ('subtasks_total', 'subtasks_done', 'contacts_count')
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serves the state and due date filters of the task list.
+            models.Index(fields=['state', 'due_date'], name='task_state_due_date_idx'),
+        ]
 
     def __str__(self):
         """
@@ -42,21 +91,135 @@ class Task(models.Model):
         """
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Saves the task without its counters when it already exists: they are
+        changed in the database with F() expressions, so the values loaded
+        with this instance may be stale.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTERS
+            ]
+        super().save(*args, **kwargs)
+
 
 class Subtask(models.Model):
     """
     Represents a smaller task that is part of a main task.
     Used to break down work into manageable pieces.
     """
-    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='subtasks')
+    # Indexed through subtask_task_completed_idx, whose leading column is task.
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='subtasks', db_index=False)
     title = models.CharField(max_length=200)
     is_completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Serves the task_id / is_completed filters of the subtask list.
+            models.Index(fields=['task', 'is_completed'], name='subtask_task_completed_idx'),
+        ]
 
     def __str__(self):
         """
         Return the title of the subtask as the string representation.
         """
         return self.title
-    
-    
-    
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the subtask. An existing row is first locked and its stored
+        (task, is_completed) state read, from which the task counters are
+        moved: a concurrent write may have changed it since this instance
+        was loaded.
+        """
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            self._counted = self.locked_state()
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """
+        Deletes the subtask, uncounting its stored state (see `save()`).
+        """
+        with transaction.atomic():
+            self._counted = self.locked_state()
+            return super().delete(*args, **kwargs)
+
+    def locked_state(self):
+        """
+        Returns the stored (task_id, is_completed) of this subtask, locked
+        until the end of the transaction, or None if the row is gone.
+        """
+        return Subtask.objects.select_for_update().filter(pk=self.pk).values_list('task_id', 'is_completed').first()
+
+
+class ResourceVersionManager(models.Manager):
+    """
+    Reads and bumps the per-resource version counters.
+    """
+
+    def bump(self, name):
+        """
+        Atomically increments the version of `name`, creating the counter if needed.
+        """
+        if not self.filter(name=name).update(version=F('version') + 1):
+            _, created = self.get_or_create(name=name, defaults={'version': 1})
+            if not created:
+                self.filter(name=name).update(version=F('version') + 1)
+
+    def current(self, names):
+        """
+        Returns a {name: version} dict; unknown resources are at version 0.
+        """
+        versions = dict(self.filter(name__in=names).values_list('name', 'version'))
+        return {name: versions.get(name, 0) for name in names}
+
+    async def acurrent(self, names):
+        """
+        Async version of `current`.
+        """
+        versions = {name: version async for name, version in self.filter(name__in=names).values_list('name', 'version')}
+        return {name: versions.get(name, 0) for name in names}
+
+
+class ResourceVersion(models.Model):
+    """
+    A counter bumped on every write to a kanban resource (task, subtask, contact).
+    Used as a cheap validator for conditional GETs and cache keys.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    objects = ResourceVersionManager()
+
+    def __str__(self):
+        """
+        Return the resource name and its version as the string representation.
+        """
+        return f"{self.name} v{self.version}"
+
+
+class Change(models.Model):
+    """
+    An entry of the change log used by delta sync.
+
+    Every create, update or delete of a contact, task or subtask appends a
+    row; `seq` is the monotonic sequence clients pass back as `?since=`.
+    Rows with `deleted=True` are the tombstones of removed objects.
+    """
+    seq = models.BigAutoField(primary_key=True)
+    resource = models.CharField(max_length=50)  # contact, task or subtask
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """
+        Return the sequence number and the changed object as the string representation.
+        """
+        action = 'deleted' if self.deleted else 'changed'
+        return f"#{self.seq} {self.resource} {self.object_id} {action}"
@@ -0,0 +1,264 @@
+import html
+import re
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from kanban_app.models import Contact, Task
+
+# Indexed search.
+#
+# On SQLite with FTS5 the contact columns are indexed by a trigram side table
+# kept in sync by triggers (migration 0011), so any substring of three or more
+# characters is found without scanning `kanban_app_contact`. Task titles and
+# descriptions have a word index (migration 0012) ranked with bm25. Shorter
+# terms and other databases fall back to LIKE filters.
+
+CONTACT_INDEX = 'kanban_app_contact_fts'
+CONTACT_COLUMNS = ('first_name', 'last_name', 'email', 'phone')
+TASK_INDEX = 'kanban_app_task_fts'
+
+# Highlight markers: control characters survive HTML escaping and are then replaced by tags.
+MARK_START, MARK_END = '\x02', '\x03'
+
+# The trigram index can only match terms of at least three characters.
+MIN_INDEXED_TERM = 3
+MAX_TERMS = 8
+
+# Matches ranked per search besides the name prefix matches. Broad terms (e.g.
+# a shared email domain) match most rows; ranking only the first matches by id
+# keeps their cost bounded.
+CANDIDATES = 500
+
+# Sorts after any character: `name < term + MAX_CHAR` bounds a prefix range.
+MAX_CHAR = chr(0x10FFFF)
+
+# Task matches ranked per search: the newest ones, as bm25 costs about as much
+# per match as reading the row. Also the last result reachable by paging.
+TASK_CANDIDATES = 1000
+
+_search_tables = {}
+
+
+def search_tables():
+    """
+    Returns the full-text index tables present in the current database,
+    looked up once per database.
+    """
+    key = (connection.alias, connection.settings_dict['NAME'])
+    if key not in _search_tables:
+        if connection.vendor == 'sqlite':
+            _search_tables[key] = {name for name in connection.introspection.table_names() if name.endswith('_fts')}
+        else:
+            _search_tables[key] = set()
+    return _search_tables[key]
+
+
+def search_terms(query):
+    return query.split()[:MAX_TERMS]
+
+
+def fts_phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return '%' + escaped + '%'
+
+
+def search_contacts(query, limit=20, indexed=None, user=None):
+    """
+    Returns the ids of up to `limit` contacts matching every term of `query`
+    in their name, email or phone, only among the contacts of `user` (a
+    user id) when given. Contacts whose first or last name starts with the
+    first term come first, sorted by name. The remaining places go to the
+    first `CANDIDATES` other matches by id: those whose name contains the
+    term, then the rest, each group sorted by name.
+
+    `indexed=False` skips the trigram index, which is otherwise used when it
+    exists and at least one term is long enough.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    long_terms = [term for term in terms if len(term) >= MIN_INDEXED_TERM]
+    if indexed is None:
+        indexed = CONTACT_INDEX in search_tables()
+    contacts = matching_contacts(terms, user)
+    if indexed and long_terms:
+        candidates, candidate_params = _indexed_candidates(terms, long_terms, user)
+    else:
+        candidates, candidate_params = contacts.order_by('id').values('id')[:CANDIDATES].query.sql_with_params()
+    matches, match_params = where_sql(contacts)
+    prefix, prefix_params = name_prefix_matches(matches, match_params, terms[0], limit)
+    name_match, name_params = where_sql(
+        Contact.objects.filter(Q(first_name__icontains=terms[0]) | Q(last_name__icontains=terms[0])))
+    # One query: both sets are bounded subqueries, ranked together. Written
+    # as SQL, as compiling the nested querysets costs more than running them.
+    table = connection.ops.quote_name(Contact._meta.db_table)
+    sql = f"""
+        WITH prefix AS ({prefix}), candidates AS ({candidates})
+        SELECT id FROM {table}
+        WHERE id IN (SELECT id FROM prefix) OR id IN (SELECT id FROM candidates)
+        ORDER BY CASE WHEN id IN (SELECT id FROM prefix) THEN 0 ELSE 1 END,
+                 CASE WHEN {name_match} THEN 0 ELSE 1 END,
+                 lower(last_name), lower(first_name), id
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*prefix_params, *candidate_params, *name_params, limit])
+        return [pk for pk, in cursor.fetchall()]
+
+
+def matching_contacts(terms, user=None):
+    """
+    Returns the contacts (of `user`, if given) containing every term in their name, email or phone.
+    """
+    contacts = Contact.objects.all() if user is None else Contact.objects.filter(user_id=user)
+    for term in terms:
+        contacts = contacts.filter(
+            Q(first_name__icontains=term) | Q(last_name__icontains=term)
+            | Q(email__icontains=term) | Q(phone__icontains=term))
+    return contacts
+
+
+def where_sql(queryset):
+    """
+    Returns the WHERE condition of `queryset` and its params.
+    """
+    query = queryset.query
+    return query.where.as_sql(query.get_compiler(connection=connection), connection)
+
+
+def name_prefix_matches(matches, params, term, limit):
+    """
+    Returns the SQL and params selecting the ids of the contacts satisfying
+    the `matches` condition whose first or last name starts with `term`,
+    enough to rank the first `limit` by name. Compares lower() ranges, which
+    the lower-cased name indexes serve, rather than LIKE, which cannot use them.
+
+    Last name matches are read in name order, so only the first `limit` are
+    needed. First name matches are read in first name order; when more than
+    `CANDIDATES` first names start with `term`, only the first of them
+    alphabetically are ranked.
+    """
+    # SQLite's lower() and LIKE only fold ASCII letters.
+    low = ''.join(char.lower() if char.isascii() else char for char in term)
+    high = low + MAX_CHAR
+    table = connection.ops.quote_name(Contact._meta.db_table)
+    sql = f"""
+        SELECT id FROM (
+            SELECT id FROM {table}
+            WHERE lower(last_name) >= %s AND lower(last_name) < %s AND {matches}
+            ORDER BY lower(last_name), lower(first_name), id LIMIT %s
+        ) AS by_last
+        UNION
+        SELECT id FROM (
+            SELECT id FROM {table}
+            WHERE lower(first_name) >= %s AND lower(first_name) < %s AND {matches}
+            ORDER BY lower(first_name), id LIMIT %s
+        ) AS by_first
+    """
+    return sql, [low, high, *params, limit, low, high, *params, CANDIDATES]
+
+
+def _indexed_candidates(terms, long_terms, user):
+    """
+    Returns the SQL and params selecting the ids of the first `CANDIDATES`
+    contacts matching `terms`, looked up in the trigram index.
+    """
+    where = [f'{CONTACT_INDEX} MATCH %s']
+    params = [' '.join(fts_phrase(term) for term in long_terms)]
+    if user is not None:
+        where.append('c.user_id = %s')
+        params.append(user)
+    for term in terms:
+        if len(term) < MIN_INDEXED_TERM:
+            where.append('(' + ' OR '.join(f"c.{column} LIKE %s ESCAPE '\\'" for column in CONTACT_COLUMNS) + ')')
+            params += [like_pattern(term)] * len(CONTACT_COLUMNS)
+    # bm25() would count the matches of every term over the whole index, which
+    # costs as much as a table scan for common terms; rank on the candidates instead.
+    sql = f"""
+        SELECT c.id FROM {CONTACT_INDEX} JOIN kanban_app_contact c ON c.id = {CONTACT_INDEX}.rowid
+        WHERE {' AND '.join(where)}
+        ORDER BY {CONTACT_INDEX}.rowid
+        LIMIT %s
+    """
+    return sql, params + [CANDIDATES]
+
+
+def mark(text):
+    """
+    HTML-escapes `text` and turns the highlight markers into <mark> tags.
+    """
+    return html.escape(text or '').replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def task_search_terms(query):
+    # Terms without a letter or digit produce no token and would be an invalid FTS5 phrase.
+    return [term for term in search_terms(query) if any(char.isalnum() for char in term)]
+
+
+def search_tasks(query, offset=0, limit=20, indexed=None):
+    """
+    Returns up to `limit` tasks matching every word of `query` in their title
+    or description, best match first, starting at `offset`. The last word
+    also matches as a prefix, for search as you type. When more than
+    `TASK_CANDIDATES` tasks match, only the newest of them are ranked.
+
+    Each hit is {id, title, description}, with the matched words wrapped in
+    <mark> tags in HTML-escaped text; the description is shortened to a snippet.
+    `indexed=False` skips the full-text index; the LIKE fallback matches
+    substrings rather than words and ranks title matches first.
+    """
+    terms = task_search_terms(query)
+    if not terms:
+        return []
+    if indexed is None:
+        indexed = TASK_INDEX in search_tables()
+    if indexed:
+        return _indexed_task_search(terms, offset, limit)
+    return _task_search_fallback(terms, offset, limit)
+
+
+def _indexed_task_search(terms, offset, limit):
+    match = ' '.join(fts_phrase(term) for term in terms) + '*'
+    # The rowid range is served by the index itself, so only the candidates
+    # get a bm25 score (title matches weigh ten times more) and highlights.
+    sql = f"""
+        SELECT rowid,
+               highlight({TASK_INDEX}, 0, char(2), char(3)),
+               snippet({TASK_INDEX}, 1, char(2), char(3), '…', 24)
+        FROM {TASK_INDEX}
+        WHERE {TASK_INDEX} MATCH %s AND rowid >= coalesce((
+            SELECT rowid FROM {TASK_INDEX} WHERE {TASK_INDEX} MATCH %s
+            ORDER BY rowid DESC LIMIT 1 OFFSET %s
+        ), 0)
+        ORDER BY bm25({TASK_INDEX}, 10.0, 1.0), rowid
+        LIMIT %s OFFSET %s
+    """
+    limit = max(0, min(limit, TASK_CANDIDATES - offset))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, match, TASK_CANDIDATES - 1, limit, offset])
+        return [{'id': pk, 'title': mark(title), 'description': mark(description)}
+                for pk, title, description in cursor.fetchall()]
+
+
+def _task_search_fallback(terms, offset, limit):
+    tasks = Task.objects.all()
+    for term in terms:
+        tasks = tasks.filter(Q(title__icontains=term) | Q(description__icontains=term))
+    tasks = tasks.annotate(title_match=Case(
+        When(title__icontains=terms[0], then=Value(0)), default=Value(1), output_field=IntegerField()))
+    words = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+
+    def highlight(text):
+        return mark(words.sub(lambda match: MARK_START + match.group(0) + MARK_END, text or ''))
+
+    candidates = tasks.order_by('-id').values_list('id', flat=True)[TASK_CANDIDATES - 1:TASK_CANDIDATES]
+    tasks = tasks.filter(id__gte=candidates[0]) if candidates else tasks
+    limit = max(0, min(limit, TASK_CANDIDATES - offset))
+    rows = tasks.order_by('title_match', 'id').values_list('id', 'title', 'description')[offset:offset + limit]
+    return [{'id': pk, 'title': highlight(title), 'description': highlight(description)}
+            for pk, title, description in rows]
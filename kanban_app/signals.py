@@ -0,0 +1,135 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from kanban_app.counters import adjust_counters, contact_deltas, rebuild_counters, subtask_deltas
+from kanban_app.models import Change, Contact, ResourceVersion, Subtask, Task
+
+# Resource names shared by the version counters, ETags and caches.
+CONTACT = 'contact'
+TASK = 'task'
+SUBTASK = 'subtask'
+
+RESOURCE_NAMES = {Contact: CONTACT, Task: TASK, Subtask: SUBTASK}
+
+# Sent whenever rows of a kanban resource are written.
+# Arguments: resource (str), pks (list of primary keys), deleted (bool).
+# Bulk code paths that bypass the model signals must send it themselves
+# through `notify_changed`.
+resources_changed = Signal()
+
+
+def notify_changed(resource, pks=(), deleted=False):
+    """
+    Announces that `pks` of `resource` were created, updated or deleted.
+    """
+    resources_changed.send(sender=resource, resource=resource, pks=list(pks), deleted=deleted)
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Subtask)
+def on_saved(sender, instance, **kwargs):
+    notify_changed(RESOURCE_NAMES[sender], [instance.pk])
+
+
+@receiver(pre_delete, sender=Contact)
+def remember_contact_tasks(sender, instance, **kwargs):
+    """
+    Deleting a contact silently removes it from its tasks; remember them.
+    """
+    instance._task_ids = list(instance.tasks.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Contact)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Subtask)
+def on_deleted(sender, instance, **kwargs):
+    notify_changed(RESOURCE_NAMES[sender], [instance.pk], deleted=True)
+    if getattr(instance, '_task_ids', None):
+        notify_changed(TASK, instance._task_ids)
+
+
+@receiver(m2m_changed, sender=Task.contacts.through)
+def on_task_contacts_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Adding or removing assigned contacts changes the tasks involved and their `contacts_count`.
+    """
+    if action == 'pre_clear' and reverse:
+        # After the clear the contact no longer exposes its former tasks.
+        instance._task_ids = list(instance.tasks.values_list('pk', flat=True))
+        return
+    if action == 'pre_remove':
+        # `remove()` accepts objects that are not assigned; only count the assigned ones.
+        column, other = ('contact_id', 'task_id') if reverse else ('task_id', 'contact_id')
+        instance._removed_ids = set(sender.objects.filter(**{column: instance.pk, f'{other}__in': pk_set})
+                                    .values_list(other, flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if action == 'post_remove':
+        pk_set = instance.__dict__.pop('_removed_ids', pk_set)
+    if not reverse:
+        task_ids = [instance.pk]
+        if action == 'post_clear':
+            Task.objects.filter(pk=instance.pk).update(contacts_count=0)
+            instance.contacts_count = 0
+        else:
+            delta = len(pk_set) if action == 'post_add' else -len(pk_set)
+            adjust_counters(contact_deltas(task_ids, delta))
+            instance.contacts_count += delta
+    elif action == 'post_clear':
+        task_ids = instance.__dict__.pop('_task_ids', [])
+        adjust_counters(contact_deltas(task_ids, -1))
+    else:
+        task_ids = list(pk_set)
+        adjust_counters(contact_deltas(task_ids, 1 if action == 'post_add' else -1))
+    notify_changed(TASK, task_ids)
+
+
+@receiver(post_save, sender=Subtask)
+def count_saved_subtask(sender, instance, created, **kwargs):
+    """
+    Counts a new subtask, or moves its counts when its task or state changed.
+    """
+    counted = instance.__dict__.pop('_counted', None)
+    current = (instance.task_id, instance.is_completed)
+    if created:
+        adjust_counters(subtask_deltas([], [current]))
+    elif counted is None:
+        # The row was not found before the save: the previous state is unknown.
+        rebuild_counters(Task.objects.filter(pk=instance.task_id))
+    elif counted != current:
+        adjust_counters(subtask_deltas([counted], [current]))
+
+
+@receiver(post_delete, sender=Subtask)
+def uncount_deleted_subtask(sender, instance, origin=None, **kwargs):
+    # Subtasks deleted along with their task leave no counter to update.
+    if isinstance(origin, Task) or (isinstance(origin, QuerySet) and origin.model is Task):
+        return
+    # `Subtask.delete()` reads the stored state; querysets delete the rows they just loaded.
+    counted = instance.__dict__.pop('_counted', (instance.task_id, instance.is_completed))
+    if counted is None:
+        # The row was already gone: nothing to uncount.
+        return
+    adjust_counters(subtask_deltas([counted], []))
+
+
+@receiver(post_delete, sender=Contact)
+def uncount_deleted_contact(sender, instance, **kwargs):
+    # The through rows are removed without m2m_changed; see `remember_contact_tasks`.
+    adjust_counters(contact_deltas(getattr(instance, '_task_ids', ()), -1))
+
+
+@receiver(resources_changed)
+def bump_version(sender, resource, **kwargs):
+    ResourceVersion.objects.bump(resource)
+
+
+@receiver(resources_changed)
+def record_changes(sender, resource, pks, deleted, **kwargs):
+    """
+    Appends the change to the log read by the delta sync endpoint.
+    """
+    Change.objects.bulk_create(Change(resource=resource, object_id=pk, deleted=deleted) for pk in pks)
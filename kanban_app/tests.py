@@ -1,3 +1,1194 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+import asyncio
+import datetime
+import gzip
+import io
+import json
+import zlib
+
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.urls import Resolver404, resolve, reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from join_back_end.compression import choose_encoding, get_compressed_cache
+from join_back_end.metrics import registry
+from kanban_app import events
+from kanban_app.api import async_views
+from kanban_app.api.caching import get_response_cache
+from kanban_app.api.views import BoardView
+from kanban_app.api.projections import board_task_projection, contact_projection, subtask_projection, task_projection
+from kanban_app.api.serializers import BoardTaskSerializer, ContactSerializer, SubtaskSerializer, TaskSerializer
+from kanban_app.api.sync import collect_changes
+from kanban_app.management.commands.bench_endpoints import missing_scenarios
+from kanban_app.counters import counter_mismatches
+from kanban_app.models import Change, Contact, ResourceVersion, Subtask, Task
+from kanban_app.search import CANDIDATES, CONTACT_INDEX, TASK_INDEX, search_contacts, search_tables, search_tasks
+from kanban_app.signals import TASK
 
 # Create your tests here.
+
+
+def create_board(user, tasks=3, contacts_per_task=2, subtasks_per_task=2):
+    """
+    Creates a small board for `user` and returns the created tasks.
+    """
+    created = []
+    for i in range(tasks):
+        task = Task.objects.create(
+            title=f'Task {i}', category='Technical Task', priority='medium',
+            due_date='2030-01-01', state='todo')
+        contacts = [
+            Contact.objects.create(
+                user=user, first_name=f'First {i}{j}', last_name=f'Last {i}{j}',
+                email=f'c{i}{j}@example.com', phone='123')
+            for j in range(contacts_per_task)
+        ]
+        task.contacts.set(contacts)
+        for j in range(subtasks_per_task):
+            Subtask.objects.create(task=task, title=f'Subtask {i}{j}')
+        created.append(task)
+    return created
+
+
+class KanbanTestCase(TestCase):
+    """
+    Base class providing an API client and a staff user.
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='staff', email='staff@example.com', password='password123', is_staff=True)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+
+class QueryCountTests(KanbanTestCase):
+    """
+    The list and detail endpoints must run a fixed number of queries
+    no matter how many rows are stored.
+    """
+
+    def assertConstantQueries(self, url):
+        create_board(self.user, tasks=2)
+        small = self.count_queries(url)
+        create_board(self.user, tasks=20, contacts_per_task=4)
+        large = self.count_queries(url)
+        self.assertEqual(small, large)
+
+    def test_task_list(self):
+        self.assertConstantQueries(reverse('task-list'))
+
+    def test_subtask_list(self):
+        self.assertConstantQueries(reverse('subtask-list'))
+
+    def test_contact_list(self):
+        self.assertConstantQueries(reverse('contact-list'))
+
+    def test_task_detail(self):
+        task = create_board(self.user, tasks=1, contacts_per_task=1)[0]
+        small = self.count_queries(reverse('task-detail', args=[task.pk]))
+        task.contacts.add(*create_board(self.user, tasks=1, contacts_per_task=10)[0].contacts.all())
+        large = self.count_queries(reverse('task-detail', args=[task.pk]))
+        self.assertEqual(small, large)
+
+    def test_task_list_contacts_count(self):
+        create_board(self.user, tasks=2, contacts_per_task=3)
+        response = self.client.get(reverse('task-list'))
+        self.assertEqual([t['contacts_count'] for t in response.data], [3, 3])
+
+
+class CursorPaginationTests(KanbanTestCase):
+    """
+    Pagination is opt-in and walks the tasks in primary key order.
+    """
+
+    def test_without_page_size_returns_plain_list(self):
+        create_board(self.user, tasks=3)
+        response = self.client.get(reverse('task-list'))
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 3)
+
+    def test_cursor_walks_every_task_once(self):
+        tasks = create_board(self.user, tasks=5)
+        seen = []
+        url = reverse('task-list') + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            seen.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [task.pk for task in tasks])
+
+    def test_page_cost_does_not_depend_on_depth(self):
+        create_board(self.user, tasks=6, contacts_per_task=1)
+        first = reverse('subtask-list') + '?page_size=2'
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(first)
+        queries = [query['sql'] for query in ctx.captured_queries]
+        last = response.data['next']
+        for _ in range(3):
+            last = self.client.get(last).data['next']
+        self.assertEqual(len(queries), self.count_queries(last))
+        self.assertFalse(any('COUNT(' in sql for sql in queries))
+
+
+class FilterTests(KanbanTestCase):
+    """
+    Server-side filters on the task and subtask lists.
+    """
+
+    def test_task_filters(self):
+        first, second, third = create_board(self.user, tasks=3)
+        Task.objects.filter(pk=second.pk).update(state='done', due_date='2030-02-01')
+        Task.objects.filter(pk=third.pk).update(state='done', due_date='2030-03-01')
+        response = self.client.get(
+            reverse('task-list'), {'state': 'done', 'due_date_from': '2030-02-15', 'due_date_to': '2030-03-31'})
+        self.assertEqual([task['id'] for task in response.data], [third.pk])
+
+    def test_invalid_task_filters(self):
+        response = self.client.get(reverse('task-list'), {'due_date_from': 'tomorrow'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('due_date_from', response.data['data'])
+
+    def test_subtask_filters(self):
+        task = create_board(self.user, tasks=2)[1]
+        done = task.subtasks.first()
+        Subtask.objects.filter(pk=done.pk).update(is_completed=True)
+        response = self.client.get(reverse('subtask-list'), {'task_id': task.pk, 'is_completed': 'true'})
+        self.assertEqual([subtask['id'] for subtask in response.data], [done.pk])
+        response = self.client.get(reverse('subtask-list'), {'task_id': task.pk})
+        self.assertEqual(len(response.data), 2)
+
+    def test_filters_use_composite_indexes(self):
+        plan = Task.objects.filter(state='todo', due_date__gte='2030-01-01').explain()
+        self.assertIn('task_state_due_date_idx', plan)
+        plan = Subtask.objects.filter(task_id=1, is_completed=False).explain()
+        self.assertIn('subtask_task_completed_idx', plan)
+
+
+class BoardTests(KanbanTestCase):
+    """
+    The board snapshot groups tasks by state in a fixed number of queries.
+    """
+
+    def test_board_groups_tasks_with_progress(self):
+        todo, done = create_board(self.user, tasks=2, contacts_per_task=1, subtasks_per_task=3)
+        Task.objects.filter(pk=done.pk).update(state='done')
+        subtask = done.subtasks.first()
+        subtask.is_completed = True
+        subtask.save()
+        response = self.client.get(reverse('board'))
+        self.assertEqual(set(response.data), {'todo', 'done'})
+        card = response.data['done'][0]
+        self.assertEqual(card['id'], done.pk)
+        self.assertEqual(card['progress'], {'done': 1, 'total': 3})
+        self.assertEqual(len(card['subtasks']), 3)
+        self.assertEqual(len(card['contacts']), 1)
+
+    def test_board_query_count(self):
+        create_board(self.user, tasks=2)
+        small = self.count_queries(reverse('board'))
+        create_board(self.user, tasks=15, contacts_per_task=3, subtasks_per_task=4)
+        self.assertEqual(small, self.count_queries(reverse('board')))
+        # Version lookup for the ETag, then tasks, contacts and subtasks.
+        self.assertEqual(small, 4)
+
+
+class ProjectionParityTests(KanbanTestCase):
+    """
+    The values()-based projections must render exactly the JSON of the serializers.
+    """
+
+    def setUp(self):
+        super().setUp()
+        tasks = create_board(self.user, tasks=4, contacts_per_task=3, subtasks_per_task=2)
+        # Edge cases: no contacts, no subtasks, empty and null fields, shared and reassigned contacts.
+        Task.objects.create(title='Empty', category='User Story', priority='', due_date=None, state='done')
+        tasks[0].contacts.set(list(Contact.objects.order_by('-id')[:4]))
+        Subtask.objects.filter(pk=tasks[1].subtasks.first().pk).update(is_completed=True)
+        Contact.objects.create(user=self.user, first_name='', last_name='Solo', email='', phone='')
+
+    def assertSameJSON(self, projected, serialized):
+        self.assertEqual(json.dumps(projected), json.dumps(serialized))
+
+    def test_contacts(self):
+        self.assertSameJSON(contact_projection(Contact.objects.all()),
+                            ContactSerializer(Contact.objects.all(), many=True).data)
+
+    def test_tasks(self):
+        tasks = Task.objects.filter(state__in=['todo', 'done'])
+        self.assertSameJSON(task_projection(tasks), TaskSerializer(tasks.with_contacts(), many=True).data)
+
+    def test_subtasks(self):
+        self.assertSameJSON(subtask_projection(Subtask.objects.all()),
+                            SubtaskSerializer(Subtask.objects.all(), many=True).data)
+
+    def test_board_tasks(self):
+        tasks = Task.objects.order_by('id')
+        self.assertSameJSON(board_task_projection(tasks), BoardTaskSerializer(tasks.for_board(), many=True).data)
+
+    def test_empty(self):
+        self.assertEqual(task_projection(Task.objects.none()), [])
+        self.assertEqual(board_task_projection(Task.objects.none()), [])
+
+    def test_paginated_endpoint(self):
+        response = self.client.get(reverse('task-list') + '?page_size=2')
+        page = Task.objects.with_contacts().order_by('id')[:2]
+        self.assertSameJSON(response.json()['results'], TaskSerializer(page, many=True).data)
+
+    def test_changes(self):
+        data = collect_changes(since=0, limit=1000)
+        self.assertSameJSON(data['tasks'], TaskSerializer(Task.objects.with_contacts().order_by('pk'), many=True).data)
+
+    def test_detail_endpoints(self):
+        task, contact, subtask = Task.objects.first(), Contact.objects.first(), Subtask.objects.first()
+        for url, expected in [
+            (reverse('task-detail', args=[task.pk]), TaskSerializer(task).data),
+            (reverse('contact-detail', args=[contact.pk]), ContactSerializer(contact).data),
+            (reverse('subtask-detail', args=[subtask.pk]), SubtaskSerializer(subtask).data),
+        ]:
+            self.assertSameJSON(self.client.get(url).json(), expected)
+
+
+class TaskCounterTests(KanbanTestCase):
+    """
+    The stored task counters follow every write path and can be checked and rebuilt.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+        self.task, self.other = create_board(self.user, tasks=2, contacts_per_task=2, subtasks_per_task=2)
+
+    def counters(self, task):
+        task.refresh_from_db()
+        return task.subtasks_total, task.subtasks_done, task.contacts_count
+
+    def assertConsistent(self):
+        self.assertEqual(counter_mismatches(), [])
+
+    def test_subtask_writes(self):
+        self.assertEqual(self.counters(self.task), (2, 0, 2))
+        subtask = Subtask.objects.create(task=self.task, title='Third', is_completed=True)
+        self.assertEqual(self.counters(self.task), (3, 1, 2))
+        subtask = Subtask.objects.get(pk=subtask.pk)
+        subtask.task = self.other
+        subtask.save()
+        self.assertEqual((self.counters(self.task), self.counters(self.other)), ((2, 0, 2), (3, 1, 2)))
+        subtask.is_completed = False
+        subtask.save()
+        subtask.delete()
+        self.assertEqual(self.counters(self.other), (2, 0, 2))
+        self.assertConsistent()
+
+    def test_contact_assignments(self):
+        contacts = list(self.other.contacts.all())
+        self.task.contacts.add(*contacts, *self.task.contacts.all())
+        self.assertEqual(self.task.contacts_count, 4)
+        self.assertEqual(self.counters(self.task), (2, 0, 4))
+        self.task.contacts.remove(contacts[0], Contact.objects.create(user=self.user))
+        self.assertEqual(self.counters(self.task), (2, 0, 3))
+        contacts[1].tasks.remove(self.task, self.other)
+        contacts[0].tasks.add(self.task)
+        self.assertEqual((self.counters(self.task), self.counters(self.other)), ((2, 0, 3), (2, 0, 1)))
+        contacts[0].tasks.clear()
+        self.task.contacts.first().delete()
+        self.assertEqual((self.counters(self.task), self.counters(self.other)), ((2, 0, 1), (2, 0, 0)))
+        self.task.contacts.clear()
+        self.assertEqual(self.counters(self.task), (2, 0, 0))
+        self.assertConsistent()
+
+    def test_api_and_bulk_writes(self):
+        contact_ids = list(Contact.objects.values_list('pk', flat=True)[:3])
+        response = self.client.post(reverse('task-list'), {
+            'title': 'Counted', 'category': 'User Story', 'due_date': '2030-01-01', 'priority': 'low',
+            'contacts_ids': contact_ids}, format='json')
+        self.assertEqual(response.data['data']['contacts_count'], 3)
+        task = Task.objects.get(pk=response.data['data']['id'])
+        self.client.post(reverse('subtask-list'), [
+            {'task_id': task.pk, 'title': 'One'}, {'task_id': task.pk, 'title': 'Two', 'is_completed': True}],
+            format='json')
+        self.assertEqual(self.counters(task), (2, 1, 3))
+        subtask = task.subtasks.get(title='One')
+        self.client.patch(reverse('subtask-list'), [{'id': subtask.pk, 'is_completed': True}], format='json')
+        self.client.patch(reverse('task-bulk'), [{'id': task.pk, 'contacts_ids': contact_ids[:1]}], format='json')
+        self.assertEqual(self.counters(task), (2, 2, 1))
+        self.assertConsistent()
+
+    def test_stale_subtask_instances(self):
+        # Two writers that loaded the same open subtask both complete it, then both delete it.
+        pk = self.task.subtasks.first().pk
+        first, second = Subtask.objects.get(pk=pk), Subtask.objects.get(pk=pk)
+        first.is_completed = second.is_completed = True
+        first.save()
+        second.save()
+        self.assertEqual(self.counters(self.task), (2, 1, 2))
+        first.delete()
+        second.delete()
+        self.assertEqual(self.counters(self.task), (1, 0, 2))
+        self.assertConsistent()
+
+    def test_stale_instance_does_not_overwrite_counters(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        Subtask.objects.create(task=self.task, title='Third')
+        stale.title = 'Renamed'
+        stale.save()
+        self.assertEqual(self.counters(self.task), (3, 0, 2))
+        self.task.delete()
+        self.assertConsistent()
+
+    def test_check_and_rebuild_commands(self):
+        Subtask.objects.filter(task=self.task).update(is_completed=True)
+        with self.assertRaises(CommandError):
+            call_command('check_task_counters', stdout=io.StringIO())
+        version = ResourceVersion.objects.current((TASK,))[TASK]
+        call_command('rebuild_task_counters', stdout=io.StringIO())
+        self.assertEqual(self.counters(self.task), (2, 2, 2))
+        self.assertGreater(ResourceVersion.objects.current((TASK,))[TASK], version)
+        call_command('check_task_counters', stdout=io.StringIO())
+
+
+class SparseFieldsetTests(KanbanTestCase):
+    """
+    `?fields=` limits the output keys and the columns read, `?expand=` decides
+    which relations are nested as objects instead of primary keys.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tasks = create_board(self.user, tasks=3, contacts_per_task=2, subtasks_per_task=2)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        # Leaves out the resource version lookup of the conditional GET.
+        return response.json(), [query for query in ctx.captured_queries if 'resourceversion' not in query['sql']]
+
+    def test_fields_limit_keys_and_columns(self):
+        data, queries = self.get(reverse('task-list') + '?fields=id,title,state')
+        self.assertEqual(list(data[0]), ['id', 'title', 'state'])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('description', queries[0]['sql'])
+
+    def test_relation_without_expand_returns_ids(self):
+        data, queries = self.get(reverse('task-list') + '?fields=id,contacts&expand=')
+        contact_ids = sorted(contact.pk for contact in self.tasks[0].contacts.all())
+        self.assertEqual(data[0], {'id': self.tasks[0].pk, 'contacts': contact_ids})
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('first_name', queries[1]['sql'])
+
+    def test_nested_fields(self):
+        data, _ = self.get(reverse('task-list') + '?fields=id,contacts.first_name,contacts.last_name')
+        self.assertEqual(data[0]['contacts'][0], {'first_name': 'First 00', 'last_name': 'Last 00'})
+
+    def test_board_cards(self):
+        data, queries = self.get(reverse('board') + '?fields=id,title,priority,contacts.first_name,progress')
+        card = data['todo'][0]
+        self.assertEqual(list(card), ['id', 'title', 'priority', 'contacts', 'progress'])
+        self.assertEqual(card['progress'], {'done': 0, 'total': 2})
+        # Tasks with their counters, then contacts; `progress` needs no subtask query.
+        self.assertEqual(len(queries), 2)
+
+    def test_expand_subtask_task(self):
+        subtask = self.tasks[0].subtasks.first()
+        data, _ = self.get(reverse('subtask-detail', args=[subtask.pk]) + '?expand=task&fields=id,task.title')
+        self.assertEqual(data, {'id': subtask.pk, 'task': {'title': 'Task 0'}})
+        data, _ = self.get(reverse('contact-list') + '?fields=id,user')
+        self.assertEqual(data[0]['user'], self.user.pk)
+
+    def test_contact_user_cannot_be_expanded(self):
+        # The owning account's username and name are not part of the contact API.
+        for query in ['?expand=user', '?fields=user.username']:
+            response = APIClient().get(reverse('contact-list') + query)
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_pagination(self):
+        data, _ = self.get(reverse('subtask-list') + '?fields=title&page_size=2')
+        self.assertEqual(data['results'], [{'title': 'Subtask 00'}, {'title': 'Subtask 01'}])
+        self.assertIsNotNone(data['next'])
+
+    def test_invalid_selection(self):
+        for query in ['fields=id,secret', 'fields=', 'expand=state', 'fields=contacts.secret', 'fields=contacts.contacts']:
+            response = self.client.get(reverse('task-list') + '?' + query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertEqual(response.json()['error'], 'Invalid field selection')
+
+
+class ContactSearchTests(KanbanTestCase):
+    """
+    `?q=` on the contact list searches the trigram index kept in sync by triggers.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.contacts = {
+            name: Contact.objects.create(user=self.user, first_name=first, last_name=last, email=email, phone=phone)
+            for name, first, last, email, phone in [
+                ('hannah', 'Hannah', 'Jones', 'hj@example.com', '+49 555 0101'),
+                ('anna', 'Anna', 'Smith', 'anna.smith@example.com', '+49 555 0102'),
+                ('bob', 'Bob', 'Annable', 'bob@example.org', '+49 555 0103'),
+                ('carl', 'Carl', 'Weber', 'c.weber@example.org', '+49 777 0104'),
+            ]
+        }
+
+    def search(self, query, **params):
+        response = self.client.get(reverse('contact-list'), {'q': query, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [contact['id'] for contact in response.json()]
+
+    def ids(self, *names):
+        return [self.contacts[name].pk for name in names]
+
+    def test_ranks_name_prefixes_first(self):
+        # Name prefix matches (sorted by last name), then other name matches.
+        self.assertEqual(self.search('ann'), self.ids('bob', 'anna', 'hannah'))
+
+    def test_name_prefixes_beyond_the_candidates(self):
+        # More email matches than ranked candidates, all with lower ids than the name match.
+        Contact.objects.bulk_create(
+            Contact(user=self.user, first_name='Filler', last_name=str(i), email=f'filler{i}@annex.com')
+            for i in range(CANDIDATES))
+        zed = Contact.objects.create(user=self.user, first_name='Zed', last_name='Annan', email='zed@example.com')
+        expected = [self.contacts['bob'].pk, zed.pk, self.contacts['anna'].pk]
+        for indexed in (True, False):
+            self.assertEqual(search_contacts('ann', limit=3, indexed=indexed), expected)
+            self.assertEqual(search_contacts('ann', limit=4, indexed=indexed)[:3], expected)
+
+    def test_uses_the_index(self):
+        self.assertIn(CONTACT_INDEX, search_tables())
+        with CaptureQueriesContext(connection) as ctx:
+            self.search('weber')
+        self.assertTrue(any('MATCH' in query['sql'] for query in ctx.captured_queries))
+
+    def test_email_phone_and_several_terms(self):
+        self.assertEqual(self.search('example.org'), self.ids('bob', 'carl'))
+        self.assertEqual(self.search('777'), self.ids('carl'))
+        self.assertEqual(self.search('ann sm'), self.ids('anna'))
+        self.assertEqual(self.search('nobody'), [])
+
+    def test_index_follows_writes(self):
+        Contact.objects.filter(pk=self.contacts['carl'].pk).update(last_name='Annberg')
+        self.contacts['hannah'].delete()
+        Contact.objects.bulk_create([Contact(user=self.user, first_name='Annika', last_name='Bulk')])
+        results = self.search('ann')
+        self.assertEqual(len(results), 4)
+        self.assertNotIn(self.contacts['hannah'].pk, results)
+        self.assertEqual(self.search('annberg'), self.ids('carl'))
+
+    def test_fallback_finds_the_same_contacts(self):
+        for query in ['ann', 'example.org', 'ann sm', 'a']:
+            self.assertEqual(sorted(search_contacts(query, indexed=False)), sorted(search_contacts(query)), query)
+
+    def test_limit_fields_and_validation(self):
+        self.assertEqual(len(self.search('example', limit=2)), 2)
+        response = self.client.get(reverse('contact-list'), {'q': 'ann', 'fields': 'first_name'})
+        self.assertEqual(response.json(), [{'first_name': 'Bob'}, {'first_name': 'Anna'}, {'first_name': 'Hannah'}])
+        response = self.client.get(reverse('contact-list'), {'q': 'ann', 'limit': 0})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.client.get(reverse('contact-list'), {'q': ''}).json()), 4)
+
+
+class ContactScopeTests(KanbanTestCase):
+    """
+    `?scope=mine` limits the contact list and search to the requesting user's contacts.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user(username='other', password='password123')
+        self.contacts = {
+            name: Contact.objects.create(user=user, first_name=first, last_name=last)
+            for name, user, first, last in [
+                ('zed', self.user, 'Zed', 'Adams'),
+                ('amy', self.user, 'Amy', 'Brown'),
+                ('bob', self.user, 'Bob', 'Adams'),
+                ('eve', self.other, 'Eve', 'Adams'),
+            ]
+        }
+
+    def get(self, user, **params):
+        self.client.force_authenticate(user)
+        return self.client.get(reverse('contact-list'), {'scope': 'mine', **params})
+
+    def ids(self, *names):
+        return [self.contacts[name].pk for name in names]
+
+    def test_lists_own_contacts_by_name(self):
+        self.assertEqual([contact['id'] for contact in self.get(self.user).json()], self.ids('bob', 'zed', 'amy'))
+        self.assertEqual([contact['id'] for contact in self.get(self.other).json()], self.ids('eve'))
+        self.assertEqual(len(self.get(self.user, scope='all').json()), 4)
+
+    def test_pages_keep_the_name_order(self):
+        page = self.get(self.user, page_size=2).json()
+        self.assertEqual([contact['id'] for contact in page['results']], self.ids('bob', 'zed'))
+        page = self.client.get(page['next']).json()
+        self.assertEqual([contact['id'] for contact in page['results']], self.ids('amy'))
+        page = self.get(self.user, page_size=2, fields='id').json()
+        self.assertEqual(page['results'], [{'id': pk} for pk in self.ids('bob', 'zed')])
+
+    def test_search_within_scope(self):
+        self.assertEqual([contact['id'] for contact in self.get(self.user, q='adams').json()], self.ids('bob', 'zed'))
+        self.assertEqual([contact['id'] for contact in self.get(self.other, q='adams').json()], self.ids('eve'))
+        self.assertEqual(search_contacts('adams', indexed=False, user=self.other.pk), self.ids('eve'))
+
+    def test_responses_are_kept_apart_per_user(self):
+        mine = self.get(self.user)
+        theirs = self.get(self.other)
+        self.assertEqual(theirs['X-Cache'], 'MISS')
+        self.assertNotEqual(mine['ETag'], theirs['ETag'])
+        self.client.force_authenticate(self.other)
+        response = self.client.get(reverse('contact-list'), {'scope': 'mine'}, HTTP_IF_NONE_MATCH=mine['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_uses_the_index(self):
+        queryset = Contact.objects.filter(user=self.user).order_by('last_name', 'first_name', 'id')
+        self.assertIn('contact_user_name_idx', queryset.explain())
+
+    def test_validation(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(reverse('contact-list'), {'scope': 'mine'}).status_code, 401)
+        self.assertEqual(self.get(self.user, scope='everyone').status_code, 400)
+
+
+class TaskSearchTests(KanbanTestCase):
+    """
+    `tasks/search/` ranks tasks with the full-text index over title and description.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tasks = {
+            name: Task.objects.create(title=title, description=description, priority='low')
+            for name, title, description in [
+                ('login', 'Fix login form', 'The <script> tag breaks the login page.'),
+                ('docs', 'Write docs', 'Explain how the login works.'),
+                ('deploy', 'Deploy release', 'Ship the café build to production.'),
+                ('logo', 'New logo', 'Draw a logo.'),
+            ]
+        }
+
+    def search(self, query, **params):
+        response = self.client.get(reverse('task-search'), {'q': query, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def ids(self, *names):
+        return [self.tasks[name].pk for name in names]
+
+    def test_ranks_title_matches_first(self):
+        results = self.search('login')['results']
+        self.assertEqual([task['id'] for task in results], self.ids('login', 'docs'))
+        self.assertEqual(results[0]['highlight']['title'], 'Fix <mark>login</mark> form')
+        self.assertEqual(results[0]['title'], 'Fix login form')
+        self.assertEqual(results[0]['contacts'], [])
+
+    def test_prefix_words_and_diacritics(self):
+        self.assertEqual([task['id'] for task in self.search('lo')['results']], self.ids('logo', 'login', 'docs'))
+        self.assertEqual([task['id'] for task in self.search('ship cafe')['results']], self.ids('deploy'))
+        self.assertEqual(self.search('nothing')['results'], [])
+
+    def test_highlight_is_escaped(self):
+        self.assertEqual(self.search('script')['results'][0]['highlight']['description'],
+                         'The &lt;<mark>script</mark>&gt; tag breaks the login page.')
+
+    def test_pagination(self):
+        first = self.search('lo', page_size=2)
+        self.assertEqual([task['id'] for task in first['results']], self.ids('logo', 'login'))
+        self.assertIsNone(first['previous'])
+        second = self.client.get(first['next']).json()
+        self.assertEqual([task['id'] for task in second['results']], self.ids('docs'))
+        self.assertIsNone(second['next'])
+        self.assertNotIn('page=', second['previous'])
+
+    def test_index_follows_writes(self):
+        self.assertIn(TASK_INDEX, search_tables())
+        Task.objects.filter(pk=self.tasks['logo'].pk).update(title='Login icon')
+        self.tasks['docs'].delete()
+        Task.objects.bulk_create([Task(title='Bulk login', priority='low')])
+        results = self.search('login')['results']
+        self.assertEqual(len(results), 3)
+        self.assertNotIn(self.tasks['docs'].pk, [task['id'] for task in results])
+
+    def test_fallback_finds_the_same_tasks(self):
+        for query in ['login', 'the login', 'café']:
+            indexed = search_tasks(query)
+            self.assertEqual(sorted(hit['id'] for hit in search_tasks(query, indexed=False)),
+                             sorted(hit['id'] for hit in indexed), query)
+
+    def test_fields_and_validation(self):
+        results = self.search('login', fields='id,title')['results']
+        self.assertEqual(set(results[0]), {'id', 'title', 'highlight'})
+        for params in [{}, {'q': ''}, {'q': '--'}, {'q': 'login', 'page': 0}, {'q': 'login', 'page_size': 101}]:
+            self.assertEqual(self.client.get(reverse('task-search'), params).status_code, 400, params)
+
+
+class StreamingTests(KanbanTestCase):
+    """
+    `?stream=true` sends the unpaginated lists in chunks with the same bytes as the buffered response.
+    """
+
+    def setUp(self):
+        super().setUp()
+        create_board(self.user, tasks=5, contacts_per_task=2, subtasks_per_task=1)
+
+    def test_streamed_body_matches_buffered(self):
+        for name in ['task-list', 'contact-list', 'subtask-list']:
+            buffered = self.client.get(reverse(name), HTTP_ACCEPT='application/json')
+            streamed = self.client.get(reverse(name) + '?stream=true')
+            self.assertTrue(streamed.streaming, name)
+            self.assertEqual(b''.join(streamed.streaming_content), buffered.content, name)
+
+    @override_settings(KANBAN_STREAM_CHUNK_SIZE=2)
+    def test_rows_are_read_in_chunks(self):
+        response = self.client.get(reverse('task-list') + '?stream=true&fields=id,contacts&expand=')
+        with CaptureQueriesContext(connection) as ctx:
+            data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([len(task['contacts']) for task in data], [2] * 5)
+        # The task rows, then one contacts query for each of the three chunks.
+        self.assertEqual(len(ctx.captured_queries), 4)
+
+    def test_empty_and_paginated(self):
+        response = self.client.get(reverse('task-list') + '?stream=true&state=done')
+        self.assertEqual(b''.join(response.streaming_content), b'[]')
+        response = self.client.get(reverse('task-list') + '?stream=true&page_size=2')
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(response.json()['results']), 2)
+
+
+class ConditionalGetTests(KanbanTestCase):
+    """
+    List and detail endpoints answer 304 while nothing has changed.
+    """
+
+    def get_with_etag(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_list_returns_304_with_one_query(self):
+        create_board(self.user, tasks=3)
+        url = reverse('task-list')
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.get_with_etag(url, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_writes_change_the_etag(self):
+        task = create_board(self.user, tasks=1)[0]
+        url = reverse('task-detail', args=[task.pk])
+        etag = self.client.get(url)['ETag']
+        Contact.objects.filter(pk=task.contacts.first().pk).first().save()
+        self.assertEqual(self.get_with_etag(url, etag).status_code, 200)
+        etag = self.client.get(url)['ETag']
+        task.contacts.clear()
+        self.assertEqual(self.get_with_etag(url, etag).status_code, 200)
+
+    def test_etag_depends_on_query_string(self):
+        create_board(self.user, tasks=1)
+        etag = self.client.get(reverse('subtask-list'))['ETag']
+        response = self.get_with_etag(reverse('subtask-list') + '?is_completed=true', etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class ResponseCacheTests(KanbanTestCase):
+    """
+    List responses are served from the versioned cache until a write happens.
+    """
+
+    def test_second_read_is_a_hit(self):
+        create_board(self.user, tasks=3)
+        first = self.client.get(reverse('task-list'))
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(reverse('task-list'))
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_writes_invalidate(self):
+        task = create_board(self.user, tasks=1)[0]
+        self.client.get(reverse('subtask-list'))
+        Subtask.objects.create(task=task, title='Another subtask')
+        response = self.client.get(reverse('subtask-list'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data), 3)
+        contact = task.contacts.first()
+        self.client.get(reverse('task-list'))
+        task.contacts.remove(contact)
+        response = self.client.get(reverse('task-list'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data[0]['contacts_count'], 1)
+
+    @override_settings(KANBAN_RESPONSE_CACHE={'BACKEND': 'django', 'ALIAS': 'default', 'TIMEOUT': 60})
+    def test_django_cache_backend(self):
+        create_board(self.user, tasks=1)
+        self.client.get(reverse('contact-list'))
+        self.assertEqual(self.client.get(reverse('contact-list'))['X-Cache'], 'HIT')
+        Contact.objects.create(user=self.user, first_name='New', last_name='Contact')
+        self.assertEqual(self.client.get(reverse('contact-list'))['X-Cache'], 'MISS')
+        self.assertEqual(get_response_cache().stats()['hits'], 1)
+
+    def test_stats_endpoint_requires_admin(self):
+        self.assertEqual(self.client.get(reverse('cache-stats')).status_code, 401)
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'password123')
+        self.client.force_authenticate(admin)
+        self.assertEqual(self.client.get(reverse('cache-stats')).data['backend'], 'local')
+
+
+class TaskBulkUpdateTests(KanbanTestCase):
+    """
+    PATCH /kanban/tasks/bulk/ updates many tasks with a fixed number of queries.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+
+    def patch(self, items):
+        return self.client.patch(reverse('task-bulk'), items, format='json')
+
+    def test_updates_fields_and_contacts(self):
+        first, second = create_board(self.user, tasks=2)
+        contact = second.contacts.first()
+        response = self.patch([
+            {'id': first.pk, 'state': 'done', 'contacts_ids': [contact.pk]},
+            {'id': second.pk, 'priority': 'urgent'},
+        ])
+        self.assertTrue(response.data['ok'])
+        first.refresh_from_db()
+        self.assertEqual(first.state, 'done')
+        self.assertEqual(list(first.contacts.all()), [contact])
+        self.assertEqual(response.data['data'][0]['data']['contacts_count'], 1)
+        self.assertEqual(Task.objects.get(pk=second.pk).priority, 'urgent')
+
+    def test_query_count_does_not_grow(self):
+        tasks = create_board(self.user, tasks=25)
+        contact = tasks[0].contacts.first()
+
+        def run(batch):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.patch([{'id': task.pk, 'state': 'done', 'contacts_ids': [contact.pk]} for task in batch])
+            self.assertTrue(response.data['ok'])
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run(tasks[:2]), run(tasks[2:]))
+
+    def test_invalid_item_rejects_the_batch(self):
+        first, second = create_board(self.user, tasks=2)
+        response = self.patch([{'id': first.pk, 'state': 'done'}, {'id': second.pk, 'title': 'ab'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([item['ok'] for item in response.data['data']], [True, False])
+        self.assertEqual(Task.objects.get(pk=first.pk).state, 'todo')
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(User.objects.create_user('visitor', password='password123'))
+        self.assertEqual(self.patch([{'id': 1, 'state': 'done'}]).status_code, 403)
+
+
+class SubtaskBulkTests(KanbanTestCase):
+    """
+    Subtasks can be created and toggled in bulk with batched lookups.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_resolves_tasks_once(self):
+        tasks = create_board(self.user, tasks=3, subtasks_per_task=0)
+
+        def run(count):
+            items = [{'task_id': tasks[i % 3].pk, 'title': f'Step {i}'} for i in range(count)]
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(reverse('subtask-list'), items, format='json')
+            self.assertEqual(response.status_code, 201)
+            return len(ctx.captured_queries)
+
+        run(1)  # creates the subtask version counter
+        self.assertEqual(run(2), run(12))
+        self.assertEqual(Subtask.objects.count(), 15)
+
+    def test_bulk_create_reports_errors_per_item(self):
+        task = create_board(self.user, tasks=1, subtasks_per_task=0)[0]
+        items = [{'task_id': task.pk, 'title': 'Valid'}, {'task_id': 999, 'title': 'x'}]
+        response = self.client.post(reverse('subtask-list'), items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data['data'][0]['ok'])
+        self.assertEqual(set(response.data['data'][1]['errors']), {'task_id', 'title'})
+        self.assertFalse(Subtask.objects.exists())
+
+    def test_bulk_toggle(self):
+        subtasks = list(create_board(self.user, tasks=1, subtasks_per_task=3)[0].subtasks.all())
+        items = [{'id': subtask.pk, 'is_completed': True} for subtask in subtasks[:2]]
+        response = self.client.patch(reverse('subtask-list'), items, format='json')
+        self.assertTrue(response.data['ok'])
+        self.assertEqual(Subtask.objects.filter(is_completed=True).count(), 2)
+        self.assertTrue(response.data['data'][0]['data']['is_completed'])
+
+
+class DeltaSyncTests(KanbanTestCase):
+    """
+    /kanban/changes/ returns only what changed after a sequence number.
+    """
+
+    def sync(self, since, **params):
+        return self.client.get(reverse('changes'), {'since': since, **params}).data
+
+    def test_returns_changed_rows_and_tombstones(self):
+        first, second = create_board(self.user, tasks=2, contacts_per_task=1, subtasks_per_task=1)
+        seq = self.sync(0)['seq']
+        self.assertEqual(self.sync(seq)['tasks'], [])
+
+        Task.objects.filter(pk=first.pk).first().save()
+        subtask_id = second.subtasks.first().pk
+        Subtask.objects.get(pk=subtask_id).delete()
+        data = self.sync(seq)
+        self.assertEqual([task['id'] for task in data['tasks']], [first.pk])
+        self.assertEqual(data['subtasks'], [])
+        self.assertEqual(data['deleted']['subtasks'], [subtask_id])
+        self.assertGreater(data['seq'], seq)
+
+    def test_contact_changes_mark_their_tasks(self):
+        task = create_board(self.user, tasks=1, contacts_per_task=2)[0]
+        seq = self.sync(0)['seq']
+        contact_id = task.contacts.first().pk
+        Contact.objects.get(pk=contact_id).delete()
+        data = self.sync(seq)
+        self.assertEqual(data['deleted']['contacts'], [contact_id])
+        self.assertEqual(data['tasks'][0]['contacts_count'], 1)
+        seq = data['seq']
+        task.contacts.first().tasks.clear()
+        self.assertEqual([t['id'] for t in self.sync(seq)['tasks']], [task.pk])
+
+    def test_bulk_writes_are_logged(self):
+        task = create_board(self.user, tasks=1)[0]
+        seq = self.sync(0)['seq']
+        self.client.force_authenticate(self.user)
+        self.client.patch(reverse('task-bulk'), [{'id': task.pk, 'state': 'done'}], format='json')
+        self.assertEqual(self.sync(seq)['tasks'][0]['state'], 'done')
+
+    def test_limit_pages_through_the_log(self):
+        create_board(self.user, tasks=3, contacts_per_task=0, subtasks_per_task=0)
+        data = self.sync(0, limit=2)
+        self.assertTrue(data['has_more'])
+        rest = self.sync(data['seq'], limit=2)
+        self.assertFalse(rest['has_more'])
+        self.assertEqual(len(data['tasks']) + len(rest['tasks']), 3)
+
+
+    def test_pruned_log_answers_gone(self):
+        create_board(self.user, tasks=2, contacts_per_task=0, subtasks_per_task=0)
+        seq = self.sync(0)['seq']
+        Change.objects.update(changed_at=timezone.now() - datetime.timedelta(days=31))
+        Task.objects.create(title='Recent', priority='low')
+        call_command('prune_changes', stdout=io.StringIO())
+        self.assertEqual(Change.objects.count(), 1)
+        response = self.client.get(reverse('changes'), {'since': 0})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.data['seq'], seq + 1)
+        self.assertEqual([task['title'] for task in self.sync(seq)['tasks']], ['Recent'])
+        # The newest entry is kept even when it is old.
+        Change.objects.update(changed_at=timezone.now() - datetime.timedelta(days=31))
+        call_command('prune_changes', days=1, stdout=io.StringIO())
+        self.assertEqual(list(Change.objects.values_list('seq', flat=True)), [seq + 1])
+
+class LiveEventTests(KanbanTestCase):
+    """
+    Model changes reach connected clients as Server-Sent Events.
+    """
+
+    def test_stream_delivers_committed_changes(self):
+        broker = events.MemoryBroker()
+
+        async def scenario():
+            subscription = broker.subscribe()
+            stream = events.event_stream(broker, subscription, heartbeat=0.05)
+            self.assertEqual(await anext(stream), 'retry: 3000\n\n')
+            self.assertEqual(await anext(stream), ': keep-alive\n\n')
+            broker.publish({'resource': 'task', 'ids': [1], 'deleted': False})
+            message = await anext(stream)
+            await stream.aclose()
+            return message
+
+        message = asyncio.run(scenario())
+        self.assertIn('event: change', message)
+        self.assertIn('"ids": [1]', message)
+        self.assertFalse(broker.subscriptions)
+
+    def test_slow_client_is_asked_to_resync(self):
+        broker = events.MemoryBroker(queue_size=2)
+
+        async def scenario():
+            subscription = broker.subscribe()
+            stream = events.event_stream(broker, subscription, heartbeat=1)
+            await anext(stream)
+            for pk in range(5):
+                broker.publish({'resource': 'task', 'ids': [pk], 'deleted': False})
+            await asyncio.sleep(0)
+            message = await anext(stream)
+            await stream.aclose()
+            return message
+
+        self.assertTrue(asyncio.run(scenario()).startswith('event: resync'))
+
+    def test_stream_is_only_routed_under_asgi(self):
+        self.assertEqual(resolve('/kanban/events/', 'join_back_end.asgi_urls').func, async_views.board_events)
+        with self.assertRaises(Resolver404):
+            resolve('/kanban/events/', 'join_back_end.urls')
+        self.assertEqual(self.client.get('/kanban/events/').status_code, 404)
+
+    def test_model_signals_publish_after_commit(self):
+        published = []
+        events._broker = broker = events.MemoryBroker()
+        broker.publish = published.append
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                task = create_board(self.user, tasks=1, contacts_per_task=0, subtasks_per_task=0)[0]
+        finally:
+            events._broker = None
+        self.assertIn({'resource': 'task', 'ids': [task.pk], 'deleted': False}, published)
+
+
+class DatabaseEventBrokerTests(TransactionTestCase):
+    """
+    The database broker shares events between processes through the change log.
+    """
+
+    def test_poller_delivers_logged_changes(self):
+        broker = events.DatabaseBroker(poll_interval=0.01)
+
+        async def scenario():
+            subscription = broker.subscribe()
+            await asyncio.sleep(0.05)
+            task = await Task.objects.acreate(title='Remote', priority='low')
+            event = await subscription.get(timeout=2)
+            broker.unsubscribe(subscription)
+            await broker.poller
+            return task, event
+
+        task, event = asyncio.run(scenario())
+        self.assertEqual((event['resource'], event['ids']), ('task', [task.pk]))
+        self.assertIn('seq', event)
+
+
+class AsyncReadPathTests(TransactionTestCase):
+    """
+    Under ASGI the hot read endpoints run on the async ORM and return the
+    same payloads as the DRF views.
+    """
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = User.objects.create_user(
+            username='staff', email='staff@example.com', password='password123', is_staff=True)
+        self.tasks = create_board(self.user, tasks=3)
+
+    def test_asgi_requests_use_the_async_urlconf(self):
+        response = asyncio.run(AsyncClient().get(reverse('board')))
+        self.assertIs(response.resolver_match.func, async_views.board)
+        self.assertIs(self.client.get(reverse('board')).resolver_match.func.view_class, BoardView)
+
+    def test_payloads_match_the_sync_views(self):
+        async_client, sync_client = AsyncClient(), APIClient()
+        for url in [reverse('task-list'), reverse('task-list') + '?page_size=2', reverse('contact-list'),
+                    reverse('task-detail', args=[self.tasks[0].pk]), reverse('board'),
+                    reverse('board') + '?fields=id,title,contacts.first_name&expand=contacts',
+                    reverse('contact-list') + '?q=first&limit=3']:
+            response = asyncio.run(async_client.get(url))
+            self.assertEqual(response.status_code, 200, url)
+            get_response_cache().clear()
+            expected = sync_client.get(url, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.json(), expected.json(), url)
+
+    def test_streamed_list(self):
+        async def fetch(url):
+            response = await AsyncClient().get(url)
+            return response, b''.join([chunk async for chunk in response.streaming_content])
+
+        response, body = asyncio.run(fetch(reverse('task-list') + '?stream=true'))
+        self.assertIn('ETag', response)
+        expected = APIClient().get(reverse('task-list'), HTTP_ACCEPT='application/json')
+        self.assertEqual(body, expected.content)
+
+    def test_compressed_stream(self):
+        async def fetch(url):
+            response = await AsyncClient().get(url, headers={'Accept-Encoding': 'gzip'})
+            return response, b''.join([chunk async for chunk in response.streaming_content])
+
+        response, body = asyncio.run(fetch(reverse('task-list') + '?stream=true'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(body))[0]['id'], self.tasks[0].pk)
+
+    def test_conditional_get(self):
+        client = AsyncClient()
+        etag = asyncio.run(client.get(reverse('board')))['ETag']
+        response = asyncio.run(client.get(reverse('board'), headers={'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 304)
+
+    def test_scoped_contacts(self):
+        other = User.objects.create_user(username='other', password='password123')
+        Contact.objects.create(user=other, first_name='Eve', last_name='Other')
+        client, url = AsyncClient(), reverse('contact-list') + '?scope=mine'
+        response = asyncio.run(client.get(url, headers={'Authorization': f'Token {Token.objects.create(user=other).key}'}))
+        self.assertEqual([contact['first_name'] for contact in response.json()], ['Eve'])
+        response = asyncio.run(client.get(url, headers={'Authorization': f'Token {Token.objects.create(user=self.user).key}'}))
+        expected = Contact.objects.filter(user=self.user).order_by('last_name', 'first_name', 'id')
+        self.assertEqual([contact['id'] for contact in response.json()], list(expected.values_list('id', flat=True)))
+        self.assertEqual(asyncio.run(client.get(url)).status_code, 401)
+
+    def test_invalid_token_is_rejected(self):
+        response = asyncio.run(AsyncClient().get(reverse('task-list'), headers={'Authorization': 'Token nope'}))
+        self.assertEqual(response.status_code, 401)
+
+    def test_writes_reach_the_drf_view(self):
+        response = asyncio.run(AsyncClient().post(reverse('contact-list'), {'first_name': 'Ann'}))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('detail', response.json())
+
+    @override_settings(REQUEST_METRICS={'ENABLED': True})
+    def test_server_timing_header(self):
+        response = asyncio.run(AsyncClient().get(reverse('board')))
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+
+@override_settings(REQUEST_METRICS={'ENABLED': True})
+class RequestMetricsTests(KanbanTestCase):
+    """
+    Requests report their phases in a Server-Timing header and in the /metrics/ histograms.
+    """
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+        create_board(self.user, tasks=3)
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_reports_every_phase(self):
+        response = self.client.get(reverse('task-list'))
+        timing = response['Server-Timing']
+        for phase in ('auth', 'perm', 'db', 'serialize', 'render', 'total'):
+            self.assertIn(f'{phase};dur=', timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse('task-list'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('http_request_phase_seconds_count{view="task-list",method="GET",phase="total"} 1', body)
+        self.assertIn('http_request_db_queries_total{view="task-list",method="GET"}', body)
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.client.force_authenticate(None)
+        self.assertIn(self.client.get(reverse('metrics')).status_code, (401, 403))
+
+    @override_settings(REQUEST_METRICS={})
+    def test_disabled_by_default(self):
+        client = APIClient()
+        response = client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(registry.phases, {})
+
+
+class CompressionTests(KanbanTestCase):
+    """
+    JSON responses are gzip/deflate compressed as negotiated, and versioned
+    bodies are compressed once per ETag.
+    """
+
+    def setUp(self):
+        super().setUp()
+        get_compressed_cache().clear()
+        create_board(self.user, tasks=5)
+
+    def test_negotiation(self):
+        self.assertEqual(choose_encoding('gzip, deflate, br'), 'gzip')
+        self.assertEqual(choose_encoding('gzip;q=0.5, deflate'), 'deflate')
+        self.assertEqual(choose_encoding('gzip;q=0, *'), 'deflate')
+        self.assertEqual(choose_encoding('br, identity'), None)
+        self.assertEqual(choose_encoding(''), None)
+
+    def test_gzip_and_deflate(self):
+        identity = self.client.get(reverse('task-list'))
+        self.assertNotIn('Content-Encoding', identity)
+        self.assertEqual(identity['Vary'].split(', ')[-1], 'Accept-Encoding')
+        for encoding, decompress in [('gzip', gzip.decompress), ('deflate', zlib.decompress)]:
+            response = self.client.get(reverse('task-list'), HTTP_ACCEPT_ENCODING=encoding)
+            self.assertEqual(response['Content-Encoding'], encoding)
+            self.assertEqual(int(response['Content-Length']), len(response.content))
+            self.assertLess(len(response.content), len(identity.content))
+            self.assertEqual(decompress(response.content), identity.content)
+            self.assertEqual(response['ETag'], 'W/' + identity['ETag'])
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(reverse('task-list') + '?fields=id&state=todo&page_size=1',
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_compressed_body_is_reused_until_the_data_changes(self):
+        first = self.client.get(reverse('board'), HTTP_ACCEPT_ENCODING='gzip')
+        second = self.client.get(reverse('board'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual((get_compressed_cache().misses, get_compressed_cache().hits), (1, 1))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(self.client.get(reverse('board'), HTTP_ACCEPT_ENCODING='gzip',
+                                         HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        Task.objects.update(title='Renamed')
+        ResourceVersion.objects.bump(TASK)
+        third = self.client.get(reverse('board'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(get_compressed_cache().misses, 2)
+        self.assertIn(b'Renamed', gzip.decompress(third.content))
+
+    def test_streamed_response(self):
+        response = self.client.get(reverse('task-list') + '?stream=true', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(body, self.client.get(reverse('task-list'), HTTP_ACCEPT='application/json').content)
+
+    @override_settings(RESPONSE_COMPRESSION={'ENABLED': False})
+    def test_disabled(self):
+        response = APIClient().get(reverse('task-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+
+class BenchmarkToolingTests(TestCase):
+    """
+    The dataset generator and the endpoint benchmark stay in sync with the API.
+    """
+
+    def test_every_route_has_a_benchmark_scenario(self):
+        self.assertEqual(missing_scenarios(), [])
+
+    def test_seed_data(self):
+        call_command('seed_data', users=3, contacts=6, tasks=10, subtasks_per_task=2, stdout=io.StringIO())
+        self.assertEqual(User.objects.filter(username__startswith='bench-').count(), 3)
+        self.assertEqual(Contact.objects.count(), 6)
+        self.assertEqual(Task.objects.count(), 10)
+        self.assertEqual(Task.contacts.through.objects.count(), 20)
+        self.assertEqual(Subtask.objects.count(), 20)
+        self.assertTrue(all(user.auth_token for user in User.objects.filter(username__startswith='bench-')))
+        self.assertEqual(ResourceVersion.objects.current([TASK])[TASK], 1)
+
+    def test_seeded_rows_reach_the_delta_feed(self):
+        call_command('seed_data', users=1, contacts=4, tasks=3, subtasks_per_task=2, stdout=io.StringIO())
+        changes = APIClient().get(reverse('changes'), {'since': 0}).data
+        self.assertEqual([contact['id'] for contact in changes['contacts']],
+                         list(Contact.objects.order_by('pk').values_list('pk', flat=True)))
+        self.assertEqual([task['id'] for task in changes['tasks']],
+                         list(Task.objects.order_by('pk').values_list('pk', flat=True)))
+        self.assertEqual(len(changes['subtasks']), 6)
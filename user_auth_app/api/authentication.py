@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.authentication import TokenAuthentication
+
+from join_back_end.lru import LRUCache
+
+DEFAULTS = {
+    'MAX_ENTRIES': 1024,
+    'TIMEOUT': 300,
+}
+
+_token_cache = None
+
+
+def get_token_cache():
+    """
+    Returns the in-process token key -> (user, token) field values cache configured by `AUTH_TOKEN_CACHE`.
+    """
+    global _token_cache
+    if _token_cache is None:
+        config = {**DEFAULTS, **getattr(settings, 'AUTH_TOKEN_CACHE', {})}
+        _token_cache = LRUCache(config['MAX_ENTRIES'], config['TIMEOUT'])
+    return _token_cache
+
+
+@receiver(setting_changed)
+def reset_token_cache(setting, **kwargs):
+    global _token_cache
+    if setting == 'AUTH_TOKEN_CACHE':
+        _token_cache = None
+
+
+def forget_tokens(*keys):
+    """
+    Drops the cached lookups of the given token keys.
+    """
+    if _token_cache is not None:
+        for key in keys:
+            _token_cache.delete(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for DRF's `TokenAuthentication`.
+
+    Successful token lookups are kept in a bounded LRU cache with a TTL, so
+    repeat clients are authenticated without the Token JOIN User query.
+    Entries are dropped as soon as their token is deleted or changed, or
+    their user is saved or deleted (see `user_auth_app.signals`); the TTL
+    bounds how long other processes may keep serving a stale entry.
+
+    Failed lookups are not cached, so unknown and inactive tokens keep
+    hitting the database and raise the usual `AuthenticationFailed`.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            user, token = (load_instance(row) for row in cached)
+            token.user = user
+            return user, token
+        user, token = super().authenticate_credentials(key)
+        cache.set(key, (dump_instance(user), dump_instance(token)))
+        return user, token
+
+
+def dump_instance(instance):
+    """
+    Returns the model, database alias and concrete field values of `instance`.
+    The cache keeps these plain values rather than the instances themselves,
+    which concurrent requests would share and could mutate (attributes,
+    relation caches).
+    """
+    fields = instance._meta.concrete_fields
+    return type(instance), instance._state.db, tuple(getattr(instance, field.attname) for field in fields)
+
+
+def load_instance(row):
+    """
+    Builds a fresh instance from a `dump_instance()` row, as if loaded from the database.
+    """
+    model, db, values = row
+    return model.from_db(db, None, values)
@@ -179,6 +179,46 @@ class RegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
+class ProvisionedUserSerializer(serializers.Serializer):
+    """
+    Validates one row of a bulk user import.
+
+    Applies the same field rules as RegistrationSerializer but runs no
+    queries: uniqueness is checked for a whole batch at once by
+    `user_auth_app.provisioning.provision_users`.
+    """
+    username = serializers.CharField(max_length=150, allow_blank=True, error_messages={
+        'required': 'Please insert a username with at least 3 characters'})
+    first_name = serializers.CharField(max_length=150, allow_blank=True, error_messages={
+        'required': 'Please insert a first name with at least 3 characters'})
+    last_name = serializers.CharField(max_length=150, allow_blank=True, error_messages={
+        'required': 'Please insert a last name with at least 3 characters'})
+    email = serializers.EmailField(error_messages={
+        'required': 'Please insert an user email', 'blank': 'Please insert an user email'})
+    password = serializers.CharField(write_only=True, allow_blank=True, trim_whitespace=False, error_messages={
+        'required': 'Please insert a password with at least 8 characters'})
+
+    def validate_username(self, value):
+        if len(value) < 3:
+            raise serializers.ValidationError('Please insert a username with at least 3 characters')
+        return value
+
+    def validate_first_name(self, value):
+        if len(value) < 3:
+            raise serializers.ValidationError('Please insert a first name with at least 3 characters')
+        return value
+
+    def validate_last_name(self, value):
+        if len(value) < 3:
+            raise serializers.ValidationError('Please insert a last name with at least 3 characters')
+        return value
+
+    def validate_password(self, value):
+        if len(value) < 8:
+            raise serializers.ValidationError('Please insert a password with at least 8 characters')
+        return value
+
+
 class CustomLoginSerializer(serializers.ModelSerializer):
     """
     Serializer used for handling user login with either email and password.
@@ -205,8 +245,8 @@ class CustomLoginSerializer(serializers.ModelSerializer):
         """
         Object-level validation for login.
 
-        Validates the presence of a password, checks if an email is provided,
-        ensures the user exists, and authenticates them using the email and password.
+        Validates the presence of a password, checks if an email is provided and
+        authenticates the user by email and password (see `user_auth_app.backends.EmailBackend`).
 
         Args:
             data (dict): Dictionary containing 'email' and 'password' keys.
@@ -230,13 +270,12 @@ class CustomLoginSerializer(serializers.ModelSerializer):
             errors['password'] = 'Please insert a user password'
         user = None
 
-        # If email is provided, try to fetch user and authenticate
+        # If email is provided, authenticate with one query through the EmailBackend
         if email:
-            try:
-                user_obj = User.objects.get(email=email)
-                user = authenticate(
-                    username=user_obj.username, password=password)
-            except User.DoesNotExist:
+            user = authenticate(
+                self.context.get('request'), email=email, password=password or '')
+            # Only failed logins pay for telling an unknown email from a wrong password
+            if not user and not User.objects.filter(email=email).exists():
                 errors['email'] = 'A user with this email does not exist'
         # If email is not provided or blank, add error
         elif not email or len(email) == 0:
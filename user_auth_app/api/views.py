@@ -2,17 +2,21 @@
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.parsers import JSONParser, MultiPartParser
 from user_auth_app.api.serializers import RegistrationSerializer, CustomLoginSerializer
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 
 from django.contrib.auth.models import User
+from join_back_end.metrics import PhaseTimingMixin
+from user_auth_app.guest import GUEST_USERNAME, get_guest_payload
+from user_auth_app.provisioning import detect_format, open_upload, provision_users, read_users
 
 # Create your views here.
 
 
-class RegistrationView(APIView):
+class RegistrationView(PhaseTimingMixin, APIView):
     """
     API view that handles user registration.
     Allows registration of standard users and handles guest user logic.
@@ -33,7 +37,7 @@ class RegistrationView(APIView):
             Response: A DRF Response object containing either user data or error messages.
         """
         username = request.data.get('username')
-        if username == 'Guest':
+        if username == GUEST_USERNAME:
             return self.get_or_regist_guest_user(request)
         else:
             return self.regist_user(request)
@@ -80,6 +84,7 @@ class RegistrationView(APIView):
     def get_data_of_guest_user(self):
         """
         Retrieves guest user data and authentication token.
+        The payload is memoized in-process, so repeated guest logins need no database access.
 
         Returns:
             dict: A dictionary containing the guest user's data and token.
@@ -87,7 +92,16 @@ class RegistrationView(APIView):
         Raises:
             User.DoesNotExist: If the guest user does not exist in the database.
         """
-        guest_user = User.objects.get(username='Guest')
+        return get_guest_payload(self.load_guest_user)
+
+    def load_guest_user(self):
+        """
+        Loads the guest user and its token from the database.
+
+        Returns:
+            tuple: The guest user and the payload returned by `get_data_of_guest_user`.
+        """
+        guest_user = User.objects.get(username=GUEST_USERNAME)
         token, _ = Token.objects.get_or_create(user=guest_user)
         data = {
             'token': token.key,
@@ -98,7 +112,7 @@ class RegistrationView(APIView):
             'is_staff': guest_user.is_staff,
             'is_superuser': guest_user.is_superuser
         }
-        return data
+        return guest_user, data
 
     def get_data_of_registered_user(self, serializer):
         """
@@ -124,7 +138,7 @@ class RegistrationView(APIView):
         return data
 
 
-class CustomLoginView(APIView):
+class CustomLoginView(PhaseTimingMixin, APIView):
     """
     API view that handles user login.
     Accepts login credentials, validates them, and returns a token and user data if successful.
@@ -144,7 +158,7 @@ class CustomLoginView(APIView):
         Returns:
             Response: A DRF Response object with either login success data or error messages.
         """
-        serializer = CustomLoginSerializer(data=request.data)
+        serializer = CustomLoginSerializer(data=request.data, context={'request': request})
         data = {}
         if serializer.is_valid():
             data = self.get_logged_user_data(serializer)
@@ -155,6 +169,7 @@ class CustomLoginView(APIView):
     def get_logged_user_data(self, serializer):
         """
         Retrieves authenticated user from validated serializer data and generates a token.
+        The user instance loaded by the authentication backend is reused for the token lookup.
 
         Args:
             serializer (CustomLoginSerializer): A validated serializer instance containing the user.
@@ -175,3 +190,40 @@ class CustomLoginView(APIView):
             'is_superuser': user.is_superuser
         }
         return data
+
+
+class UserBulkImportView(PhaseTimingMixin, APIView):
+    """
+    API view that creates many users at once. Restricted to admin users.
+    Accepts a JSON list of registration objects or a CSV/JSONL upload in the `file` field.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    def post(self, request):
+        """
+        Handles POST requests for bulk user provisioning.
+
+        Valid rows are imported and invalid ones reported by their 1-based position;
+        see `user_auth_app.provisioning.provision_users`.
+
+        Args:
+            request (Request): The incoming HTTP request with the users to import.
+
+        Returns:
+            Response: A DRF Response object with the number of created users and the row errors.
+        """
+        upload = request.FILES.get('file')
+        if upload is not None:
+            rows = read_users(open_upload(upload), request.data.get('format') or detect_format(upload.name))
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            return Response({'data': {}, 'ok': False, 'message': 'Send a list of users or a CSV/JSONL file'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result = provision_users(rows)
+        except ValueError as exc:
+            return Response({'data': {}, 'ok': False, 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if result['created'] or not result['errors']:
+            return Response({'data': result, 'ok': not result['errors'], 'message': f"{result['created']} users imported"}, status=status.HTTP_201_CREATED)
+        return Response({'data': result, 'ok': False, 'message': 'No users imported'}, status=status.HTTP_400_BAD_REQUEST)
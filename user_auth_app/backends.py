@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticates a user by email address and password.
+
+    The user is fetched with a single query on the indexed `email` column
+    and returned as is, so callers can reuse the instance (e.g. for the
+    token lookup) without loading it again. Calls without an `email`
+    argument are left to the other backends.
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+        users = list(UserModel._default_manager.filter(email=email).order_by('pk'))
+        if not users:
+            # Run the password hasher anyway to keep the response time of
+            # unknown emails close to that of wrong passwords.
+            UserModel().set_password(password)
+            return None
+        # Emails are unique for registered users; older rows may share one.
+        for user in users:
+            if user.check_password(password) and self.user_can_authenticate(user):
+                return user
+        return None
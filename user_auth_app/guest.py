@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+
+GUEST_USERNAME = 'Guest'
+
+# (expires_at, user_id, payload) of the memoized Guest login, or None.
+_guest = None
+
+
+def get_guest_payload(build):
+    """
+    Returns the memoized Guest login payload.
+
+    On a miss, `build()` must return `(user, payload)`; exceptions (e.g. the
+    Guest user does not exist yet) propagate and nothing is memoized. The
+    payload is dropped when the Guest user or its token changes in this
+    process (see `user_auth_app.signals`); `AUTH_GUEST_CACHE_TIMEOUT`
+    bounds how long a change made by another process goes unnoticed.
+    """
+    global _guest
+    guest = _guest
+    if guest is None or guest[0] <= time.monotonic():
+        user, payload = build()
+        guest = (time.monotonic() + getattr(settings, 'AUTH_GUEST_CACHE_TIMEOUT', 300), user.pk, payload)
+        _guest = guest
+    return dict(guest[2])
+
+
+def forget_guest(user_id=None, username=None):
+    """
+    Drops the memoized payload if it belongs to the given user, or when the
+    changed user is (now) called Guest. Without arguments, always drops it.
+    """
+    global _guest
+    guest = _guest
+    if guest is None:
+        return
+    if (user_id is None and username is None) or username == GUEST_USERNAME or guest[1] == user_id:
+        _guest = None
@@ -0,0 +1,82 @@
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from kanban_app.benchmarking import format_stats, measure, throwaway_data
+from user_auth_app.api.views import CustomLoginView
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+class Command(BaseCommand):
+    """
+    Times the email login endpoint against a large throwaway user table,
+    with and without the auth_user email index.
+
+    By default passwords use a fast hasher so the numbers show the database
+    cost of the login; pass --real-hasher to include the configured hasher.
+    """
+    help = 'Benchmark email login at a large number of users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000,
+                            help='Number of users to seed (default: 100000).')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Timed logins per scenario (default: 50).')
+        parser.add_argument('--real-hasher', action='store_true',
+                            help='Use the configured PASSWORD_HASHERS instead of a fast one.')
+
+    def handle(self, *args, **options):
+        if options['real_hasher']:
+            self.run(options)
+        else:
+            with override_settings(PASSWORD_HASHERS=FAST_HASHERS):
+                self.run(options)
+
+    def run(self, options):
+        with throwaway_data():
+            email = self.seed(options['users'])
+            plan = User.objects.filter(email=email).explain()
+            if 'auth_user_email_idx' not in plan:
+                raise CommandError(f'The email lookup does not use auth_user_email_idx: {plan}')
+            self.stdout.write(f'plan: {plan}')
+            self.report('indexed email', email, options['repeat'])
+            # Rolled back with the seeded rows.
+            with connection.cursor() as cursor:
+                cursor.execute('DROP INDEX auth_user_email_idx')
+            self.report('without the email index', email, options['repeat'])
+
+    def seed(self, users):
+        self.stdout.write(f'Seeding {users} users...')
+        password = make_password('password123')
+        User.objects.bulk_create(
+            (User(username=f'bench-user-{i}', email=f'bench-user-{i}@example.com', password=password)
+             for i in range(users)),
+            batch_size=2000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        # The last user is the worst case for a table scan.
+        return f'bench-user-{users - 1}@example.com'
+
+    def report(self, label, email, repeat):
+        view = CustomLoginView.as_view()
+        factory = APIRequestFactory()
+
+        def login():
+            response = view(factory.post('/api/auth/login/', {'email': email, 'password': 'password123'},
+                                         format='json'))
+            if response.status_code != 200:
+                raise CommandError(f'Login failed: {response.data}')
+
+        # The first login creates the token; later ones only read it.
+        login()
+        with CaptureQueriesContext(connection) as ctx:
+            login()
+        stats = measure(login, repeat=repeat)
+        self.stdout.write(f'\n{label}  queries/login={len(ctx.captured_queries)}')
+        self.stdout.write(f'  {format_stats(stats)}')
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from user_auth_app.provisioning import DEFAULT_BATCH_SIZE, detect_format, provision_users, read_users
+
+
+class Command(BaseCommand):
+    """
+    Creates users and their API tokens from a CSV or JSONL file with the
+    registration fields: username, first_name, last_name, email, password.
+    """
+    help = 'Import users from a CSV or JSONL file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with header row) or JSONL file.')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='File format (default: guessed from the extension).')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Rows validated and inserted per batch (default: {DEFAULT_BATCH_SIZE}).')
+        parser.add_argument('--workers', type=int,
+                            help='Processes used for password hashing (default: AUTH_PROVISIONING_WORKERS or CPU count).')
+
+    def handle(self, *args, path, format, batch_size, workers, **options):
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as stream:
+                result = provision_users(read_users(stream, format or detect_format(path)), batch_size, workers)
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        for error in result['errors']:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(f"{result['created']} users imported, {len(result['errors'])} rows skipped.")
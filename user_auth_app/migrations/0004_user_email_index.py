@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+# Index auth_user.email, which the email login backend and the registration
+# uniqueness check query on every call. The table belongs to django.contrib.auth,
+# so the index is created with raw SQL instead of a model Meta change.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0003_userprofile_delete_user'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX auth_user_email_idx ON auth_user (email);',
+            reverse_sql='DROP INDEX auth_user_email_idx;',
+        ),
+    ]
@@ -0,0 +1,211 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework.authtoken.models import Token
+
+from user_auth_app.api.serializers import ProvisionedUserSerializer
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Below this many passwords per batch, starting worker processes costs more than it saves.
+MIN_PARALLEL_HASHES = 32
+
+
+def read_users(stream, format):
+    """
+    Yields one dict per user from a CSV (with a header row) or JSONL text stream.
+    Blank JSONL lines are skipped; a malformed line yields an error entry
+    that `provision_users` reports instead of aborting the import.
+    """
+    if format == 'csv':
+        yield from csv.DictReader(stream)
+    elif format == 'jsonl':
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                row = {'__error__': f'Invalid JSON: {exc.msg}'}
+            yield row if isinstance(row, dict) else {'__error__': 'Expected a JSON object'}
+    else:
+        raise ValueError(f'Unsupported format: {format}')
+
+
+def detect_format(name):
+    """
+    Guesses the import format from a file name; defaults to CSV.
+    """
+    return 'jsonl' if name.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def open_upload(upload):
+    """
+    Wraps an uploaded file as a text stream for `read_users`.
+    """
+    return io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+
+
+def _init_worker():
+    # Spawned workers must load the settings (hasher configuration) first.
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hashes `passwords` with the configured hasher, spreading the work over
+    `workers` processes (default: AUTH_PROVISIONING_WORKERS or the CPU count).
+    """
+    workers = workers or getattr(settings, 'AUTH_PROVISIONING_WORKERS', None) or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < MIN_PARALLEL_HASHES:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def provision_users(rows, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    """
+    Creates users and their tokens from an iterable of dicts with the
+    registration fields (username, first_name, last_name, email, password).
+
+    Per batch of `batch_size` rows:
+    - rows are validated like registrations, without database queries;
+    - usernames and emails are checked for uniqueness against each other and
+      with one set-based query against the existing users;
+    - passwords are hashed in a process pool;
+    - users and tokens are inserted with `bulk_create` in one transaction;
+      if a concurrent registration or import took a username in the
+      meantime, the batch is inserted row by row and the conflicts reported.
+
+    Invalid rows are skipped and reported; the rest are imported. Like the
+    registration endpoint, new users are staff and superusers.
+
+    Returns `{'created': <count>, 'errors': [{'row': <1-based index>, 'errors': {...}}]}`.
+    """
+    created = 0
+    errors = []
+    seen_usernames = set()
+    seen_emails = set()
+    for offset, batch in enumerate(batches(rows, batch_size)):
+        valid = []
+        for index, row in enumerate(batch, start=offset * batch_size + 1):
+            if '__error__' in row:
+                errors.append({'row': index, 'errors': {'row': row['__error__']}})
+                continue
+            serializer = ProvisionedUserSerializer(data=row)
+            if not serializer.is_valid():
+                errors.append({'row': index, 'errors': serializer.errors})
+                continue
+            data = serializer.validated_data
+            duplicate = {}
+            if data['username'] in seen_usernames:
+                duplicate['username'] = 'This username appears more than once in the import.'
+            if data['email'] in seen_emails:
+                duplicate['email'] = 'This email appears more than once in the import.'
+            seen_usernames.add(data['username'])
+            seen_emails.add(data['email'])
+            if duplicate:
+                errors.append({'row': index, 'errors': duplicate})
+                continue
+            valid.append((index, data))
+
+        existing = User.objects.filter(
+            Q(username__in=[data['username'] for _, data in valid]) | Q(email__in=[data['email'] for _, data in valid])
+        ).values_list('username', 'email')
+        taken_usernames, taken_emails = set(), set()
+        for username, email in existing:
+            taken_usernames.add(username)
+            taken_emails.add(email)
+        new = []
+        for index, data in valid:
+            conflict = {}
+            if data['username'] in taken_usernames:
+                conflict['username'] = 'A user with this username already exists.'
+            if data['email'] in taken_emails:
+                conflict['email'] = 'A user with this email already exists.'
+            if conflict:
+                errors.append({'row': index, 'errors': conflict})
+            else:
+                new.append((index, data))
+        if not new:
+            continue
+
+        hashes = hash_passwords([data['password'] for _, data in new], workers)
+        users = [
+            (index, User(username=data['username'], first_name=data['first_name'], last_name=data['last_name'],
+                         email=data['email'], password=password, is_staff=True, is_superuser=True))
+            for (index, data), password in zip(new, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                insert_users([user for _, user in users], batch_size)
+            created += len(users)
+        except IntegrityError:
+            # A concurrent registration or import took some of the names since
+            # the check above: insert row by row and report the conflicts.
+            for index, user in users:
+                try:
+                    with transaction.atomic():
+                        insert_users([reset(user)], batch_size)
+                    created += 1
+                except IntegrityError:
+                    conflict = existing_user_conflict(user) or {'username': 'A user with this username already exists.'}
+                    errors.append({'row': index, 'errors': conflict})
+    errors.sort(key=lambda error: error['row'])
+    return {'created': created, 'errors': errors}
+
+
+def insert_users(users, batch_size):
+    """
+    Inserts `users` and a token for each with `bulk_create`.
+    """
+    User.objects.bulk_create(users, batch_size=batch_size)
+    if any(user.pk is None for user in users):
+        # Backends without RETURNING do not set the primary keys.
+        ids = dict(User.objects.filter(username__in=[user.username for user in users])
+                   .values_list('username', 'id'))
+        for user in users:
+            user.pk = ids[user.username]
+    Token.objects.bulk_create(
+        [Token(key=Token.generate_key(), user=user) for user in users], batch_size=batch_size)
+
+
+def reset(user):
+    # A rolled back bulk_create may have assigned primary keys already.
+    user.pk = None
+    user._state.adding = True
+    return user
+
+
+def existing_user_conflict(user):
+    """
+    Returns the errors of a user whose username or email is already taken, if any.
+    """
+    conflict = {}
+    for username, email in User.objects.filter(Q(username=user.username) | Q(email=user.email)).values_list(
+            'username', 'email'):
+        if username == user.username:
+            conflict['username'] = 'A user with this username already exists.'
+        if email == user.email:
+            conflict['email'] = 'A user with this email already exists.'
+    return conflict
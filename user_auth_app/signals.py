@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user_auth_app.api.authentication import forget_tokens, get_token_cache
+from user_auth_app.guest import forget_guest
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def on_token_changed(sender, instance, **kwargs):
+    """
+    A deleted or re-saved token must be looked up again.
+    Deleting a user cascades to its token, so this also covers deleted users.
+    """
+    forget_tokens(instance.key)
+    forget_guest(user_id=instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def on_user_changed(sender, instance, **kwargs):
+    """
+    The memoized Guest login payload must follow changes of the Guest user.
+    """
+    forget_guest(user_id=instance.pk, username=instance.username)
+
+
+@receiver(post_save, sender=User)
+def on_user_saved(sender, instance, created, **kwargs):
+    """
+    A changed user (e.g. deactivated or with new permissions) must not be
+    served from the token cache.
+    """
+    if created or not len(get_token_cache()):
+        return
+    forget_tokens(*Token.objects.filter(user_id=instance.pk).values_list('key', flat=True))
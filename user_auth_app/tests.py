@@ -1,3 +1,282 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from user_auth_app.api.authentication import CachedTokenAuthentication, get_token_cache
+from user_auth_app.guest import forget_guest
+from user_auth_app.provisioning import hash_passwords, provision_users, read_users
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """
+    Repeat token lookups are served from memory until the token or its user changes.
+    """
+
+    def setUp(self):
+        get_token_cache().clear()
+        self.user = User.objects.create_user(username='alice', email='alice@example.com', password='password123')
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_repeat_lookup_runs_no_query(self):
+        with self.assertNumQueries(1):
+            self.auth.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token, self.token)
+
+    def test_cached_lookups_return_fresh_instances(self):
+        first, first_token = self.auth.authenticate_credentials(self.token.key)
+        first.first_name = 'Mallory'
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertIsNot(user, first)
+        self.assertIsNot(token, first_token)
+        self.assertEqual(user.first_name, '')
+        self.assertIs(token.user, user)
+        self.assertFalse(user._state.adding)
+
+    def test_unknown_token_is_rejected_and_not_cached(self):
+        for _ in range(2):
+            with self.assertNumQueries(1), self.assertRaises(AuthenticationFailed):
+                self.auth.authenticate_credentials('missing')
+
+    def test_deleted_token_is_rejected(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_rotated_token_replaces_the_old_one(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(self.auth.authenticate_credentials(new_token.key)[0], self.user)
+
+    def test_deactivated_user_is_rejected(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_deleted_user_is_rejected(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_changed_user_is_reloaded(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.first_name = 'Alicia'
+        self.user.save()
+        self.assertEqual(self.auth.authenticate_credentials(self.token.key)[0].first_name, 'Alicia')
+
+    def test_api_uses_cached_authentication(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(client.get('/kanban/contacts/').status_code, 200)
+        self.assertEqual(get_token_cache().misses, 1)
+        self.assertEqual(client.get('/kanban/contacts/').status_code, 200)
+        self.assertEqual(get_token_cache().hits, 1)
+        self.token.delete()
+        self.assertEqual(client.get('/kanban/contacts/').status_code, 401)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class EmailLoginTests(TestCase):
+    """
+    Login loads the user once by email and reuses it for the token.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='bob', email='bob@example.com', password='password123')
+        self.token = Token.objects.create(user=self.user)
+
+    def login(self, email, password):
+        return self.client.post('/api/auth/login/', {'email': email, 'password': password}, format='json')
+
+    def test_login_runs_one_user_query_and_one_token_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.login('bob@example.com', 'password123')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['token'], self.token.key)
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_wrong_password(self):
+        response = self.login('bob@example.com', 'wrong-password')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data['data']), {'user'})
+
+    def test_unknown_email(self):
+        response = self.login('nobody@example.com', 'password123')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data['data']), {'email', 'user'})
+
+    def test_inactive_user_cannot_log_in(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.login('bob@example.com', 'password123').status_code, 400)
+
+    def test_username_authentication_still_works(self):
+        self.assertEqual(authenticate(username='bob', password='password123'), self.user)
+
+    def test_email_lookup_uses_index(self):
+        plan = User.objects.filter(email='bob@example.com').explain()
+        self.assertIn('auth_user_email_idx', plan)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserProvisioningTests(TestCase):
+    """
+    Bulk imports validate rows without per-row queries and insert users and tokens in bulk.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='password123',
+                                              is_staff=True)
+        self.client = APIClient()
+
+    def rows(self, count, start=0):
+        return [{'username': f'user{i}', 'first_name': f'First{i}', 'last_name': f'Last{i}',
+                 'email': f'user{i}@example.com', 'password': f'password{i:04d}'}
+                for i in range(start, start + count)]
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        with CaptureQueriesContext(connection) as ctx:
+            result = provision_users(self.rows(50), batch_size=100)
+        self.assertEqual(result, {'created': 50, 'errors': []})
+        # uniqueness check, savepoint, users insert, tokens insert, release
+        self.assertLessEqual(len(ctx.captured_queries), 5)
+        self.assertEqual(Token.objects.filter(user__username__startswith='user').count(), 50)
+        user = authenticate(email='user7@example.com', password='password0007')
+        self.assertTrue(user.is_staff and user.is_superuser)
+        self.assertEqual(len(Token.objects.get(user=user).key), 40)
+
+    def test_invalid_and_duplicate_rows_are_reported(self):
+        rows = self.rows(3)
+        rows.append({'username': 'ab', 'first_name': 'First', 'last_name': 'Last', 'email': 'bad', 'password': 'x'})
+        rows.append(dict(rows[0], email='other@example.com'))
+        rows.append(dict(self.rows(1, start=9)[0], email='admin@example.com'))
+        result = provision_users(rows, batch_size=2)
+        self.assertEqual(result['created'], 3)
+        self.assertEqual([error['row'] for error in result['errors']], [4, 5, 6])
+        self.assertEqual(set(result['errors'][0]['errors']), {'username', 'email', 'password'})
+        self.assertIn('more than once', result['errors'][1]['errors']['username'])
+        self.assertIn('already exists', result['errors'][2]['errors']['email'])
+
+    def test_concurrently_taken_username_is_reported(self):
+        def hash_and_race(passwords, workers):
+            # Another registration takes user1 between the uniqueness check and the insert.
+            User.objects.create_user(username='user1', email='elsewhere@example.com', password='password123')
+            return [make_password(password) for password in passwords]
+
+        with mock.patch('user_auth_app.provisioning.hash_passwords', hash_and_race):
+            result = provision_users(self.rows(3))
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['errors'], [{'row': 2, 'errors': {'username': 'A user with this username already exists.'}}])
+        self.assertEqual(Token.objects.filter(user__username__in=['user0', 'user2']).count(), 2)
+
+    def test_passwords_are_hashed_in_worker_processes(self):
+        passwords = [f'password{i}' for i in range(40)]
+        hashes = hash_passwords(passwords, workers=2)
+        self.assertTrue(all(check_password(p, h) for p, h in zip(passwords, hashes)))
+
+    def test_jsonl_reader(self):
+        stream = io.StringIO(json.dumps(self.rows(1)[0]) + '\n\nnot json\n')
+        rows = list(read_users(stream, 'jsonl'))
+        self.assertEqual(rows[0]['username'], 'user0')
+        self.assertIn('__error__', rows[1])
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as file:
+            writer = csv.DictWriter(file, fieldnames=list(self.rows(1)[0]))
+            writer.writeheader()
+            writer.writerows(self.rows(5))
+        self.addCleanup(os.remove, file.name)
+        out = io.StringIO()
+        call_command('import_users', file.name, stdout=out)
+        self.assertIn('5 users imported', out.getvalue())
+
+    def test_bulk_endpoint_is_admin_only(self):
+        self.assertIn(self.client.post('/api/auth/users/bulk/', self.rows(1), format='json').status_code, (401, 403))
+
+    def test_bulk_endpoint_accepts_json_and_files(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post('/api/auth/users/bulk/', self.rows(2), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['created'], 2)
+
+        upload = SimpleUploadedFile('users.jsonl', '\n'.join(json.dumps(row) for row in self.rows(2, start=2)).encode())
+        response = self.client.post('/api/auth/users/bulk/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['created'], 2)
+
+        response = self.client.post('/api/auth/users/bulk/', self.rows(1), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data['ok'])
+
+
+class GuestLoginTests(TestCase):
+    """
+    Repeated Guest logins are answered from memory until the Guest user or its token changes.
+    """
+
+    def setUp(self):
+        forget_guest()
+        self.addCleanup(forget_guest)
+        self.client = APIClient()
+        self.guest = User.objects.create_user(username='Guest', email='guest@example.com', password='password123',
+                                              first_name='Guest', last_name='User')
+
+    def guest_login(self):
+        response = self.client.post('/api/auth/registration/', {'username': 'Guest'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def test_repeat_guest_login_runs_no_query(self):
+        first = self.guest_login()
+        with self.assertNumQueries(0):
+            second = self.guest_login()
+        self.assertEqual(first, second)
+        self.assertEqual(second['token'], Token.objects.get(user=self.guest).key)
+
+    def test_rotated_token_is_picked_up(self):
+        old_key = self.guest_login()['token']
+        Token.objects.filter(user=self.guest).delete()
+        new_key = self.guest_login()['token']
+        self.assertNotEqual(new_key, old_key)
+
+    def test_changed_guest_user_is_picked_up(self):
+        self.guest_login()
+        self.guest.first_name = 'Visitor'
+        self.guest.save()
+        self.assertEqual(self.guest_login()['first_name'], 'Visitor')
+
+    def test_deleted_guest_is_registered_again(self):
+        self.guest_login()
+        self.guest.delete()
+        response = self.client.post('/api/auth/registration/', {
+            'username': 'Guest', 'first_name': 'Guest', 'last_name': 'User', 'email': 'guest@example.com',
+            'password': 'password123', 'repeated_password': 'password123'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.guest_login()['token'], response.data['data']['token'])